@@ -2,6 +2,7 @@ import numpy as np
 from .model import Assignment, AssignmentProblem, NormalizedAssignmentProblem
 from typing import List, Dict, Tuple, Set
 from copy import deepcopy
+from .. import pool as solver_pool
 
 class Solver:
     '''
@@ -32,6 +33,7 @@ class Solver:
         costs = np.array(self.problem.costs)
 
         while True:
+            solver_pool.check_cancelled()
             self.extracts_mins(costs)
             max_assignment = self.find_max_assignment(costs)
             if len(max_assignment) == self.problem.size():
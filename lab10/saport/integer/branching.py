@@ -0,0 +1,227 @@
+import math
+import numpy as np
+from ..simplex import solver as lpsolver
+from ..simplex.expressions import constraint as co
+
+# the smallest degradation taken into account by the product score, so a zero in one direction doesn't hide the other one
+_min_gain = 0.000001
+
+
+class PseudoCosts:
+    """
+        Running averages of the objective degradation per unit change of the branched variables,
+        kept separately for the down (<= floor) and up (>= ceil) branches.
+
+        Methods
+        -------
+        update(index: int, type: ConstraintType, gain: float):
+            records the degradation per unit change observed after branching the variable in the given direction
+        count(index: int, type: ConstraintType) -> int:
+            returns how many degradations have been recorded for the variable in the given direction
+        get(index: int, type: ConstraintType) -> float:
+            returns the average degradation of the variable in the given direction,
+            the average of all the recorded variables if there is none for the variable (1.0 if there is none at all)
+        copy() -> PseudoCosts:
+            returns an independent copy of the pseudo costs
+        state() -> numpy.Array:
+            returns the recorded sums as rows (index, type value, sum, count), e.g. to store them in a checkpoint
+        @staticmethod from_state(state: numpy.Array) -> PseudoCosts:
+            rebuilds the pseudo costs from their state
+    """
+
+    def __init__(self):
+        self._sums = {}
+        self._counts = {}
+        self._totals = {co.ConstraintType.LE: [0.0, 0], co.ConstraintType.GE: [0.0, 0]}
+
+    def update(self, index, type, gain):
+        key = (index, type)
+        self._sums[key] = self._sums.get(key, 0.0) + gain
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self._totals[type][0] += gain
+        self._totals[type][1] += 1
+
+    def count(self, index, type):
+        return self._counts.get((index, type), 0)
+
+    def get(self, index, type):
+        key = (index, type)
+        if key in self._counts:
+            return self._sums[key] / self._counts[key]
+        (total, count) = self._totals[type]
+        return total / count if count > 0 else 1.0
+
+    def copy(self):
+        return PseudoCosts.from_state(self.state())
+
+    def state(self):
+        rows = [(index, type.value, self._sums[(index, type)], count) for ((index, type), count) in self._counts.items()]
+        return np.array(rows, dtype = float).reshape(-1, 4)
+
+    @staticmethod
+    def from_state(state):
+        costs = PseudoCosts()
+        for (index, type, total, count) in state:
+            key = (int(index), co.ConstraintType(int(type)))
+            costs._sums[key] = total
+            costs._counts[key] = int(count)
+            costs._totals[key[1]][0] += total
+            costs._totals[key[1]][1] += int(count)
+        return costs
+
+
+class BranchingRule:
+    """
+        A base class of the rules choosing the variable to branch on.
+        Rules keep no state, everything they learn during a solve (the pseudo costs) is stored in the SolveContext.
+
+        Methods
+        -------
+        name() -> str:
+            returns the name of the rule
+        select(context: SolveContext, candidates: list[Variable], solution: Solution, tableaux: Tableaux) -> Variable:
+            chooses one of the fractional variables of the relaxed solution,
+            tableaux is the final tableaux of the relaxation (it shouldn't be modified)
+    """
+
+    def name(self):
+        raise Exception("abstract branching rule shouldn't be called!")
+
+    def select(self, context, candidates, solution, tableaux):
+        raise Exception("abstract branching rule shouldn't be called!")
+
+
+class LastFractional(BranchingRule):
+    """
+        Branches on the last fractional variable of the model (the original, arbitrary choice).
+    """
+
+    def name(self):
+        return "last fractional"
+
+    def select(self, context, candidates, solution, tableaux):
+        return candidates[-1]
+
+
+class MostFractional(BranchingRule):
+    """
+        Branches on the variable with the fractional part closest to 0.5.
+    """
+
+    def name(self):
+        return "most fractional"
+
+    def select(self, context, candidates, solution, tableaux):
+        return max(candidates, key = lambda var: _fractionality(solution.value(var)))
+
+
+class PseudoCostBranching(BranchingRule):
+    """
+        Branches on the variable with the best product of the degradations predicted by the pseudo costs.
+        Variables never branched yet use the average pseudo costs.
+    """
+
+    def name(self):
+        return "pseudo cost"
+
+    def select(self, context, candidates, solution, tableaux):
+        return max(candidates, key = lambda var: _pseudo_cost_score(context, var, solution.value(var)))
+
+
+class StrongBranching(BranchingRule):
+    """
+        Branches on the variable with the best product of the degradations of its children,
+        every child is probed with at most max_pivots dual simplex pivots from the tableaux of the parent.
+        Only max_candidates most fractional variables are probed, the probes are recorded in the pseudo costs.
+
+        Attributes
+        ----------
+        max_candidates : int
+            how many candidates are probed at most
+        max_pivots : int
+            how many dual simplex pivots a probe of a child can make
+    """
+
+    def __init__(self, max_candidates = 8, max_pivots = 10):
+        self.max_candidates = max_candidates
+        self.max_pivots = max_pivots
+
+    def name(self):
+        return "strong"
+
+    def select(self, context, candidates, solution, tableaux):
+        probed = sorted(candidates, key = lambda var: -_fractionality(solution.value(var)))[:self.max_candidates]
+        return max(probed, key = lambda var: _strong_score(context, var, solution.value(var), tableaux, self.max_pivots))
+
+
+class ReliabilityBranching(BranchingRule):
+    """
+        Pseudo cost branching, which probes the children (like the strong branching) of the variables
+        whose pseudo costs have been recorded less than reliability times in any direction.
+
+        Attributes
+        ----------
+        reliability : int
+            how many recorded degradations make the pseudo costs of a variable reliable
+        max_candidates : int
+            how many unreliable candidates are probed at most (the most fractional ones)
+        max_pivots : int
+            how many dual simplex pivots a probe of a child can make
+    """
+
+    def __init__(self, reliability = 4, max_candidates = 8, max_pivots = 10):
+        self.reliability = reliability
+        self.max_candidates = max_candidates
+        self.max_pivots = max_pivots
+
+    def name(self):
+        return "reliability"
+
+    def select(self, context, candidates, solution, tableaux):
+        def reliable(var):
+            return min(context.pseudo_costs.count(var.index, t) for t in (co.ConstraintType.LE, co.ConstraintType.GE)) >= self.reliability
+
+        unreliable = sorted((var for var in candidates if not reliable(var)), key = lambda var: -_fractionality(solution.value(var)))
+        probed = set(var.index for var in unreliable[:self.max_candidates])
+        scores = {}
+        for var in candidates:
+            value = solution.value(var)
+            if var.index in probed:
+                scores[var.index] = _strong_score(context, var, value, tableaux, self.max_pivots)
+            else:
+                scores[var.index] = _pseudo_cost_score(context, var, value)
+        return max(candidates, key = lambda var: scores[var.index])
+
+
+def _fractionality(value):
+    fraction = value - math.floor(value)
+    return min(fraction, 1 - fraction)
+
+
+def _score(down, up):
+    return max(down, _min_gain) * max(up, _min_gain)
+
+
+def _pseudo_cost_score(context, var, value):
+    fraction = value - math.floor(value)
+    down = context.pseudo_costs.get(var.index, co.ConstraintType.LE) * fraction
+    up = context.pseudo_costs.get(var.index, co.ConstraintType.GE) * (1 - fraction)
+    return _score(down, up)
+
+
+def _strong_score(context, var, value, tableaux, max_pivots):
+    """
+        _strong_score(context: SolveContext, var: Variable, value: float, tableaux: Tableaux, max_pivots: int) -> float:
+            probes both children of the variable and returns the product of their degradations,
+            an unfeasible child makes the score infinite (the variable is fixed by its other child)
+    """
+    gains = []
+    for (type, bound) in ((co.ConstraintType.LE, math.floor(value)), (co.ConstraintType.GE, math.ceil(value))):
+        constraint = var <= bound if type == co.ConstraintType.LE else var >= bound
+        cost = lpsolver.Solver().probe(tableaux, [constraint], max_pivots)
+        if cost is None:
+            return math.inf
+        gain = max(tableaux.cost() - cost, 0.0)
+        context.pseudo_costs.update(var.index, type, gain / abs(value - bound))
+        gains.append(gain)
+    return _score(*gains)
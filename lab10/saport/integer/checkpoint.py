@@ -0,0 +1,164 @@
+import os
+import threading
+import numpy as np
+from ..simplex.expressions import constraint as co
+from .branching import PseudoCosts
+from .cuts import Cut
+from .nodes import Node
+
+# version of the file format, checkpoints of other versions can't be resumed
+_version = 1
+
+
+class Checkpoint:
+    """
+        State of a branch and bound solve, which is enough to resume it: the open nodes (as their bound changes),
+        the incumbent, the pseudo costs and the cuts of the pool. The tableaux aren't stored, so the resumed nodes start cold.
+        It's saved as a single compressed numpy archive, the nodes as flat arrays of their bounds.
+
+        Attributes
+        ----------
+        variables_count : int
+            number of the model variables (a checkpoint can be resumed only with the same model)
+        nodes : list[Node]
+            open nodes of the tree
+        assignment : list[float] | None
+            assignment of the incumbent, None if there is none
+        pseudo_costs : PseudoCosts
+            pseudo costs recorded so far
+        cuts : list[Cut]
+            cuts of the pool
+        explored : int
+            number of the nodes explored so far
+
+        Methods
+        -------
+        @staticmethod capture(context: SolveContext, nodes: list[Node]) -> Checkpoint:
+            captures the state of the running solve, the given nodes (e.g. explored by the parallel workers) are stored as open too
+        save(path: str):
+            writes the checkpoint to the file, replacing the previous one only when it's complete
+        @staticmethod load(path: str) -> Checkpoint:
+            reads the checkpoint written by save
+        restore(context: SolveContext, retention: Retention):
+            replaces the open nodes of the new solve with the stored ones, installs the incumbent, the pseudo costs and the cuts
+    """
+
+    def __init__(self, variables_count, nodes, assignment, pseudo_costs, cuts, explored):
+        self.variables_count = variables_count
+        self.nodes = nodes
+        self.assignment = assignment
+        self.pseudo_costs = pseudo_costs
+        self.cuts = cuts
+        self.explored = explored
+
+    @staticmethod
+    def capture(context, nodes = ()):
+        best = context.best_solution
+        assignment = list(best.assignment) if best is not None and best.assignment is not None else None
+        cuts = context.cut_pool.cuts() if context.cut_pool is not None else []
+        # the nodes themselves aren't copied, the writer reads only their bounds, which stay valid even if a node is tightened later
+        open_nodes = context.queue.nodes() + list(nodes) if context.queue is not None else list(nodes)
+        return Checkpoint(len(context.model.variables), open_nodes, assignment, context.pseudo_costs.copy(), cuts, context.nodes)
+
+    def save(self, path):
+        bounds = [bound for node in self.nodes for bound in node.bounds]
+        arrays = {
+            'version': np.array(_version),
+            'variables_count': np.array(self.variables_count),
+            'explored': np.array(self.explored),
+            'node_values': np.array([(node.depth, node.bound, node.estimate, node.distance) for node in self.nodes], dtype=float).reshape(-1, 4),
+            'node_offsets': np.cumsum([0] + [len(node.bounds) for node in self.nodes]),
+            'bounds': np.array([(index, type.value, value) for (index, type, value) in bounds], dtype=np.int64).reshape(-1, 3),
+            'assignment': np.array(self.assignment if self.assignment is not None else [], dtype=float),
+            'pseudo_costs': self.pseudo_costs.state(),
+            'cut_factors': np.array([cut.factors for cut in self.cuts], dtype=float).reshape(-1, self.variables_count),
+            'cut_bounds': np.array([(cut.bound, cut.age) for cut in self.cuts], dtype=float).reshape(-1, 2)
+        }
+        temporary = f"{path}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(temporary, path)
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as arrays:
+            if int(arrays['version']) != _version:
+                raise Exception(f"Checkpoint {path} has an unsupported version {int(arrays['version'])}")
+            offsets = arrays['node_offsets']
+            bounds = [(int(index), co.ConstraintType(int(type)), int(value)) for (index, type, value) in arrays['bounds']]
+            nodes = []
+            for (i, (depth, bound, estimate, distance)) in enumerate(arrays['node_values']):
+                nodes.append(Node(tuple(bounds[offsets[i]:offsets[i + 1]]), int(depth), float(bound), float(estimate), None, float(distance)))
+            assignment = [float(v) for v in arrays['assignment']] if len(arrays['assignment']) > 0 else None
+            cuts = []
+            for (factors, (bound, age)) in zip(arrays['cut_factors'], arrays['cut_bounds']):
+                cut = Cut(factors, bound)
+                cut.age = int(age)
+                cuts.append(cut)
+            return Checkpoint(int(arrays['variables_count']), nodes, assignment, PseudoCosts.from_state(arrays['pseudo_costs']), cuts, int(arrays['explored']))
+
+    def restore(self, context, retention):
+        if self.variables_count != len(context.model.variables):
+            raise Exception(f"Checkpoint of a model with {self.variables_count} variables can't be resumed with {len(context.model.variables)} variables")
+        context.queue.drain()
+        for node in self.nodes:
+            context.queue.push(node)
+        context.nodes = self.explored
+        context.pseudo_costs = self.pseudo_costs.copy()
+        if context.cut_pool is not None:
+            for cut in self.cuts:
+                context.cut_pool.add(cut)
+        if self.assignment is not None:
+            context.improve(context.solution(list(self.assignment), retention), "checkpoint")
+
+
+class Checkpointer:
+    """
+        Writes the checkpoints of a running solve periodically.
+        The state is captured by the solving thread (it only copies the list of the open nodes),
+        it's encoded and written by a background thread, so the search isn't stalled by the disk.
+        If the previous checkpoint is still being written, the next one is skipped.
+
+        Attributes
+        ----------
+        path : str
+            file the checkpoints are written to
+        interval : float
+            how often (in seconds) the checkpoint is written
+        written : int
+            how many checkpoints have been written
+
+        Methods
+        -------
+        __init__(path: str, interval: float) -> Checkpointer:
+            constructs a new checkpointer, nothing is written until the first interval passes
+        update(context: SolveContext, nodes: list[Node]):
+            starts writing a new checkpoint in the background, if the interval has passed since the last one
+        close(context: SolveContext, nodes: list[Node]):
+            waits for the background write and writes the final checkpoint
+    """
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self.written = 0
+        self._last = 0.0
+        self._writer = None
+
+    def update(self, context, nodes = ()):
+        wall_time = context.wall_time()
+        if wall_time - self._last < self.interval or (self._writer is not None and self._writer.is_alive()):
+            return
+        self._last = wall_time
+        checkpoint = Checkpoint.capture(context, nodes)
+        self._writer = threading.Thread(target = self._write, args = (checkpoint,), daemon = True)
+        self._writer.start()
+
+    def close(self, context, nodes = ()):
+        if self._writer is not None:
+            self._writer.join()
+        self._write(Checkpoint.capture(context, nodes))
+
+    def _write(self, checkpoint):
+        checkpoint.save(self.path)
+        self.written += 1
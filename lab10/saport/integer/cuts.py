@@ -0,0 +1,253 @@
+import enum
+import math
+import numpy as np
+from ..simplex.expressions import expression as ex
+from ..simplex.tableaux import eps
+
+
+class CutMode(enum.Enum):
+    """
+        An enum to represent where the cutting planes are generated:
+        - ROOT = only in the root node, the other nodes add only the violated cuts of the pool
+        - EVERY_NODE = in every node, cuts generated below the root are valid only in the subtree of their node
+    """
+    ROOT = 'root'
+    EVERY_NODE = 'every-node'
+
+
+class Cut:
+    """
+        A cutting plane factors @ x >= bound over the model variables.
+
+        Attributes
+        ----------
+        factors : numpy.Array
+            factors of the model variables, normalized so the largest absolute one is 1.0
+        bound : float
+            right hand side of the cut
+        age : int
+            for how many separations in a row the cut hasn't been violated
+        key : bytes
+            identifies the duplicates (cuts with the same rounded factors and bound)
+
+        Methods
+        -------
+        __init__(factors: numpy.Array, bound: float) -> Cut:
+            constructs a new cut, normalizing it
+        violation(assignment: numpy.Array) -> float:
+            returns how much the assignment violates the cut (negative if it satisfies it)
+        efficacy(assignment: numpy.Array) -> float:
+            returns the euclidean distance of the assignment to the cut hyperplane
+        constraint(variables: list[Variable]) -> Constraint:
+            returns the cut as a constraint of the model
+    """
+
+    def __init__(self, factors, bound):
+        scale = np.abs(factors).max()
+        self.factors = factors / scale
+        self.bound = bound / scale
+        self.age = 0
+        self.key = np.round(np.append(self.factors, self.bound), 6).tobytes()
+
+    def violation(self, assignment):
+        return self.bound - self.factors @ assignment
+
+    def efficacy(self, assignment):
+        return self.violation(assignment) / np.linalg.norm(self.factors)
+
+    def constraint(self, variables):
+        columns = np.nonzero(self.factors)[0]
+        return ex.Expression.from_vectors([variables[c] for c in columns], self.factors[columns]) >= self.bound
+
+
+class CutPool:
+    """
+        A pool of the globally valid cuts, every cut is stored only once.
+        Cuts age when they aren't violated by the separated assignments and the ones older than max_age are removed,
+        if the pool is full, the oldest cuts make room for the new ones.
+
+        Attributes
+        ----------
+        max_size : int
+            maximal number of the cuts in the pool
+        max_age : int
+            how many separations a cut can survive without being violated
+
+        Methods
+        -------
+        add(cut: Cut) -> bool:
+            adds the cut to the pool, returns False if it's a duplicate of a pooled one
+        separate(assignment: numpy.Array, min_efficacy: float) -> list[Cut]:
+            returns the pooled cuts violated by the assignment (with at least the given efficacy), ages the other ones
+        cuts() -> list[Cut]:
+            returns all the pooled cuts
+    """
+
+    def __init__(self, max_size = 1000, max_age = 10):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._cuts = {}
+
+    def __len__(self):
+        return len(self._cuts)
+
+    def add(self, cut):
+        if cut.key in self._cuts:
+            return False
+        if len(self._cuts) >= self.max_size:
+            oldest = max(self._cuts.values(), key = lambda c: c.age)
+            del self._cuts[oldest.key]
+        self._cuts[cut.key] = cut
+        return True
+
+    def cuts(self):
+        return list(self._cuts.values())
+
+    def separate(self, assignment, min_efficacy):
+        violated = []
+        for cut in list(self._cuts.values()):
+            if cut.efficacy(assignment) >= min_efficacy:
+                cut.age = 0
+                violated.append(cut)
+            else:
+                cut.age += 1
+                if cut.age > self.max_age:
+                    del self._cuts[cut.key]
+        return violated
+
+
+class CuttingPlanes:
+    """
+        A cutting plane loop strengthening the relaxations of the branch and bound nodes with the Gomory mixed integer cuts.
+        Every round the most efficacious cuts (new ones and the violated ones of the pool) are added to the tableaux,
+        which is then re-optimized with the dual simplex. The loop stops when no cut is found, the relaxation becomes integer
+        or the bound improves less than min_improvement (relatively) in stall_rounds rounds in a row.
+        Cuts added by the loop, which aren't binding at its end, are removed from the tableaux again, so the LP doesn't grow.
+
+        Attributes
+        ----------
+        mode : CutMode
+            where the cuts are generated
+        max_cuts : int
+            how many cuts are added in a single round
+        max_rounds : int
+            maximal number of the rounds in a node
+        stall_rounds : int
+            how many rounds without a significant bound improvement stop the loop
+        min_improvement : float
+            smallest relative bound improvement of a round considered significant
+        min_efficacy : float
+            smallest distance of the relaxed solution to the cut hyperplane for the cut to be added
+        pool_size : int
+            maximal number of the cuts in the pool
+        max_age : int
+            how many separations a pooled cut can survive without being violated
+
+        Methods
+        -------
+        __init__(mode: CutMode, max_cuts: int, max_rounds: int, stall_rounds: int, min_improvement: float, min_efficacy: float, pool_size: int, max_age: int) -> CuttingPlanes:
+            constructs a new configuration of the loop, by default generating the cuts only in the root
+        pool() -> CutPool:
+            returns a new empty pool for a solve
+        run(context: SolveContext, node: Node, model: Model, solution: Solution, tableaux: Tableaux, lp_solver: Solver) -> (Solution, Tableaux):
+            runs the loop for the node with the given relaxed solution and its final tableaux (re-optimized by the given solver),
+            returns the strengthened solution with its tableaux
+    """
+
+    def __init__(self, mode = CutMode.ROOT, max_cuts = 5, max_rounds = 20, stall_rounds = 2, min_improvement = 0.001, min_efficacy = 0.0001, pool_size = 1000, max_age = 10):
+        self.mode = mode
+        self.max_cuts = max_cuts
+        self.max_rounds = max_rounds
+        self.stall_rounds = stall_rounds
+        self.min_improvement = min_improvement
+        self.min_efficacy = min_efficacy
+        self.pool_size = pool_size
+        self.max_age = max_age
+
+    def pool(self):
+        return CutPool(self.pool_size, self.max_age)
+
+    def run(self, context, node, model, solution, tableaux, lp_solver):
+        generate = self.mode == CutMode.EVERY_NODE or node.depth == 0
+        added_columns = []
+        stalled = 0
+        for _ in range(self.max_rounds):
+            assignment = np.array(solution.assignment)
+            cuts = context.cut_pool.separate(assignment, self.min_efficacy)
+            if generate:
+                keys = set(cut.key for cut in cuts)
+                for cut in gomory_mixed_integer_cuts(tableaux):
+                    # only the cuts of the root are valid in the whole tree
+                    if cut.efficacy(assignment) < self.min_efficacy or cut.key in keys or (node.depth == 0 and not context.cut_pool.add(cut)):
+                        continue
+                    keys.add(cut.key)
+                    cuts.append(cut)
+            if len(cuts) == 0:
+                break
+
+            cuts = sorted(cuts, key = lambda cut: -cut.efficacy(assignment))[:self.max_cuts]
+            columns_count = tableaux.table.shape[1] - 1
+            (new_solution, new_tableaux) = lp_solver.reoptimize(model, tableaux, [cut.constraint(context.model.variables) for cut in cuts])
+            context.cuts += len(cuts)
+            if new_solution.assignment is None:
+                return (new_solution, new_tableaux)
+            added_columns += range(columns_count, columns_count + len(cuts))
+
+            improvement = solution.objective_value() - new_solution.objective_value()
+            stalled = stalled + 1 if improvement <= self.min_improvement * max(1.0, abs(solution.objective_value())) else 0
+            (solution, tableaux) = (new_solution, new_tableaux)
+            if stalled >= self.stall_rounds:
+                break
+
+        return (solution, lp_solver.drop_rows(tableaux, added_columns))
+
+
+def gomory_mixed_integer_cuts(tableaux, min_fraction = 0.01, max_dynamism = 1000000.0):
+    """
+        gomory_mixed_integer_cuts(tableaux: Tableaux, min_fraction: float, max_dynamism: float) -> list[Cut]:
+            derives a Gomory mixed integer cut from every row of the optimal tableaux with a fractional basic model variable
+            (model variables are integer, the slack and surplus ones are treated as continuous),
+            slack and surplus variables are then substituted with their rows, so the cuts use only the model variables,
+            rows with the fractional part closer than min_fraction to an integer and numerically unsafe cuts
+            (the largest factor more than max_dynamism times the smallest nonzero one) are skipped
+    """
+    standard_form = tableaux.standard_form
+    integer_count = standard_form.variables_count
+    rows_of = dict(standard_form.slack_variables)
+    rows_of.update(standard_form.surplus_variables)
+    basis = tableaux.extract_basis()
+    nonbasic = np.ones(tableaux.table.shape[1] - 1, dtype = bool)
+    nonbasic[[col for col in basis if col >= 0]] = False
+
+    cuts = []
+    for (row, col) in enumerate(basis):
+        if col < 0 or col >= integer_count:
+            continue
+        value = tableaux.table[row + 1, -1]
+        f0 = value - math.floor(value)
+        if f0 < min_fraction or f0 > 1 - min_fraction:
+            continue
+
+        factors = tableaux.table[row + 1, :-1]
+        fractions = factors - np.floor(factors)
+        cut = np.where(fractions <= f0, fractions / f0, (1 - fractions) / (1 - f0))
+        cut[integer_count:] = np.where(factors[integer_count:] >= 0, factors[integer_count:] / f0, -factors[integer_count:] / (1 - f0))
+        cut[~nonbasic] = 0.0
+
+        # the cut is cut @ columns >= 1, the other columns are replaced by their rows: s = (bound - row @ x) / factor of s
+        substituted = cut[:integer_count].copy()
+        bound = 1.0
+        for column in np.nonzero(cut[integer_count:])[0] + integer_count:
+            if column not in rows_of:
+                break
+            constraint_row = rows_of[column]
+            factor = cut[column] / standard_form.matrix[constraint_row, column]
+            substituted -= factor * standard_form.matrix[constraint_row, :integer_count]
+            bound -= factor * standard_form.bounds[constraint_row]
+        else:
+            # dropping the tiny negative factors only weakens the cut (the variables are nonnegative), the positive ones are kept
+            substituted[(substituted < 0) & (substituted > -eps)] = 0.0
+            magnitudes = np.abs(substituted[substituted != 0.0])
+            if len(magnitudes) > 0 and magnitudes.max() <= max_dynamism * magnitudes.min():
+                cuts.append(Cut(substituted, bound))
+    return cuts
@@ -0,0 +1,319 @@
+import math
+from copy import copy, deepcopy
+import numpy as np
+from ..simplex import solver as lpsolver
+from ..simplex.expressions import constraint as co
+from ..simplex.expressions import expression as ex
+
+# the same integrality tolerance as the one of the branch and bound
+_eps = 0.0000001
+
+
+class PrimalHeuristic:
+    """
+        A base class of the heuristics looking for integer solutions (incumbents) in the branch and bound nodes.
+        Heuristics keep no state, so they can be shared by many solves.
+
+        Attributes
+        ----------
+        frequency : int
+            the heuristic runs in the root and then in every frequency-th explored node (only in the root if 0)
+
+        Methods
+        -------
+        name() -> str:
+            returns the name of the heuristic
+        applies(context: SolveContext, node: Node) -> bool:
+            whether the heuristic should run in the node
+        run(context: SolveContext, model: Model, solution: Solution, tableaux: Tableaux, lp_solver: Solver) -> list[float] | None:
+            looks for an integer assignment feasible in the root model (with its lazy constraints)
+            starting from the relaxed solution of the node (and its final tableaux, which shouldn't be modified)
+    """
+
+    def __init__(self, frequency):
+        self.frequency = frequency
+
+    def name(self):
+        raise Exception("abstract heuristic shouldn't be called!")
+
+    def applies(self, context, node):
+        return node.depth == 0 or (self.frequency > 0 and context.nodes % self.frequency == 0)
+
+    def run(self, context, model, solution, tableaux, lp_solver):
+        raise Exception("abstract heuristic shouldn't be called!")
+
+
+class SimpleRounding(PrimalHeuristic):
+    """
+        Rounds every fractional variable to the nearest integer.
+    """
+
+    def __init__(self, frequency = 1):
+        super().__init__(frequency)
+
+    def name(self):
+        return "simple rounding"
+
+    def run(self, context, model, solution, tableaux, lp_solver):
+        assignment = [float(round(v)) for v in solution.assignment]
+        return assignment if is_feasible(context.model, assignment) else None
+
+
+class RandomizedRounding(PrimalHeuristic):
+    """
+        Rounds every fractional variable up with the probability equal to its fractional part, a few times.
+
+        Attributes
+        ----------
+        tries : int
+            how many random roundings are tried
+        seed : int
+            seed of the random generator (the rounding of a node is always the same)
+    """
+
+    def __init__(self, frequency = 1, tries = 10, seed = 0):
+        super().__init__(frequency)
+        self.tries = tries
+        self.seed = seed
+
+    def name(self):
+        return "randomized rounding"
+
+    def run(self, context, model, solution, tableaux, lp_solver):
+        generator = np.random.default_rng(self.seed)
+        values = np.array(solution.assignment)
+        floors = np.floor(values)
+        for _ in range(self.tries):
+            assignment = [float(v) for v in floors + (generator.random(len(values)) < values - floors)]
+            if is_feasible(context.model, assignment):
+                return assignment
+        return None
+
+
+class _Diving(PrimalHeuristic):
+    """
+        A base class of the diving heuristics: a variable chosen by the subclass is bounded to one of its neighbouring integers
+        and the relaxation is re-optimized (from the tableaux of the previous step) until it's integer,
+        unfeasible or worse than the incumbent. Only the first max_depth steps are made.
+    """
+
+    def __init__(self, frequency, max_depth):
+        super().__init__(frequency)
+        self.max_depth = max_depth
+
+    def prepare(self, context):
+        """
+            prepare(context: SolveContext) -> Any:
+                returns the data computed once per dive and passed to every choose call (None by default)
+        """
+        return None
+
+    def choose(self, context, solution, candidates, prepared):
+        """
+            choose(context: SolveContext, solution: Solution, candidates: list[Variable], prepared: Any) -> (Variable, ConstraintType):
+                returns the variable to be bounded and the type of the bound (LE rounds it down, GE up)
+        """
+        raise Exception("abstract heuristic shouldn't be called!")
+
+    def run(self, context, model, solution, tableaux, lp_solver):
+        prepared = self.prepare(context)
+        for _ in range(self.max_depth):
+            candidates = fractional_variables(context.model, solution.assignment)
+            if len(candidates) == 0:
+                assignment = [float(round(v)) for v in solution.assignment]
+                return assignment if is_feasible(context.model, assignment) else None
+            (var, type) = self.choose(context, solution, candidates, prepared)
+            value = solution.value(var)
+            constraint = var <= math.floor(value) if type == co.ConstraintType.LE else var >= math.ceil(value)
+            (solution, tableaux) = lp_solver.reoptimize(model, tableaux, [constraint])
+            if solution.assignment is None or solution.objective_value() <= context.lower_bound:
+                return None
+        return None
+
+
+class FractionalDiving(_Diving):
+    """
+        Dives by rounding the least fractional variable to its nearest integer.
+    """
+
+    def __init__(self, frequency = 10, max_depth = 50):
+        super().__init__(frequency, max_depth)
+
+    def name(self):
+        return "fractional diving"
+
+    def choose(self, context, solution, candidates, prepared):
+        var = min(candidates, key = lambda var: _fractionality(solution.value(var)))
+        value = solution.value(var)
+        return (var, co.ConstraintType.LE if value - math.floor(value) < 0.5 else co.ConstraintType.GE)
+
+
+class CoefficientDiving(_Diving):
+    """
+        Dives by rounding the variable with the fewest locks (constraints, which could become violated by the rounding)
+        in the direction with fewer locks, ties are broken by the fractionality.
+    """
+
+    def __init__(self, frequency = 10, max_depth = 50):
+        super().__init__(frequency, max_depth)
+
+    def name(self):
+        return "coefficient diving"
+
+    def prepare(self, context):
+        # the locks depend only on the model, so they're counted once per dive
+        return locks(context.model)
+
+    def choose(self, context, solution, candidates, prepared):
+        (down_locks, up_locks) = prepared
+        choices = []
+        for var in candidates:
+            fraction = solution.value(var) - math.floor(solution.value(var))
+            choices.append((down_locks[var.index], fraction, var, co.ConstraintType.LE))
+            choices.append((up_locks[var.index], 1 - fraction, var, co.ConstraintType.GE))
+        (_, _, var, type) = min(choices, key = lambda choice: choice[:2])
+        return (var, type)
+
+
+class FeasibilityPump(PrimalHeuristic):
+    """
+        Alternates between rounding the relaxed solution and finding the closest (in the L1 norm) solution of the relaxation
+        to the rounded one, until the rounding is feasible. When the rounding repeats, the variables farthest from it are flipped.
+
+        Attributes
+        ----------
+        max_iterations : int
+            maximal number of the roundings
+        flips : int
+            how many variables are flipped to escape a cycle
+    """
+
+    def __init__(self, frequency = 0, max_iterations = 20, flips = 3):
+        super().__init__(frequency)
+        self.max_iterations = max_iterations
+        self.flips = flips
+
+    def name(self):
+        return "feasibility pump"
+
+    def run(self, context, model, solution, tableaux, lp_solver):
+        # the distances are measured by additional variables d >= |x - rounded|
+        base = deepcopy(model)
+        base.separators = []
+        variables = list(base.variables)
+        distances = [base.create_variable(f"pump_{var.name}") for var in variables]
+        values = np.array(solution.assignment)
+        previous = None
+        for _ in range(self.max_iterations):
+            rounded = np.round(values)
+            if previous is not None and np.array_equal(rounded, previous):
+                farthest = np.argsort(-np.abs(values - rounded))[:self.flips]
+                rounded[farthest] += np.where(values[farthest] > rounded[farthest], 1.0, -1.0)
+                rounded = np.maximum(rounded, 0.0)
+            assignment = [float(v) for v in rounded]
+            if is_feasible(context.model, assignment):
+                return assignment
+            previous = rounded
+
+            pump = copy(base)
+            pump.constraints = list(base.constraints)
+            for (var, distance, target) in zip(variables, distances, rounded):
+                pump.add_constraint(var - distance <= target)
+                pump.add_constraint(var + distance >= target)
+            pump.minimize(ex.Expression.from_vectors(distances, [1.0 for _ in distances]))
+            relaxed = lpsolver.Solver().solve(pump)
+            if relaxed.assignment is None:
+                return None
+            values = np.array([relaxed.value(var) for var in variables])
+        return None
+
+
+def default_heuristics():
+    """
+        default_heuristics() -> list[PrimalHeuristic]:
+            returns all the heuristics with their default frequencies:
+            roundings in every node, dives in every 10th node and the feasibility pump only in the root
+    """
+    return [SimpleRounding(), RandomizedRounding(), FractionalDiving(), CoefficientDiving(), FeasibilityPump()]
+
+
+def complete_assignment(model, start):
+    """
+        complete_assignment(model: Model, start: list[float] | dict[Variable | str, float]) -> list[float] | None:
+            returns the integer assignment of the initial solution if it's feasible in the model (including the lazy constraints), None otherwise,
+            a full solution is a list of the values of all the variables, a partial one maps some variables (or their names) to their values
+            and it's completed by the relaxation of the model with these variables fixed
+            (if it's fractional, its least fractional variables are fixed to the nearest integers one by one, like in the fractional diving)
+    """
+    if not isinstance(start, dict):
+        if len(start) != len(model.variables):
+            raise Exception(f"Initial solution has {len(start)} values, but the model has {len(model.variables)} variables")
+        assignment = [float(v) for v in start]
+        if len(fractional_variables(model, assignment)) > 0:
+            return None
+        return assignment if is_feasible(model, assignment) else None
+
+    names = {var.name: var for var in model.variables}
+    restricted = copy(model)
+    restricted.constraints = list(model.constraints)
+    for (var, value) in start.items():
+        if isinstance(var, str):
+            if var not in names:
+                raise Exception(f"Initial solution refers to an unknown variable {var}")
+            var = names[var]
+        restricted.add_constraint(ex.Expression.from_vectors([model.variables[var.index]], [1.0]) == value)
+    # a fractional relaxation is completed by fixing its least fractional variable, until it's integer
+    for _ in range(len(model.variables) + 1):
+        relaxed = lpsolver.Solver().solve(restricted)
+        if relaxed.assignment is None:
+            return None
+        values = [relaxed.value(var) for var in model.variables]
+        candidates = fractional_variables(model, values)
+        if len(candidates) == 0:
+            assignment = [float(round(v)) for v in values]
+            return assignment if is_feasible(model, assignment) else None
+        var = min(candidates, key = lambda var: _fractionality(values[var.index]))
+        restricted.add_constraint(ex.Expression.from_vectors([var], [1.0]) == round(values[var.index]))
+    return None
+
+
+def fractional_variables(model, assignment):
+    """
+        fractional_variables(model: Model, assignment: list[float]) -> list[Variable]:
+            returns the variables of the model with non-integer values in the assignment
+    """
+    return [var for var in model.variables if abs(assignment[var.index] - round(assignment[var.index])) > _eps]
+
+
+def is_feasible(model, assignment):
+    """
+        is_feasible(model: Model, assignment: list[float]) -> bool:
+            whether the assignment is nonnegative and satisfies all the constraints of the model, including the lazy ones
+    """
+    if min(assignment, default = 0.0) < 0.0 or any(c.is_violated(assignment) for c in model.constraints):
+        return False
+    return not any(c.is_violated(assignment) for separator in model.separators for c in separator(assignment))
+
+
+def locks(model):
+    """
+        locks(model: Model) -> (list[int], list[int]):
+            returns for every variable how many constraints could become violated by decreasing (down locks)
+            and by increasing it (up locks)
+    """
+    down_locks = [0 for _ in model.variables]
+    up_locks = [0 for _ in model.variables]
+    for constraint in model.constraints:
+        for (index, factor) in zip(constraint.expression.indices, constraint.expression.values):
+            if factor == 0:
+                continue
+            if constraint.type == co.ConstraintType.EQ or (factor > 0) == (constraint.type == co.ConstraintType.LE):
+                up_locks[index] += 1
+            if constraint.type == co.ConstraintType.EQ or (factor > 0) == (constraint.type == co.ConstraintType.GE):
+                down_locks[index] += 1
+    return (down_locks, up_locks)
+
+
+def _fractionality(value):
+    fraction = value - math.floor(value)
+    return min(fraction, 1 - fraction)
@@ -0,0 +1,102 @@
+import math
+
+# the smallest incumbent magnitude used by the relative gap, so a zero incumbent doesn't divide by zero
+_tiny = 0.0000000001
+
+
+class Limits:
+    """
+        Stopping criteria of the branch and bound (besides the timelimit).
+        A solve stopped by a limit is interrupted: its solution is the best one found, but it may not be optimal.
+        By default the tree is explored until the optimality is proven.
+
+        Attributes
+        ----------
+        relative_gap : float
+            the solve stops when the relative gap between the incumbent and the global bound is at most this value (e.g. 0.005 for 0.5%)
+        absolute_gap : float
+            the solve stops when the global bound exceeds the incumbent objective by at most this value
+        nodes : int | float
+            the solve stops after exploring this many nodes
+
+        Methods
+        -------
+        __init__(relative_gap: float, absolute_gap: float, nodes: int | float) -> Limits:
+            constructs new stopping criteria
+        reached(context: SolveContext) -> str | None:
+            returns the name of the limit reached by the solve ("gap" or "nodes"), None if it should continue
+    """
+
+    def __init__(self, relative_gap = 0.0, absolute_gap = 0.0, nodes = float('inf')):
+        self.relative_gap = relative_gap
+        self.absolute_gap = absolute_gap
+        self.nodes = nodes
+
+    def reached(self, context):
+        if context.nodes >= self.nodes:
+            return "nodes"
+        if context.best_solution is None or context.lower_bound == float('-inf'):
+            return None
+        if absolute_gap(context.lower_bound, context.upper_bound) <= self.absolute_gap:
+            return "gap"
+        if relative_gap(context.lower_bound, context.upper_bound) <= self.relative_gap:
+            return "gap"
+        return None
+
+
+class Progress:
+    """
+        A snapshot of a running branch and bound passed to the progress callback.
+        The objective values are the ones of the solved (maximized) model, like the objective values of its solutions.
+
+        Attributes
+        ----------
+        wall_time : float
+            how long the solve has been running (in seconds)
+        nodes : int
+            number of the explored nodes
+        open_nodes : int
+            number of the nodes waiting in the queue
+        incumbent : float | None
+            objective value of the best integer solution found so far, None if there is none yet
+        bound : float
+            global bound of the objective (no integer solution can be better)
+        gap : float
+            relative gap between the incumbent and the bound, inf if there is no incumbent yet
+        nodes_per_second : float
+            average speed of the exploration
+    """
+
+    def __init__(self, wall_time, nodes, open_nodes, incumbent, bound, gap):
+        self.wall_time = wall_time
+        self.nodes = nodes
+        self.open_nodes = open_nodes
+        self.incumbent = incumbent
+        self.bound = bound
+        self.gap = gap
+        self.nodes_per_second = nodes / wall_time if wall_time > 0 else 0.0
+
+    def __str__(self):
+        incumbent = '-' if self.incumbent is None else f'{self.incumbent:.6g}'
+        return f'{self.wall_time:7.2f}s | nodes: {self.nodes} ({self.nodes_per_second:.0f}/s), open: {self.open_nodes} | incumbent: {incumbent}, bound: {self.bound:.6g}, gap: {100 * self.gap:.2f}%'
+
+
+def absolute_gap(lower_bound, upper_bound):
+    """
+        absolute_gap(lower_bound: float, upper_bound: float) -> float:
+            returns by how much the global bound exceeds the incumbent objective, inf if there is no incumbent
+    """
+    if upper_bound <= lower_bound:
+        return 0.0
+    return upper_bound - lower_bound
+
+
+def relative_gap(lower_bound, upper_bound):
+    """
+        relative_gap(lower_bound: float, upper_bound: float) -> float:
+            returns the absolute gap relative to the magnitude of the incumbent objective, inf if there is no incumbent
+    """
+    gap = absolute_gap(lower_bound, upper_bound)
+    if gap == 0.0 or math.isinf(gap):
+        return gap
+    return gap / max(abs(lower_bound), _tiny)
@@ -1,6 +1,9 @@
 from copy import deepcopy
 from ..simplex import model as lpmodel
+from ..simplex import solution as lpsolution
 from . import solver as s
+from . import parallel as p
+from .options import Options
 
 class Model(lpmodel.Model):
     """
@@ -11,6 +14,17 @@ class Model(lpmodel.Model):
         ----------
         solver: Solver
         solver used to solve the model. Useful when one wants to check some statistics, solving time, etc. 
+
+        Methods:
+        ----------
+        solve(timelimit: float, exact: bool, retention: Retention, options: Options | None, start: list | None, resume: str | None) -> Solution:
+            solves the model with the branch and bound, in the exact mode every relaxation is verified in the rational arithmetic
+            retention decides what the returned solution keeps of its tableaux,
+            options configure the branch and bound (see saport.integer.options), with more than one worker in them
+            the subtrees are explored in parallel processes (see saport.integer.parallel),
+            start lists the known solutions (full lists of values or partial dicts from the variables to their values),
+            the best feasible one is the initial incumbent,
+            a solve checkpointed to a file (see the checkpoint option) can be resumed from it with a new timelimit (see saport.integer.checkpoint)
     """
 
     def __str__(self):
@@ -22,12 +36,16 @@ class Model(lpmodel.Model):
 '''
         return text
 
-    def solve(self, timelimit = float('inf')):
+    def solve(self, timelimit = float('inf'), exact = False, retention = lpsolution.Retention.BASIS, options = None, start = None, resume = None):
         if len(self.variables) == 0:
             raise Exception("Can't solve a model without any variables")
 
         if self.objective == None:
             raise Exception("Can't solve a model without an objective")
 
-        self.solver = s.Solver()
-        return self.solver.solve(self.translate_to_standard_form(), timelimit)
\ No newline at end of file
+        options = options if options is not None else Options()
+        if options.workers == 1:
+            self.solver = s.Solver(exact, retention, options)
+        else:
+            self.solver = p.ParallelSolver(exact, retention, options)
+        return self.solver.solve(self.translate_to_standard_form(), timelimit, start, resume)
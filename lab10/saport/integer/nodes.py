@@ -0,0 +1,191 @@
+import enum
+import heapq
+import itertools
+from copy import copy
+from ..simplex.expressions import constraint as co
+
+
+class NodeSelection(enum.Enum):
+    """
+        An enum to represent the order in which the branch and bound explores its nodes:
+        - BEST_BOUND = the node with the highest relaxation bound first (the global bound improves the fastest)
+        - DEPTH_FIRST = the deepest node first (the most recently created one, like the recursive search)
+        - BEST_ESTIMATE = the node with the highest estimated integer objective first
+        - HYBRID = depth first until the first integer solution is found, then best bound
+    """
+    BEST_BOUND = 'best-bound'
+    DEPTH_FIRST = 'depth-first'
+    BEST_ESTIMATE = 'best-estimate'
+    HYBRID = 'hybrid'
+
+
+class Node:
+    """
+        A node of the branch and bound tree.
+        It stores only the bound changes made by the branching, its model is the root model with these bounds added.
+
+        Attributes
+        ----------
+        bounds : tuple[tuple[int, ConstraintType, int]]
+            bound changes of the node as (variable index, type of the bound, value), at most one of each type per variable,
+            the last one is the bound added by the branching that created the node
+        depth : int
+            depth of the node in the tree
+        bound : float
+            upper bound of the objective in the subtree (the relaxed objective of the parent)
+        estimate : float
+            estimated objective of the best integer solution in the subtree
+        tableaux : Tableaux | None
+            final tableaux of the parent relaxation (shared by both children) to warm start from, None for a cold start
+        distance : float
+            how far the branched variable has been moved from its value in the parent relaxation (to update the pseudo costs)
+        pivots : int | None
+            number of the simplex pivots used to solve the relaxation of the node, None until it's solved
+
+        Methods
+        -------
+        __init__(bounds: tuple, depth: int, bound: float, estimate: float, tableaux: Tableaux | None, distance: float) -> Node:
+            constructs a new node, by default the root
+        child(index: int, type: ConstraintType, value: int, bound: float, estimate: float, tableaux: Tableaux | None, distance: float) -> Node:
+            returns a child node with an additional (or tightened) bound of the variable with the given index
+        model(root: Model) -> Model:
+            returns the root model with the bounds of the node added
+        branching_constraint(root: Model) -> Constraint:
+            returns the constraint of the bound added by the branching that created the node
+        detached() -> Node:
+            returns a copy of the node without the parent tableaux (e.g. to send it to another process)
+        tighten(bounds: list[tuple[int, ConstraintType, int]]):
+            replaces the bounds of the node with the tighter ones (e.g. implied by the presolve), keeping the branching bound the last one
+    """
+
+    def __init__(self, bounds = (), depth = 0, bound = float('inf'), estimate = float('inf'), tableaux = None, distance = 0.0):
+        self.bounds = bounds
+        self.depth = depth
+        self.bound = bound
+        self.estimate = estimate
+        self.tableaux = tableaux
+        self.distance = distance
+        self.pivots = None
+
+    def child(self, index, type, value, bound, estimate, tableaux = None, distance = 0.0):
+        bounds = tuple(b for b in self.bounds if b[0] != index or b[1] != type) + ((index, type, value),)
+        return Node(bounds, self.depth + 1, bound, estimate, tableaux, distance)
+
+    def model(self, root):
+        model = copy(root)
+        model.constraints = list(root.constraints)
+        for bound in self.bounds:
+            model.add_constraint(bound_constraint(root, bound))
+        return model
+
+    def branching_constraint(self, root):
+        return bound_constraint(root, self.bounds[-1])
+
+    def detached(self):
+        return Node(self.bounds, self.depth, self.bound, self.estimate, None, self.distance)
+
+    def tighten(self, bounds):
+        keys = set((index, type) for (index, type, _) in bounds)
+        branching = tuple(b for b in self.bounds[-1:] if self.depth > 0)
+        if len(branching) > 0 and branching[0][:2] in keys:
+            branching = tuple(b for b in bounds if b[:2] == branching[0][:2])
+        kept = tuple(b for b in self.bounds if b[:2] not in keys and b not in branching)
+        self.bounds = kept + tuple(b for b in bounds if b not in branching) + branching
+
+
+class NodeQueue:
+    """
+        A priority queue of the open branch and bound nodes ordered according to the node selection strategy.
+        Nodes with equal priorities are taken in the LIFO order, so the children of the last node are explored first.
+
+        Attributes
+        ----------
+        selection : NodeSelection
+            node selection strategy of the queue
+
+        Methods
+        -------
+        __init__(selection: NodeSelection) -> NodeQueue:
+            constructs an empty queue
+        push(node: Node):
+            adds a node to the queue
+        pop() -> Node:
+            removes and returns the node to be explored next
+        bound() -> float:
+            returns the highest bound of the queued nodes, -inf if the queue is empty
+        incumbent_found():
+            notifies the queue about the first integer solution, the hybrid strategy stops diving then
+        drain() -> list[Node]:
+            removes and returns all the queued nodes
+        split() -> list[Node]:
+            removes and returns every other node in the order of the queue, so both halves have nodes of every priority
+        nodes() -> list[Node]:
+            returns all the queued nodes (in no particular order) without removing them
+    """
+
+    def __init__(self, selection):
+        self.selection = selection
+        self._diving = selection in (NodeSelection.DEPTH_FIRST, NodeSelection.HYBRID)
+        self._nodes = []
+        self._bounds = []
+        self._popped = set()
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def push(self, node):
+        order = next(self._counter)
+        heapq.heappush(self._nodes, (self._priority(node, order), order, node))
+        heapq.heappush(self._bounds, (-node.bound, order))
+
+    def pop(self):
+        (_, order, node) = heapq.heappop(self._nodes)
+        self._popped.add(order)
+        return node
+
+    def bound(self):
+        while len(self._bounds) > 0 and self._bounds[0][1] in self._popped:
+            self._popped.remove(heapq.heappop(self._bounds)[1])
+        return -self._bounds[0][0] if len(self._bounds) > 0 else float('-inf')
+
+    def incumbent_found(self):
+        if self.selection == NodeSelection.HYBRID and self._diving:
+            self._diving = False
+            self._nodes = [(self._priority(node, order), order, node) for (_, order, node) in self._nodes]
+            heapq.heapify(self._nodes)
+
+    def drain(self):
+        nodes = [node for (_, _, node) in self._nodes]
+        self._nodes = []
+        self._bounds = []
+        self._popped = set()
+        return nodes
+
+    def split(self):
+        entries = sorted(self._nodes)
+        # a sorted list is a heap already
+        self._nodes = entries[0::2]
+        given = entries[1::2]
+        self._popped.update(order for (_, order, _) in given)
+        return [node for (_, _, node) in given]
+
+    def nodes(self):
+        return [node for (_, _, node) in self._nodes]
+
+    def _priority(self, node, order):
+        if self._diving:
+            return (-node.depth, -order)
+        if self.selection == NodeSelection.BEST_ESTIMATE:
+            return (-node.estimate, -order)
+        return (-node.bound, -order)
+
+
+def bound_constraint(root, bound):
+    """
+        bound_constraint(root: Model, bound: tuple[int, ConstraintType, int]) -> Constraint:
+            returns the constraint of the bound of the root model variable
+    """
+    (index, type, value) = bound
+    variable = root.variables[index]
+    return variable >= value if type == co.ConstraintType.GE else variable <= value
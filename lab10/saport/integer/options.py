@@ -0,0 +1,67 @@
+import os
+from .nodes import NodeSelection
+from .branching import LastFractional
+from .limits import Limits
+
+
+class Options:
+    """
+        Configuration of the branch and bound, shared by the serial and the parallel solver.
+        By default the nodes are explored best bound first and warm started from their parents,
+        without the cutting planes, the primal heuristics, the node presolve, the limits or the checkpoints, in a single process.
+
+        Attributes
+        ----------
+        selection : NodeSelection
+            order in which the nodes are explored
+        warm_start : bool
+            whether the child nodes are re-optimized from the tableaux of their parents
+        branching : BranchingRule
+            rule choosing the variable to branch on (see saport.integer.branching), by default the last fractional one
+        cuts : CuttingPlanes | None
+            configuration of the cutting plane loop strengthening the relaxations (see saport.integer.cuts), None to rely only on the branching
+        heuristics : list[PrimalHeuristic]
+            heuristics looking for the integer solutions in the fractional nodes (see saport.integer.heuristics), by default none
+        limits : Limits
+            gap and node limits stopping the solve before the optimality is proven (see saport.integer.limits), by default none
+        progress : Callable[[Progress], None] | None
+            callback receiving the progress of every solve, None to report nothing
+        progress_interval : float
+            how often (in seconds) the progress is reported
+        presolve : NodePresolve | None
+            bound propagation and reduced cost fixing tightening the bounds in the nodes (see saport.integer.presolve), None to disable it
+        checkpoint : str | None
+            file the state of every solve is periodically written to (see saport.integer.checkpoint), None to write nothing
+        checkpoint_interval : float
+            how often (in seconds) the checkpoint is written, the final state is always written at the end of the solve
+        workers : int
+            number of the processes exploring the subtrees (see saport.integer.parallel), None for one per core
+        ramp_up : int
+            how many open nodes per worker the parallel coordinator creates before handing them out
+
+        Methods
+        -------
+        __init__(selection: NodeSelection, warm_start: bool, branching: BranchingRule | None, cuts: CuttingPlanes | None, heuristics: list[PrimalHeuristic] | None, limits: Limits | None, progress: Callable | None, progress_interval: float, presolve: NodePresolve | None, checkpoint: str | None, checkpoint_interval: float, workers: int | None, ramp_up: int) -> Options:
+            constructs a new configuration
+        serial() -> Options:
+            returns the configuration of the solvers run by the parallel workers (without the limits, progress and checkpoints,
+            they're handled by the coordinator)
+    """
+
+    def __init__(self, selection = NodeSelection.BEST_BOUND, warm_start = True, branching = None, cuts = None, heuristics = None, limits = None, progress = None, progress_interval = 1.0, presolve = None, checkpoint = None, checkpoint_interval = 60.0, workers = 1, ramp_up = 2):
+        self.selection = selection
+        self.warm_start = warm_start
+        self.branching = branching if branching is not None else LastFractional()
+        self.cuts = cuts
+        self.heuristics = heuristics if heuristics is not None else []
+        self.limits = limits if limits is not None else Limits()
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.presolve = presolve
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.ramp_up = ramp_up
+
+    def serial(self):
+        return Options(self.selection, self.warm_start, self.branching, self.cuts, self.heuristics, presolve = self.presolve)
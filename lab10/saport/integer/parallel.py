@@ -0,0 +1,224 @@
+import itertools
+from copy import copy
+import multiprocessing
+import queue
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from .checkpoint import Checkpoint
+from .nodes import Node, NodeQueue
+from .solver import SolveContext, Solver
+
+# state of the worker processes: the root model, the cuts of the coordinator's pool and the values shared with the coordinator
+_model = None
+_cuts = None
+_incumbent = None
+_requests = None
+_claimed = None
+_donations = None
+_stop = None
+
+
+def _initialize(model, cuts, incumbent, requests, claimed, donations, stop):
+    global _model, _cuts, _incumbent, _requests, _claimed, _donations, _stop
+    (_model, _cuts, _incumbent, _requests, _claimed, _donations, _stop) = (model, cuts, incumbent, requests, claimed, donations, stop)
+
+
+class ParallelSolver(Solver):
+    """
+        Branch and bound solver exploring the subtrees in parallel worker processes.
+
+        The coordinator explores the top of the tree itself, until there are enough open nodes for all the workers.
+        Then it hands the open nodes (as their bound sets) to the process pool, one subtree per task.
+        Workers share the objective value of the incumbent through the shared memory, so every worker prunes with the best one found
+        by any of them. When the coordinator has no nodes for an idle worker, it requests them through a shared counter:
+        the first busy worker claiming the request sends every other of its open nodes to the coordinator (through a queue)
+        and goes on with the rest, so the idle worker steals half of the work of a single busy one.
+        Subtrees start from a cold relaxation (tableaux aren't sent between the processes), their nodes are warm started as usual.
+        The cuts pooled by the coordinator (e.g. the root ones) are sent to every worker process once, the pool of every task starts with them.
+        When a limit is reached, all the workers stop and return their open nodes, so the global bound stays valid.
+        The limits are checked by the coordinator, whenever a worker returns, so a solve can explore a few more nodes than the node limit.
+        The model (and its lazy constraint separators) has to be picklable, solutions found by the workers keep only their assignment.
+
+        The number of the worker processes and the ramp up (how many open nodes per worker the coordinator creates before handing them out,
+        one is enough for an even start, more of them let the coordinator choose the best ones for the freed workers) come from the options.
+
+        Methods
+        -------
+        __init__(exact: bool, retention: Retention, options: Options | None) -> ParallelSolver:
+            constructs a new solver (see Solver)
+        serial() -> Solver:
+            returns a serial solver with the same configuration (used by the workers)
+        solve(model: Model, timelimit: int, start: list | None, resume: Checkpoint | str | None) -> Solution:
+            solves the given model within a specified timelimit, starting from the initial solutions (or the checkpoint)
+    """
+
+    def __reduce__(self):
+        return (ParallelSolver, (self.exact, self.retention, self.options))
+
+    def serial(self):
+        # limits and progress are handled by the coordinator
+        return Solver(self.exact, self.retention, self.options.serial())
+
+    def solve(self, model, timelimit, start = None, resume = None):
+        context = self.create_context(model, timelimit)
+        self._local.context = context
+
+        context.start_timer()
+        if resume is not None:
+            (Checkpoint.load(resume) if isinstance(resume, str) else resume).restore(context, self.retention)
+        self.install_start(context, start)
+        while 0 < len(context.queue) < self.options.ramp_up * self.options.workers:
+            context.upper_bound = max(context.queue.bound(), context.lower_bound)
+            context.report()
+            if context.checkpointer is not None:
+                context.checkpointer.update(context)
+            if context.should_stop():
+                break
+            self.process_node(context, context.queue.pop())
+        if len(context.queue) > 0 and not context.interrupted:
+            self._explore_in_parallel(context)
+        context.upper_bound = max(context.queue.bound(), context.lower_bound) if context.interrupted else context.lower_bound
+        context.stop_timer()
+        context.report(force = True)
+        if context.checkpointer is not None:
+            context.checkpointer.close(context)
+
+        return context.best_solution
+
+    def _explore_in_parallel(self, context):
+        incumbent = multiprocessing.Value('d', context.lower_bound)
+        requests = multiprocessing.Value('i', 0)
+        claimed = multiprocessing.Value('i', 0)
+        donations = multiprocessing.Queue()
+        stop = multiprocessing.Value('b', 0)
+        serial = self.serial()
+        running = {}
+        # donated node lists received from every task, the finished ones report how many they have sent
+        received = {}
+        tasks = itertools.count()
+
+        def receive(block):
+            while True:
+                try:
+                    (task, nodes) = donations.get(timeout = 1.0) if block else donations.get_nowait()
+                except queue.Empty:
+                    return
+                received[task] = received.get(task, 0) + 1
+                for node in nodes:
+                    context.queue.push(node)
+                if block:
+                    return
+
+        # the coordinator doesn't explore any nodes from now on, so its pool doesn't change anymore
+        cuts = context.cut_pool.cuts() if context.cut_pool is not None else []
+        with ProcessPoolExecutor(self.options.workers, initializer = _initialize, initargs = (context.model, cuts, incumbent, requests, claimed, donations, stop)) as executor:
+            while (len(context.queue) > 0 and not context.interrupted) or len(running) > 0:
+                receive(False)
+                while len(context.queue) > 0 and len(running) < self.options.workers and not context.interrupted:
+                    node = context.queue.pop()
+                    if node.bound > context.lower_bound:
+                        remaining = context.timelimit - context.wall_time()
+                        task = next(tasks)
+                        running[executor.submit(_explore, serial, task, [node.detached()], remaining)] = (task, node)
+                if not context.interrupted:
+                    # the claimed donations, which haven't arrived yet, will feed some of the idle workers
+                    wanted = self.options.workers - len(running) if len(context.queue) == 0 else 0
+                    with requests.get_lock():
+                        requests.value = max(wanted - (claimed.value - sum(received.values())), 0)
+                context.upper_bound = max([context.queue.bound(), context.lower_bound] + [node.bound for (_, node) in running.values()])
+                context.report()
+                if context.checkpointer is not None:
+                    # subtrees of the running nodes (with the nodes donated by them) are explored again after resuming
+                    context.checkpointer.update(context, [node for (_, node) in running.values()])
+                if len(running) == 0:
+                    continue
+
+                (done, _) = wait(running, timeout = self._wait_timeout(context, requests.value > 0), return_when = FIRST_COMPLETED)
+                for future in done:
+                    (task, _) = running.pop(future)
+                    (assignment, nodes, cuts_added, open_nodes, donated, interrupted) = future.result()
+                    # the donations of a finished task are in the queue already, so none of its nodes is lost
+                    while received.get(task, 0) < donated:
+                        receive(True)
+                    context.nodes += nodes
+                    context.cuts += cuts_added
+                    if interrupted and not context.interrupted:
+                        (context.interrupted, context.stop_reason) = (True, "timelimit")
+                    if assignment is not None:
+                        context.improve(context.solution(assignment, self.retention), "worker")
+                        with incumbent.get_lock():
+                            incumbent.value = max(incumbent.value, context.lower_bound)
+                    for node in open_nodes:
+                        context.queue.push(node)
+                receive(False)
+                context.upper_bound = max([context.queue.bound(), context.lower_bound] + [node.bound for (_, node) in running.values()])
+                if not context.interrupted and context.should_stop():
+                    # the busy workers return their open nodes, so the global bound stays valid
+                    with requests.get_lock():
+                        requests.value = 0
+                    stop.value = 1
+
+    def _wait_timeout(self, context, requesting):
+        # the coordinator wakes up to report the progress and write the checkpoints even when no worker returns,
+        # while it's waiting for the donated nodes, it checks the queue often
+        intervals = [0.01] if requesting else []
+        if context.progress is not None:
+            intervals.append(context.progress_interval)
+        if context.checkpointer is not None:
+            intervals.append(context.checkpointer.interval)
+        return min(intervals) if len(intervals) > 0 else None
+
+
+def _explore(solver, task, nodes, timelimit):
+    """
+        _explore(solver: Solver, task: int, nodes: list[Node], timelimit: float) -> (list[float] | None, int, int, list[Node], int, bool):
+            explores the subtrees of the nodes in a worker process, until they're done, the timelimit is reached
+            or the coordinator stops the workers, half of the open nodes are donated (tagged with the task) when another worker is idle,
+            returns the best assignment found (None if it isn't better than the shared incumbent),
+            the number of the explored nodes, the number of the cuts added to their relaxations, the open nodes left, the number of the donations and whether it has been interrupted by the timelimit
+    """
+    context = SolveContext(_model, timelimit)
+    context.queue = NodeQueue(solver.options.selection)
+    context.cut_pool = solver.options.cuts.pool() if solver.options.cuts is not None else None
+    if context.cut_pool is not None:
+        # every task ages its own copies of the cuts
+        for cut in _cuts:
+            context.cut_pool.add(copy(cut))
+    context.domains = solver.options.presolve.domains(_model) if solver.options.presolve is not None else None
+    context.lower_bound = _incumbent.value
+    for node in nodes:
+        context.queue.push(node)
+
+    donated = 0
+    context.start_timer()
+    while len(context.queue) > 0:
+        if context.nodes > 0 and context.timeout():
+            context.interrupted = True
+            break
+        if _stop.value:
+            break
+        # an idle worker steals half of the subtree, only one busy worker serves every request
+        if _requests.value > 0 and len(context.queue) > 1 and _claim_request():
+            given = [node.detached() for node in context.queue.split() if node.bound > context.lower_bound]
+            _donations.put((task, given))
+            donated += 1
+        context.lower_bound = max(context.lower_bound, _incumbent.value)
+        solver.process_node(context, context.queue.pop())
+        # only an incumbent found by this worker can be better than the shared one
+        if context.lower_bound > _incumbent.value:
+            with _incumbent.get_lock():
+                _incumbent.value = max(_incumbent.value, context.lower_bound)
+
+    best = context.best_solution
+    assignment = best.assignment if best is not None and best.assignment is not None else None
+    open_nodes = [node.detached() for node in context.queue.drain() if node.bound > context.lower_bound]
+    return (assignment, context.nodes, context.cuts, open_nodes, donated, context.interrupted)
+
+
+def _claim_request():
+    with _requests.get_lock():
+        if _requests.value <= 0:
+            return False
+        _requests.value -= 1
+        with _claimed.get_lock():
+            _claimed.value += 1
+        return True
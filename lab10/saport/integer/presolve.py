@@ -0,0 +1,228 @@
+import math
+import numpy as np
+from ..simplex.expressions import constraint as co
+from ..simplex.tableaux import eps
+
+# tolerance of the implied bounds, a bound within it from an integer is rounded to that integer
+_eps = 0.000001
+
+
+class Domains:
+    """
+        Bounds of the variables in a single solve: the global ones (implied by the nonnegativity, the single variable constraints
+        of the model and the reduced cost fixing in the root) and the linear constraints used to propagate them.
+
+        Attributes
+        ----------
+        model_lower : numpy.Array
+            lower bounds of the variables given by the rows of the model
+        model_upper : numpy.Array
+            upper bounds of the variables given by the rows of the model (inf if unbounded)
+        lower : numpy.Array
+            global lower bounds of the variables (the model ones tightened by the reduced cost fixing in the root)
+        upper : numpy.Array
+            global upper bounds of the variables
+        matrix : numpy.Array
+            factors of the multi variable constraints as "<=" rows
+        bounds : numpy.Array
+            right hand sides of the rows
+        root_tableaux : Tableaux | None
+            final tableaux of the root relaxation, its reduced costs fix the global bounds whenever the incumbent improves
+        fixed_at : float
+            the incumbent objective the global bounds have been fixed with
+
+        Methods
+        -------
+        __init__(model: Model) -> Domains:
+            collects the bounds and the rows of the model constraints
+        node_bounds(node: Node, model_only: bool) -> (numpy.Array, numpy.Array):
+            returns the lower and upper bounds of the variables in the node (the global ones tightened by the node bounds),
+            with model_only the model bounds are tightened instead, so only the bounds which are rows of the node model are returned
+        fix(index: int, type: ConstraintType, value: int):
+            tightens the global bound of the variable
+        propagate(lower: numpy.Array, upper: numpy.Array, max_rounds: int) -> bool:
+            tightens the bounds (in place) with the activities of the rows, returns False if some row can't be satisfied
+    """
+
+    def __init__(self, model):
+        count = len(model.variables)
+        self.lower = np.zeros(count)
+        self.upper = np.full(count, np.inf)
+        self.root_tableaux = None
+        self.fixed_at = float('-inf')
+        rows = []
+        bounds = []
+        for constraint in model.constraints:
+            factors = np.array(constraint.expression.factors(model), dtype = float)
+            signs = {co.ConstraintType.LE: [1.0], co.ConstraintType.GE: [-1.0], co.ConstraintType.EQ: [1.0, -1.0]}[constraint.type]
+            for sign in signs:
+                (row, bound) = (sign * factors, sign * constraint.bound)
+                columns = np.nonzero(row)[0]
+                if len(columns) == 1:
+                    (index, factor) = (columns[0], row[columns[0]])
+                    if factor > 0:
+                        self.fix(index, co.ConstraintType.LE, math.floor(bound / factor + _eps))
+                    else:
+                        self.fix(index, co.ConstraintType.GE, math.ceil(bound / factor - _eps))
+                elif len(columns) > 1:
+                    rows.append(row)
+                    bounds.append(bound)
+        self.matrix = np.array(rows).reshape(len(rows), count)
+        self.bounds = np.array(bounds)
+        (self.model_lower, self.model_upper) = (self.lower.copy(), self.upper.copy())
+
+    def node_bounds(self, node, model_only = False):
+        (lower, upper) = (self.model_lower.copy(), self.model_upper.copy()) if model_only else (self.lower.copy(), self.upper.copy())
+        for (index, type, value) in node.bounds:
+            if type == co.ConstraintType.LE:
+                upper[index] = min(upper[index], value)
+            else:
+                lower[index] = max(lower[index], value)
+        return (lower, upper)
+
+    def propagate(self, lower, upper, max_rounds):
+        matrix = self.matrix
+        (positive, negative) = (matrix > 0, matrix < 0)
+        for _ in range(max_rounds):
+            if np.any(lower > upper + _eps):
+                return False
+            # the smallest activity of every row, the unbounded contributions are counted separately
+            with np.errstate(invalid = 'ignore'):
+                contributions = np.where(positive, matrix * lower, np.where(negative, matrix * upper, 0.0))
+            unbounded = np.isinf(contributions)
+            finite = np.where(unbounded, 0.0, contributions)
+            activity = finite.sum(axis = 1)
+            unbounded_count = unbounded.sum(axis = 1)
+            if np.any((unbounded_count == 0) & (activity > self.bounds + _eps)):
+                return False
+
+            # activity of the rest of the row bounds every variable of the row, if the rest is bounded
+            rest = activity[:, None] - finite
+            known = (unbounded_count[:, None] - unbounded) == 0
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                limits = (self.bounds[:, None] - rest) / matrix
+            new_upper = np.min(np.where(positive & known, np.floor(limits + _eps), np.inf), axis = 0, initial = np.inf)
+            new_lower = np.max(np.where(negative & known, np.ceil(limits - _eps), -np.inf), axis = 0, initial = -np.inf)
+            tighter = (new_upper < upper) | (new_lower > lower)
+            if not np.any(tighter):
+                break
+            np.minimum(upper, new_upper, out = upper)
+            np.maximum(lower, new_lower, out = lower)
+        return not np.any(lower > upper + _eps)
+
+    def fix(self, index, type, value):
+        if type == co.ConstraintType.LE:
+            self.upper[index] = min(self.upper[index], value)
+        else:
+            self.lower[index] = max(self.lower[index], value)
+
+
+class NodePresolve:
+    """
+        Tightens the bounds of the variables in the branch and bound nodes, so fewer nodes are explored:
+        - before the relaxation of a node is solved, its bounds are propagated over the constraints
+          (the smallest activity of the rest of a row bounds each of its variables), a node with a row
+          which can't be satisfied within its bounds is pruned without solving the relaxation,
+        - after the relaxation is solved, the reduced cost of a nonbasic column proves how far it can move
+          before the relaxation falls to the incumbent, so the variable (or the variable of a bound row with the nonbasic slack)
+          can be bounded, fixings of the root are global and they're repeated whenever the incumbent improves.
+        Bounds are stored as the bound rows of the nodes (like the branching ones), so they're inherited by the subtrees.
+
+        Attributes
+        ----------
+        propagation : bool
+            whether the bounds are propagated over the constraints
+        reduced_cost_fixing : bool
+            whether the reduced costs fix the bounds
+        max_rounds : int
+            how many passes over the constraints the propagation makes at most
+
+        Methods
+        -------
+        __init__(propagation: bool, reduced_cost_fixing: bool, max_rounds: int) -> NodePresolve:
+            constructs a new configuration, by default with both techniques
+        domains(model: Model) -> Domains:
+            returns the global bounds of the model variables for a solve
+        propagate(context: SolveContext, node: Node) -> list[tuple[int, ConstraintType, int]] | None:
+            returns the bounds implied in the node (tighter than its current ones), None if the node is unfeasible
+        fix(context: SolveContext, node: Node, tableaux: Tableaux) -> list[tuple[int, ConstraintType, int]]:
+            returns the bounds fixed by the reduced costs of the final tableaux of the node (tighter than its current ones)
+    """
+
+    def __init__(self, propagation = True, reduced_cost_fixing = True, max_rounds = 5):
+        self.propagation = propagation
+        self.reduced_cost_fixing = reduced_cost_fixing
+        self.max_rounds = max_rounds
+
+    def domains(self, model):
+        return Domains(model)
+
+    def propagate(self, context, node):
+        domains = context.domains
+        if self.reduced_cost_fixing and domains.root_tableaux is not None and context.lower_bound > domains.fixed_at:
+            domains.fixed_at = context.lower_bound
+            for bound in reduced_cost_bounds(domains.root_tableaux, context.lower_bound):
+                domains.fix(*bound)
+
+        (lower, upper) = domains.node_bounds(node)
+        if self.propagation and not domains.propagate(lower, upper, self.max_rounds):
+            return None
+        if np.any(lower > upper):
+            return None
+        # the global fixings aren't rows of the node model yet, so they're returned too
+        (row_lower, row_upper) = domains.node_bounds(node, model_only = True)
+        implied = [(int(i), co.ConstraintType.GE, int(lower[i])) for i in np.nonzero(lower > row_lower)[0]]
+        implied += [(int(i), co.ConstraintType.LE, int(upper[i])) for i in np.nonzero(upper < row_upper)[0]]
+        return implied
+
+    def fix(self, context, node, tableaux):
+        if not self.reduced_cost_fixing:
+            return []
+        if node.depth == 0:
+            context.domains.root_tableaux = tableaux
+        if context.lower_bound == float('-inf'):
+            return []
+        (lower, upper) = context.domains.node_bounds(node)
+        fixed = []
+        for (index, type, value) in reduced_cost_bounds(tableaux, context.lower_bound):
+            if (type == co.ConstraintType.LE and value < upper[index]) or (type == co.ConstraintType.GE and value > lower[index]):
+                fixed.append((index, type, value))
+        return fixed
+
+
+def reduced_cost_bounds(tableaux, lower_bound):
+    """
+        reduced_cost_bounds(tableaux: Tableaux, lower_bound: float) -> list[tuple[int, ConstraintType, int]]:
+            returns the bounds of the model variables proven by the reduced costs of the optimal tableaux:
+            a nonbasic column with the reduced cost d can grow at most by (cost - lower_bound) / d
+            before the objective falls to the lower bound, it bounds a model variable directly
+            or through the slack (surplus) of a row with a single model variable
+    """
+    standard_form = tableaux.standard_form
+    count = standard_form.variables_count
+    costs = tableaux.cost_factors()
+    gap = tableaux.cost() - lower_bound
+    rows_of = dict(standard_form.slack_variables)
+    rows_of.update(standard_form.surplus_variables)
+
+    bounds = []
+    for column in np.nonzero(costs > eps)[0]:
+        reach = gap / costs[column]
+        if column < count:
+            bounds.append((int(column), co.ConstraintType.LE, math.floor(reach + _eps)))
+            continue
+        if column not in rows_of:
+            continue
+        row = rows_of[column]
+        factors = standard_form.matrix[row, :count]
+        variables = np.nonzero(factors)[0]
+        if len(variables) != 1:
+            continue
+        # factor * x + sign * s = bound, so x moves from bound / factor to (bound - sign * reach) / factor
+        (index, factor, sign, bound) = (int(variables[0]), factors[variables[0]], standard_form.matrix[row, column], standard_form.bounds[row])
+        limit = (bound - sign * reach) / factor
+        if -sign / factor > 0:
+            bounds.append((index, co.ConstraintType.LE, math.floor(limit + _eps)))
+        else:
+            bounds.append((index, co.ConstraintType.GE, math.ceil(limit - _eps)))
+    return bounds
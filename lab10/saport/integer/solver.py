@@ -1,11 +1,20 @@
-from copy import deepcopy
 from ..simplex import solver as lpsolver
+from ..simplex import solution as lpsolution
+from ..simplex.expressions import constraint as co
+from .. import pool as solver_pool
+from .nodes import Node, NodeQueue, NodeSelection, bound_constraint
+from .branching import PseudoCosts
+from .limits import Limits, Progress, relative_gap
+from .heuristics import complete_assignment
+from .checkpoint import Checkpoint, Checkpointer
+from .options import Options
 import math
-import time 
+import threading
+import time
 
-class Solver:
+class SolveContext:
     """
-        Naive branch and bound solver for integer programming problems
+        State of a single branch and bound run, so one solver can be used by many threads at once.
 
 
         Attributes
@@ -19,7 +28,46 @@ class Solver:
         start_time: float
             when the solving started
         interrupted: bool
-            whether solving has been interrupted (by timeout)
+            whether solving has been interrupted (by timeout or one of the limits)
+        stop_reason: str | None
+            why the solve has been interrupted ("timelimit", "gap" or "nodes"), None if the tree has been fully explored
+        limits: Limits
+            stopping criteria of the solve (gap and node limits)
+        progress: Callable[[Progress], None] | None
+            callback receiving the progress of the solve, None if it isn't reported
+        progress_interval: float
+            how often (in seconds) the progress is reported, it's always reported at the end of the solve too
+        lower_bound: float
+            objective value of the best integer solution found so far
+        upper_bound: float
+            global bound of the objective (the highest bound of the open nodes or the lower bound),
+            updated before every node, so it can be read while the solve is running
+        best_solution: Solution | None
+            the best integer solution found so far
+        incumbents: list[tuple[float, float, str]]
+            every improvement of the best integer solution as (wall time, objective value, source),
+            the source is "relaxation", "start" (an initial solution), "checkpoint" (the resumed one), "worker" (a parallel worker)
+            or the name of the primal heuristic that found it
+        queue: NodeQueue | None
+            open nodes of the tree
+        nodes: int
+            number of the explored nodes
+        node_pivots: list[int]
+            number of the simplex pivots used by every explored node (in the order of exploration)
+        pseudo_costs: PseudoCosts
+            degradations of the objective per unit change of the branched variables observed so far
+        cut_pool: CutPool | None
+            globally valid cuts found so far, None if the cutting planes are disabled
+        cuts: int
+            number of the cuts added to the relaxations
+        domains: Domains | None
+            global bounds of the variables used by the node presolve, None if it's disabled
+        presolved: int
+            number of the nodes pruned by the bound propagation (without solving their relaxations)
+        fixings: int
+            number of the bounds tightened by the node presolve
+        checkpointer: Checkpointer | None
+            writes the checkpoints of the solve, None if they aren't written
 
         Methods
         -------
@@ -30,87 +78,331 @@ class Solver:
         wall_time() -> float:
             returns how long solver has been working
         timeout() -> bool:
-            whether solver should stop working due to the timeout
-
-        solve(model: Model, timelimit: int) -> Solution:
-            solves the given model within a specified timelimit
-        branch_and_bound(model: Model):
-            processes given model in branch and bound fashion (recursively)
-        find_float_assignment(solution: Solution):
-            finds a variable with non-integer value in the current solution
-            returns None if the solution is a correct integer solution
-        model_with_new_constraint(self, model, constraint):
-            creates a new model with an additional constraint
-    """  
+            whether solver should stop working due to the timeout (or cancellation of the async solve)
+        gap() -> float:
+            returns the relative gap between the incumbent and the global bound, inf if there is no incumbent yet
+        should_stop() -> bool:
+            whether the solve should stop due to the timeout or one of the limits, stores the reason and marks it as interrupted
+            (unless the gap is closed, so the incumbent is optimal), the root is always explored, so there is some bound
+        report(force: bool):
+            passes the progress to the callback, if the reporting interval has passed since the last report (or it's forced)
+        improve(solution: Solution, source: str) -> bool:
+            makes the solution the best one if it's better than the current one, returns whether it has been
+        solution(assignment: list[float], retention: Retention) -> Solution:
+            creates a solution of the model with an assignment found without a relaxation (e.g. by a heuristic),
+            it has no tableaux, but it has the standard form of the model
+    """
 
-    def solve(self, model, timelimit):
+    def __init__(self, model, timelimit):
+        self.model = model
         self.timelimit = timelimit
         self.total_time = None
         self.start_time = None
         self.interrupted = False
-
-        self.model = model
+        self.stop_reason = None
+        self.limits = Limits()
+        self.progress = None
+        self.progress_interval = 1.0
+        self._last_report = 0.0
         self.lower_bound = float('-inf')
+        self.upper_bound = float('inf')
         self.best_solution = None
+        self.incumbents = []
+        self.queue = None
+        self.nodes = 0
+        self.node_pivots = []
+        self.pseudo_costs = PseudoCosts()
+        self.cut_pool = None
+        self.cuts = 0
+        self.domains = None
+        self.presolved = 0
+        self.fixings = 0
+        self.checkpointer = None
+
+    def start_timer(self):
+        self.start_time = time.time()
+
+    def stop_timer(self):
+        self.total_time = self.wall_time()
+
+    def wall_time(self) -> float:
+        return time.time() - self.start_time
+
+    def timeout(self) -> bool:
+        return self.wall_time() > self.timelimit or solver_pool.is_cancelled()
+
+    def gap(self) -> float:
+        return relative_gap(self.lower_bound, self.upper_bound)
+
+    def should_stop(self) -> bool:
+        if self.nodes == 0:
+            return False
+        reason = "timelimit" if self.timeout() else self.limits.reached(self)
+        # the open nodes can't improve the incumbent anymore, so it's optimal
+        if reason == "gap" and self.upper_bound <= self.lower_bound:
+            self.queue.drain()
+            return True
+        if reason is not None:
+            self.interrupted = True
+            self.stop_reason = reason
+        return reason is not None
+
+    def report(self, force = False):
+        if self.progress is None:
+            return
+        wall_time = self.wall_time()
+        if not force and wall_time - self._last_report < self.progress_interval:
+            return
+        self._last_report = wall_time
+        incumbent = self.lower_bound if self.best_solution is not None and self.best_solution.assignment is not None else None
+        open_nodes = len(self.queue) if self.queue is not None else 0
+        self.progress(Progress(wall_time, self.nodes, open_nodes, incumbent, self.upper_bound, self.gap()))
+
+    def improve(self, solution, source):
+        objective = solution.objective_value()
+        if objective <= self.lower_bound:
+            return False
+        self.lower_bound = objective
+        self.best_solution = solution
+        self.incumbents.append((self.wall_time(), objective, source))
+        if self.queue is not None:
+            self.queue.incumbent_found()
+        return True
+
+    def solution(self, assignment, retention):
+        return lpsolution.Solution.with_assignment(self.model, assignment, None, None, self.model.standard_form(), retention)
+
+
+class Solver:
+    """
+        Branch and bound solver for integer programming problems.
+        Open nodes are kept in an explicit queue (so deep trees don't hit the recursion limit),
+        the order of their exploration is decided by the node selection strategy.
+        With the warm start, a child node starts from the final tableaux of its parent with the new bound added as a row,
+        and it's re-optimized with a few dual simplex pivots instead of being solved from scratch.
+        The solver keeps no state of the solving itself (it's stored in the SolveContext),
+        so the same instance can be shared by many threads.
+
+
+        Attributes
+        ----------
+        exact: bool
+            whether the relaxations are verified in the rational arithmetic,
+            then the integrality of the verified assignments is checked exactly instead of with a tolerance
+        retention: Retention
+            what the relaxed solutions (and so the returned one) keep of their tableaux, by default only the basis
+        options: Options
+            configuration of the branch and bound: the node selection, the warm start, the branching rule, the cutting planes,
+            the primal heuristics, the limits, the progress reporting, the node presolve and the checkpoints (see saport.integer.options)
+        context: SolveContext | None
+            context of the last solve run by the current thread
+        total_time: float
+            how long the last solve (in the current thread) took
+        interrupted: bool
+            whether the last solve (in the current thread) has been interrupted (by timeout)
+
+        Methods
+        -------
+        __init__(exact: bool, retention: Retention, options: Options | None) -> Solver:
+            constructs a new solver, by default without the exact verification and with the default options
+        solve(model: Model, timelimit: int, start: list | None, resume: Checkpoint | str | None) -> Solution:
+            solves the given model within a specified timelimit, starting from the initial solutions (see install_start),
+            a resumed solve continues from the checkpoint (or its file) instead of the root, with the new timelimit
+        install_start(context: SolveContext, start: list[list[float] | dict[Variable | str, float]] | None):
+            makes the best feasible initial solution (full or partial, see heuristics.complete_assignment) the incumbent,
+            so the nodes can be pruned from the root
+        create_context(model: Model, timelimit: int) -> SolveContext:
+            returns a new context of a solve configured by the solver, with the root node in its queue
+        branch_and_bound(context: SolveContext):
+            explores the nodes of the context queue until it's empty (or the solve times out or reaches a limit)
+        process_node(context: SolveContext, node: Node):
+            solves the relaxation of the node and either prunes it, accepts its integer solution or branches it
+        find_float_assignment(context: SolveContext, solution: Solution):
+            finds a variable with non-integer value in the current solution
+            returns None if the solution is a correct integer solution
+        fractional_variables(context: SolveContext, solution: Solution) -> list[Variable]:
+            returns all the variables with non-integer values in the current solution (in the model order)
+        estimate(context: SolveContext, solution: Solution, var: Variable, value: int) -> float:
+            estimates the best integer objective of the child bounding the variable to the given value
+            (computed only for the best estimate selection, the other strategies use the bound)
+    """
+
+    def __init__(self, exact = False, retention = lpsolution.Retention.BASIS, options = None):
+        self.exact = exact
+        self.retention = retention
+        self.options = options if options is not None else Options()
+        self._local = threading.local()
 
-        self.start_timer()
-        self.branch_and_bound(model)
-        self.stop_timer()
+    def __reduce__(self):
+        # thread local storage can't be copied, a copy (e.g. of a model keeping its solver) is just a new solver
+        return (Solver, (self.exact, self.retention, self.options))
 
-        return self.best_solution
-           
-    def branch_and_bound(self, model):
-        relaxed_solution = lpsolver.Solver().solve(model)
+    @property
+    def context(self):
+        return getattr(self._local, 'context', None)
+
+    @property
+    def total_time(self):
+        return self.context.total_time
+
+    @property
+    def interrupted(self):
+        return self.context.interrupted
+
+    def solve(self, model, timelimit, start = None, resume = None):
+        context = self.create_context(model, timelimit)
+        self._local.context = context
+
+        context.start_timer()
+        if resume is not None:
+            (Checkpoint.load(resume) if isinstance(resume, str) else resume).restore(context, self.retention)
+        self.install_start(context, start)
+        self.branch_and_bound(context)
+        context.stop_timer()
+        context.report(force = True)
+        if context.checkpointer is not None:
+            context.checkpointer.close(context)
+
+        return context.best_solution
+
+    def install_start(self, context, start):
+        for initial in (start if start is not None else []):
+            assignment = complete_assignment(context.model, initial)
+            if assignment is not None:
+                context.improve(context.solution(assignment, self.retention), "start")
+
+    def create_context(self, model, timelimit):
+        context = SolveContext(model, timelimit)
+        context.queue = NodeQueue(self.options.selection)
+        context.queue.push(Node())
+        context.cut_pool = self.options.cuts.pool() if self.options.cuts is not None else None
+        context.domains = self.options.presolve.domains(model) if self.options.presolve is not None else None
+        context.limits = self.options.limits
+        context.progress = self.options.progress
+        context.progress_interval = self.options.progress_interval
+        context.checkpointer = Checkpointer(self.options.checkpoint, self.options.checkpoint_interval) if self.options.checkpoint is not None else None
+        return context
+
+    def branch_and_bound(self, context):
+        while len(context.queue) > 0:
+            context.upper_bound = max(context.queue.bound(), context.lower_bound)
+            context.report()
+            if context.checkpointer is not None:
+                context.checkpointer.update(context)
+            if context.should_stop():
+                return
+            self.process_node(context, context.queue.pop())
+        context.upper_bound = context.lower_bound
+
+    def process_node(self, context, node):
+        if node.bound <= context.lower_bound:
+            return
+
+        context.nodes += 1
+        implied = []
+        if self.options.presolve is not None:
+            implied = self.options.presolve.propagate(context, node)
+            # an unfeasible root is left to its relaxation, so the solve returns the unfeasible solution as usual
+            if implied is None and node.depth == 0:
+                implied = []
+            if implied is None:
+                node.tableaux = None
+                context.node_pivots.append(0)
+                context.presolved += 1
+                return
+            node.tighten(implied)
+            context.fixings += len(implied)
+        model = node.model(context.model)
+        constraints_count = len(model.constraints)
+        lp_solver = lpsolver.Solver(self.exact, retention = self.retention)
+        if node.tableaux is not None:
+            constraints = [node.branching_constraint(context.model)] + [bound_constraint(context.model, b) for b in implied if b != node.bounds[-1]]
+            (relaxed_solution, tableaux) = lp_solver.reoptimize(model, node.tableaux, constraints)
+            node.pivots = tableaux.pivots - node.tableaux.pivots
+        else:
+            (relaxed_solution, tableaux) = lp_solver.solve_with_tableaux(model)
+            node.pivots = tableaux.pivots
+        # the parent tableaux is no longer needed by this node
+        node.tableaux = None
+        context.node_pivots.append(node.pivots)
+        # lazy constraints are valid in the whole tree, the other nodes shouldn't have to separate them again
+        for constraint in model.constraints[constraints_count:]:
+            context.model.add_constraint(constraint)
 
         if relaxed_solution.assignment == None:
-            if self.best_solution == None:
-                self.best_solution = relaxed_solution 
+            if context.best_solution == None:
+                context.best_solution = relaxed_solution
             return
 
         upper_bound = relaxed_solution.objective_value()
-        if upper_bound <= self.lower_bound:
+        if node.distance > 0:
+            (index, type, _) = node.bounds[-1]
+            context.pseudo_costs.update(index, type, max(node.bound - upper_bound, 0.0) / node.distance)
+        if upper_bound <= context.lower_bound:
             return
 
-        var_to_branch = self.find_float_assignment(relaxed_solution)
-        if var_to_branch == None:
-            objective = relaxed_solution.objective_value()
-            if objective > self.lower_bound:
-                self.lower_bound = objective
-                self.best_solution = relaxed_solution
+        candidates = self.fractional_variables(context, relaxed_solution)
+        if self.options.cuts is not None and len(candidates) > 0:
+            (relaxed_solution, tableaux) = self.options.cuts.run(context, node, model, relaxed_solution, tableaux, lp_solver)
+            if relaxed_solution.assignment == None:
+                return
+            upper_bound = relaxed_solution.objective_value()
+            if upper_bound <= context.lower_bound:
+                return
+            candidates = self.fractional_variables(context, relaxed_solution)
+
+        if len(candidates) == 0:
+            # values within the tolerance (e.g. after the warm started pivots) are snapped to the integers
+            relaxed_solution.assignment = [float(round(v)) for v in relaxed_solution.assignment]
+            context.improve(relaxed_solution, "relaxation")
             return
 
-        if self.timeout():
-            self.interrupted = True
-            return 
+        for heuristic in self.options.heuristics:
+            if heuristic.applies(context, node):
+                assignment = heuristic.run(context, model, relaxed_solution, tableaux, lp_solver)
+                if assignment is not None:
+                    context.improve(context.solution(assignment, self.retention), heuristic.name())
+        if upper_bound <= context.lower_bound:
+            return
 
+        if self.options.presolve is not None:
+            fixed = self.options.presolve.fix(context, node, tableaux)
+            if len(fixed) > 0:
+                # fixed variables are at their bounds in the relaxed solution, the rows are added only for the children
+                node.tighten(fixed)
+                context.fixings += len(fixed)
+                if self.options.warm_start:
+                    (_, tableaux) = lp_solver.reoptimize(model, tableaux, [bound_constraint(context.model, b) for b in fixed])
+
+        var_to_branch = self.options.branching.select(context, candidates, relaxed_solution, tableaux)
         current_value = relaxed_solution.value(var_to_branch)
-        new_model = self.model_with_new_constraint(model, var_to_branch >= math.ceil(current_value))
-        self.branch_and_bound(new_model)
-        new_model = self.model_with_new_constraint(model, var_to_branch <= math.floor(current_value))
-        self.branch_and_bound(new_model)
+        (floor, ceil) = (math.floor(current_value), math.ceil(current_value))
+        tableaux = tableaux if self.options.warm_start else None
+        (floor_estimate, ceil_estimate) = (upper_bound, upper_bound)
+        if self.options.selection == NodeSelection.BEST_ESTIMATE:
+            (floor_estimate, ceil_estimate) = (self.estimate(context, relaxed_solution, var_to_branch, v) for v in (floor, ceil))
+        # equal priorities are taken in the LIFO order, so the ceil child is explored first
+        context.queue.push(node.child(var_to_branch.index, co.ConstraintType.LE, floor, upper_bound, floor_estimate, tableaux, current_value - floor))
+        context.queue.push(node.child(var_to_branch.index, co.ConstraintType.GE, ceil, upper_bound, ceil_estimate, tableaux, ceil - current_value))
 
-        
-    def find_float_assignment(self, solution):
-        eps = 0.0000001
-        for var in reversed(self.model.variables):
-            val = solution.value(var)
-            if abs(val - round(val)) > eps:
-                return var
-        return None
+    def find_float_assignment(self, context, solution):
+        candidates = self.fractional_variables(context, solution)
+        return candidates[-1] if len(candidates) > 0 else None
 
-    def model_with_new_constraint(self, model, constraint):
-        new_model = deepcopy(model)
-        new_model.add_constraint(constraint)
-        return new_model
+    def fractional_variables(self, context, solution):
+        if solution.is_verified():
+            return [var for var in context.model.variables if solution.exact_value(var).denominator != 1]
 
-    def start_timer(self):
-        self.start_time = time.time()
-
-    def stop_timer(self):
-        self.total_time = self.wall_time()
-
-    def wall_time(self) -> float:
-        return time.time() - self.start_time
+        eps = 0.0000001
+        return [var for var in context.model.variables if abs(solution.value(var) - round(solution.value(var))) > eps]
 
-    def timeout(self) -> bool:
-        return self.wall_time() > self.timelimit
+    def estimate(self, context, solution, var, value):
+        # every fractional variable is expected to cost its objective factor times the distance to the nearest integer,
+        # the branched one is moved to the bound of the child
+        factors = context.model.objective.expression.factors(context.model)
+        estimate = solution.objective_value() - abs(factors[var.index]) * abs(solution.value(var) - value)
+        for v in context.model.variables:
+            if v.index != var.index:
+                fraction = solution.value(v) - math.floor(solution.value(v))
+                estimate -= abs(factors[v.index]) * min(fraction, 1 - fraction)
+        return estimate
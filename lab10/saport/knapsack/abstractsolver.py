@@ -1,6 +1,7 @@
 import sys
 from .model import Problem, Solution
 from time import time
+from .. import pool as solver_pool
 
 class AbstractSolver:
     """
@@ -27,12 +28,14 @@ class AbstractSolver:
         wall_time() -> float:
             returns how long solver has been working
         timeut() -> bool:
-            whether solver should stop working due to the timeout
+            whether solver should stop working due to the timeout (or cancellation of the async solve)
 
         __init__(problem: Problem, timelimit: int):
             initialized object with the given attributes
         solve() -> Solution:
             solves the knapsack problem
+        async solve_async(pool: SolverPool | None) -> Solution:
+            solves the knapsack problem in a worker process of the given (or the default) pool
     """    
     def start_timer(self):
         self.start_time = time()
@@ -44,7 +47,7 @@ class AbstractSolver:
         return time() - self.start_time
 
     def timeout(self) -> bool:
-        return self.wall_time() > self.timelimit
+        return self.wall_time() > self.timelimit or solver_pool.is_cancelled()
 
     def __init__(self, problem: Problem, timelimit: int):
         self.problem = problem 
@@ -55,6 +58,11 @@ class AbstractSolver:
     def solve(self) -> Solution:
         raise Exception("abstract solver shouldn't be called!")
 
+    async def solve_async(self, pool = None) -> Solution:
+        pool = pool if pool is not None else solver_pool.default_pool()
+        solution, self.total_time = await pool.run(solver_pool.solve, self)
+        return solution
+
     
 
     
@@ -9,8 +9,33 @@ from typing import Tuple
 
 class DynamicSolver(AbstractSolver):
     """
-    A naive dynamic programming solver for the knapsack problem. 
+    A dynamic programming solver for the knapsack problem.
+
+    Attributes:
+    -----------
+    rolling : bool
+        whether the solver keeps only a single row of the values (updated per item with a vectorized shift),
+        instead of the full (capacity + 1) x (items + 1) table filled cell by cell
+
+    Methods:
+    --------
+    __init__(problem: Problem, timelimit: int, rolling: bool = True):
+        initialized object with the given attributes, by default in the rolling mode
+    create_table() -> np.array:
+        fills the full table of the best values for every capacity (rows) and prefix of the items (columns)
+    extract_solution(table: np.array) -> Solution:
+        walks the full table back to find the taken items
+    create_decisions() -> np.array:
+        computes the best values item by item in a single array, recording whether every item is taken
+        for every capacity as bits packed in a row of bytes (items x (capacity + 1) / 8 bytes in total),
+        checks the timeout once per item, rows of the items not reached before the timeout are missing
+    extract_decisions(decisions: np.array) -> Solution:
+        walks the packed decisions back to find the taken items
     """
+    def __init__(self, problem: Problem, timelimit: int, rolling: bool = True):
+        super().__init__(problem, timelimit)
+        self.rolling = rolling
+
     def create_table(self) -> np.array:
         table = np.zeros((self.problem.capacity + 1, len(self.problem.items) + 1), int)
 
@@ -36,12 +61,48 @@ class DynamicSolver(AbstractSolver):
 
         return Solution.from_items(used_items, optimal)
 
+    def create_decisions(self) -> np.array:
+        capacity = self.problem.capacity
+        values = np.zeros(capacity + 1, np.int64)
+        decisions = np.zeros((len(self.problem.items), (capacity + 8) // 8), np.uint8)
+        taken = np.zeros(capacity + 1, bool)
+
+        for (i, item) in enumerate(self.problem.items):
+            if self.timeout():
+                self.interrupted = True
+                return decisions[:i]
+            if item.weight > capacity:
+                continue
+            # values[c - weight] still belong to the previous items, as the shifted slice is computed before the update
+            with_item = values[:capacity + 1 - item.weight] + item.value
+            taken[:item.weight] = False
+            np.greater(with_item, values[item.weight:], out=taken[item.weight:])
+            np.maximum(values[item.weight:], with_item, out=values[item.weight:])
+            decisions[i] = np.packbits(taken)
+
+        return decisions
+
+    def extract_decisions(self, decisions: np.array) -> Solution:
+        used_items = []
+        current_weight = self.problem.capacity
+        for i in reversed(range(len(decisions))):
+            # packbits stores the first capacity in the highest bit of the first byte
+            if (decisions[i, current_weight >> 3] >> (7 - (current_weight & 7))) & 1:
+                item = self.problem.items[i]
+                used_items.append(item)
+                current_weight -= item.weight
+
+        return Solution.from_items(used_items, not self.interrupted)
+
     def solve(self) -> Tuple[Solution, float]:
         self.interrupted = False
         self.start_timer()
-        
-        table = self.create_table()
-        solution = self.extract_solution(table)
+
+        if self.rolling:
+            solution = self.extract_decisions(self.create_decisions())
+        else:
+            table = self.create_table()
+            solution = self.extract_solution(table)
 
         self.stop_timer()
         return solution
\ No newline at end of file
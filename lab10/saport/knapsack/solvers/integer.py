@@ -1,5 +1,6 @@
 from ..abstractsolver import AbstractSolver
 from ..model import Problem, Solution, Item
+from .greedy_density import GreedySolverDensity
 from typing import List 
 from ...integer.model import Model
 from ...simplex.expressions.expression import Expression
@@ -12,6 +13,8 @@ class IntegerSolver(AbstractSolver):
     --------
     create_model() -> Models:
         creates and returns an integer programming model based on the self.problem
+    initial_solution(model: Model) -> list[float]:
+        returns the assignment of the greedy (density) solution, used as the initial incumbent
     """
 
     def create_model(self) -> Model:
@@ -25,9 +28,14 @@ class IntegerSolver(AbstractSolver):
             m.add_constraint(v <= 1)
         return m
     
+    def initial_solution(self, model: Model) -> List[float]:
+        greedy = GreedySolverDensity(self.problem, self.timelimit).solve()
+        taken = set(item.index for item in greedy.items)
+        return [1.0 if item.index in taken else 0.0 for item in self.problem.items]
+
     def solve(self) -> Solution:
         m = self.create_model()
-        integer_solution = m.solve(self.timelimit)
+        integer_solution = m.solve(self.timelimit, start = [self.initial_solution(m)])
         items = [item for (i,item) in enumerate(self.problem.items) if integer_solution.value(m.variables[i]) > 0]
         solution = Solution.from_items(items, not m.solver.interrupted)
         self.total_time = m.solver.total_time
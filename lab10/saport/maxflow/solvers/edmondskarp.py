@@ -1,5 +1,6 @@
 from .solver import AbstractSolver
 from ..model import Network
+from ... import pool as solver_pool
 
 import networkx as nx
 from typing import List
@@ -30,6 +31,7 @@ class EdmondsKarp(AbstractSolver):
         queue = [[src]]
 
         while len(queue) > 0:
+            solver_pool.check_cancelled()
             path = queue.pop(0)
             if path[-1] == sink:
                 return path
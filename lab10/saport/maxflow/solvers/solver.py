@@ -1,4 +1,5 @@
 from ..model import Network
+from ... import pool as solver_pool
 
 class AbstractSolver:
 
@@ -6,4 +7,9 @@ class AbstractSolver:
         self.network = network
 
     def solve(self) -> int:
-        raise Exception("This is an abstract solver, don't call it directly!")
\ No newline at end of file
+        raise Exception("This is an abstract solver, don't call it directly!")
+
+    async def solve_async(self, pool = None) -> int:
+        pool = pool if pool is not None else solver_pool.default_pool()
+        max_flow, _ = await pool.run(solver_pool.solve, self)
+        return max_flow
\ No newline at end of file
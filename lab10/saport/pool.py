@@ -0,0 +1,179 @@
+import asyncio
+import collections
+import contextlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# flags shared with the worker processes, flag i is set when the task using slot i gets cancelled
+_flags = None
+# slot of the task currently run by the worker process
+_slot = None
+# time (time.time()) after which the current task counts as cancelled, None if it has no deadline
+_deadline = None
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def is_cancelled():
+    """
+        is_cancelled() -> bool:
+            whether the task run by the current worker process has been cancelled (or its deadline has passed),
+            solvers check it together with their timelimit, so a cancelled task finishes as if it timed out
+            (always False outside of the pool and the deadline block)
+    """
+    if _deadline is not None and time.time() > _deadline:
+        return True
+    return _flags is not None and _slot is not None and _flags[_slot] == 1
+
+
+@contextlib.contextmanager
+def deadline(value):
+    """
+        deadline(value: float | None):
+            a context manager, within its block the current task counts as cancelled after the given time (time.time()),
+            so the solvers without a timelimit stop at the deadline too, None sets no deadline
+    """
+    global _deadline
+    (previous, _deadline) = (_deadline, value)
+    try:
+        yield
+    finally:
+        _deadline = previous
+
+
+class Cancelled(Exception):
+    """
+        Raised by the solvers stopped by check_cancelled.
+    """
+    pass
+
+
+def check_cancelled():
+    """
+        check_cancelled():
+            raises Cancelled if the task run by the current worker process has been cancelled,
+            it's checked by the solvers without a timelimit (e.g. once per simplex pivot), which have no partial result to return
+    """
+    if is_cancelled():
+        raise Cancelled("The solve has been cancelled")
+
+
+def _initialize(flags):
+    global _flags
+    _flags = flags
+
+
+def _run(slot, function, args):
+    global _slot
+    _slot = slot
+    try:
+        return function(*args)
+    finally:
+        _slot = None
+
+
+class SolverPool:
+    """
+        A pool of worker processes to run the solvers without blocking the asyncio event loop.
+        Problems are pickled and shipped to the workers, results are pickled back.
+        When the awaiting task is cancelled, a queued problem is dropped
+        and a running one is stopped at the solver's next timelimit check (or the next simplex pivot).
+
+        Attributes
+        ----------
+        max_workers : int
+            number of the worker processes
+        max_concurrency : int
+            maximal number of the problems submitted at once, other callers wait for a free slot
+
+        Methods
+        -------
+        __init__(max_workers: int | None, max_concurrency: int | None) -> SolverPool:
+            creates a new pool, by default with one worker per core and concurrency equal to the number of workers
+        async run(function: Callable, *args) -> Any:
+            runs the (picklable) function in a worker process and returns its result
+        shutdown():
+            stops the worker processes
+    """
+
+    def __init__(self, max_workers = None, max_concurrency = None):
+        self.max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self.max_concurrency = max_concurrency if max_concurrency is not None else self.max_workers
+        self._flags = multiprocessing.RawArray('b', self.max_concurrency)
+        self._executor = ProcessPoolExecutor(self.max_workers, initializer=_initialize, initargs=(self._flags,))
+        # free slots are shared by all the event loops using the pool, they're released by the executor's thread
+        self._lock = threading.Lock()
+        self._free = list(range(self.max_concurrency))
+        self._waiters = collections.deque()
+
+    async def run(self, function, *args):
+        slot = await self._acquire()
+        self._flags[slot] = 0
+        future = self._executor.submit(_run, slot, function, args)
+        # the slot is released only when the worker is done with it, even if the caller (or its loop) is gone by then
+        future.add_done_callback(lambda _: self._release(slot))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._flags[slot] = 1
+            raise
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._lock:
+                if len(self._free) > 0:
+                    return self._free.pop()
+                waiter = loop.create_future()
+                self._waiters.append((loop, waiter))
+            try:
+                await waiter
+            finally:
+                with self._lock:
+                    if (loop, waiter) in self._waiters:
+                        self._waiters.remove((loop, waiter))
+
+    def _release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+            waiters = list(self._waiters)
+            self._waiters.clear()
+        # every waiter tries again, so a slot isn't lost when the woken one has been cancelled meanwhile
+        for (loop, waiter) in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, waiter)
+            except RuntimeError:
+                # the event loop is already closed, its waiter is gone with it
+                pass
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+def default_pool():
+    """
+        default_pool() -> SolverPool:
+            returns the pool shared by all the solve_async calls without an explicit pool (created on the first use)
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SolverPool()
+        return _default_pool
+
+
+def solve(solver):
+    """
+        solve(solver: Any) -> (Any, float | None):
+            calls solver.solve() in the worker, returns the result and the solver's total_time (if it has one)
+    """
+    result = solver.solve()
+    return (result, getattr(solver, 'total_time', None))
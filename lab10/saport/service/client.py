@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+import numpy as np
+
+from .server import LINE_LIMIT
+
+class Client:
+    """
+        A client of the solve service, many requests can be sent over one connection at once.
+
+        Methods
+        -------
+        async connect(path: str | None, host: str, port: int) -> Client:
+            connects to the service listening on the Unix socket (if the path is given) or on the TCP port
+        async solve(request: dict) -> dict:
+            sends the request and returns the response (dict with "status" and "result" or "message")
+        async stats() -> dict:
+            returns statistics of the service
+        async close():
+            closes the connection
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count()
+        self._pending = dict()
+        self._receiver = asyncio.create_task(self._receive())
+
+    @staticmethod
+    async def connect(path = None, host = '127.0.0.1', port = 8765):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit = LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit = LINE_LIMIT)
+        return Client(reader, writer)
+
+    async def solve(self, request):
+        id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[id] = future
+        self._writer.write((json.dumps(dict(request, id = id)) + '\n').encode())
+        await self._writer.drain()
+        return await future
+
+    async def stats(self):
+        return (await self.solve({'type': 'stats'}))['result']
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        self._receiver.cancel()
+
+    async def _receive(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self._pending.pop(response.pop('id'), None)
+            if future is not None and not future.done():
+                future.set_result(response)
+
+
+def sample_request(generator):
+    """
+        sample_request(generator: random.Random) -> dict:
+            returns a random small request (knapsack, simplex, assignment or game), used by the load test
+    """
+    kind = generator.choice(['knapsack', 'simplex', 'assignment', 'game'])
+    if kind == 'knapsack':
+        items = [[generator.randint(1, 50), generator.randint(1, 30)] for _ in range(20)]
+        return {'type': 'knapsack', 'solver': 'dynamic', 'data': {'capacity': 100, 'items': items}}
+    if kind == 'simplex':
+        n = 5
+        return {'type': 'simplex', 'data': {
+            'objective': {'sense': 'max', 'factors': [generator.randint(1, 9) for _ in range(n)]},
+            'constraints': [{'factors': [generator.randint(1, 9) for _ in range(n)], 'type': '<=', 'bound': generator.randint(10, 50)} for _ in range(4)]
+        }}
+    if kind == 'assignment':
+        # the hungarian solver doesn't check any deadline and loops forever on some instances
+        return {'type': 'assignment', 'solver': 'simplex', 'data': {'costs': [[generator.randint(1, 20) for _ in range(5)] for _ in range(5)]}}
+    return {'type': 'game', 'solver': 'pure', 'data': {'rewards': [[generator.randint(-5, 5) for _ in range(3)] for _ in range(3)]}}
+
+
+async def load_test(client, requests = 1000, concurrency = 32, seed = 0):
+    """
+        load_test(client: Client, requests: int, concurrency: int, seed: int) -> dict:
+            sends the random requests keeping the given number of them in flight,
+            returns the sustained throughput (requests per second), client side latency percentiles and statuses
+    """
+    generator = random.Random(seed)
+    latencies = []
+    statuses = dict()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            request = sample_request(generator)
+            start = time.time()
+            response = await client.solve(request)
+            latencies.append(time.time() - start)
+            statuses[response['status']] = statuses.get(response['status'], 0) + 1
+
+    start = time.time()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    total_time = time.time() - start
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+    return {
+        'requests': requests,
+        'total_time': total_time,
+        'throughput': requests / total_time,
+        'latency_p50': float(p50),
+        'latency_p90': float(p90),
+        'latency_p99': float(p99),
+        'statuses': statuses
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Load test of the SAPORT solve service")
+    parser.add_argument('--socket', help = "path of the Unix socket, TCP is used if missing")
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--requests', type = int, default = 1000)
+    parser.add_argument('--concurrency', type = int, default = 32)
+    args = parser.parse_args()
+
+    async def run():
+        client = await Client.connect(args.socket, args.host, args.port)
+        try:
+            report = await load_test(client, args.requests, args.concurrency)
+            report['server'] = await client.stats()
+        finally:
+            await client.close()
+        print(json.dumps(report, indent = 2))
+
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Functions run in the worker processes of the solve service.
+Every request is a dict with the keys:
+- type: simplex | knapsack | maxflow | assignment | game
+- format: json (default) or the name of the file format of the problem type (lp, mps, text)
+- data: the problem, a JSON object or the file contents
+- solver: optional name of the solver (depends on the problem type)
+- deadline: absolute time (time.time()) after which the request isn't solved anymore, set by the server from the timeout
+  (None without the timeout), the solvers without a timelimit are stopped at it by saport.pool.deadline
+Every result is a JSON-serializable dict.
+"""
+
+import os
+import tempfile
+import time
+import numpy as np
+import networkx as nx
+
+from .. import pool as solver_pool
+from ..simplex import model as lpmodel
+from ..simplex.expressions import constraint as co
+from ..simplex.expressions import expression as ex
+from ..integer import model as ipmodel
+from ..knapsack.model import Problem, Item
+from ..knapsack.solverfactory import SolverFactory, SolverType
+from ..maxflow.model import Network
+from ..maxflow.solvers.edmondskarp import EdmondsKarp
+from ..maxflow.solvers.networkx import NetworkXSolver
+from ..maxflow.solvers.simplex import SimplexSolver as MaxflowSimplexSolver
+from ..assignment.model import AssignmentProblem
+from ..assignment import hungarian_solver, simplex_solver as assignment_simplex_solver
+from ..minimax.model import Game
+from ..minimax.solvers.mixed import MixedSolver
+from ..minimax.solvers.pure import PureSolver
+
+CONSTRAINT_TYPES = {'<=': co.ConstraintType.LE, '>=': co.ConstraintType.GE, '=': co.ConstraintType.EQ}
+MAXFLOW_SOLVERS = {'edmonds-karp': EdmondsKarp, 'networkx': NetworkXSolver, 'simplex': MaxflowSimplexSolver}
+ASSIGNMENT_SOLVERS = {'hungarian': hungarian_solver.Solver, 'simplex': assignment_simplex_solver.Solver}
+GAME_SOLVERS = {'mixed': MixedSolver, 'pure': PureSolver}
+
+
+def warm_up():
+    """
+        warm_up():
+            called once in every worker, so the modules are already imported when the first request comes
+    """
+    return os.getpid()
+
+
+def solve_batch(requests):
+    """
+        solve_batch(requests: list[dict]) -> list[dict]:
+            solves the requests one by one (in a single worker), errors are reported per request
+    """
+    return [solve_request(request) for request in requests]
+
+
+def solve_request(request):
+    deadline = request.get('deadline')
+    if deadline is not None and time.time() > deadline:
+        return {'status': 'timeout'}
+    try:
+        handler = HANDLERS[request['type']]
+        with solver_pool.deadline(deadline):
+            return {'status': 'ok', 'result': handler(request)}
+    except solver_pool.Cancelled:
+        return {'status': 'timeout'}
+    except Exception as e:
+        return {'status': 'error', 'message': f"{type(e).__name__}: {e}"}
+
+
+def _timelimit(request):
+    timelimit = request.get('timelimit', float('inf'))
+    deadline = request.get('deadline')
+    if deadline is not None:
+        timelimit = min(timelimit, max(deadline - time.time(), 0.0))
+    return timelimit
+
+
+def _read_file(request, reader, suffix = ''):
+    # the file name is fixed, fields of the request never become paths
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"problem{suffix}")
+        with open(path, 'w') as f:
+            f.write(request['data'])
+        problem = reader(path)
+    if 'name' in request and hasattr(problem, 'name'):
+        problem.name = str(request['name'])
+    return problem
+
+
+def _simplex(request):
+    integer = request.get('integer', False)
+    model_class = ipmodel.Model if integer else lpmodel.Model
+    format = request.get('format', 'json')
+    if format in ('lp', 'mps'):
+        model = _read_file(request, model_class.from_file, f".{format}")
+    else:
+        model = _simplex_model(model_class, request['data'], request.get('name', 'problem'))
+
+    solution = model.solve(_timelimit(request)) if integer else model.solve()
+    if solution is None or solution.assignment is None:
+        return {
+            'feasible': solution is not None and solution.is_feasible,
+            'bounded': solution is None or solution.is_bounded
+        }
+    return {
+        'feasible': True,
+        'bounded': True,
+        'objective': solution.objective_value(),
+        'assignment': {var.name: solution.value(var) for var in model.variables}
+    }
+
+
+def _simplex_model(model_class, data, name):
+    model = model_class(name)
+    names = data.get('variables') or [f"x{i}" for i in range(len(data['objective']['factors']))]
+    variables = [model.create_variable(n) for n in names]
+    for constraint in data.get('constraints', []):
+        expression = ex.Expression.from_vectors(variables, constraint['factors'])
+        model.add_constraint(co.Constraint(expression, constraint['bound'], CONSTRAINT_TYPES[constraint['type']]))
+    objective = ex.Expression.from_vectors(variables, data['objective']['factors'])
+    if data['objective'].get('sense', 'max') == 'max':
+        model.maximize(objective)
+    else:
+        model.minimize(objective)
+    return model
+
+
+def _knapsack(request):
+    if request.get('format', 'json') == 'text':
+        problem = _read_file(request, Problem.from_path)
+    else:
+        data = request['data']
+        items = [Item(index=i, value=value, weight=weight) for (i, (value, weight)) in enumerate(data['items'])]
+        problem = Problem(items=items, capacity=data['capacity'])
+
+    solver = SolverFactory.solver(SolverType(request.get('solver', 'dynamic')), problem, _timelimit(request))
+    solution = solver.solve()
+    return {
+        'value': int(solution.value),
+        'weight': int(solution.weight),
+        'optimal': bool(solution.optimal),
+        'items': sorted(item.index for item in solution.items)
+    }
+
+
+def _maxflow(request):
+    if request.get('format', 'json') == 'text':
+        network = _read_file(request, Network.from_file, '.dnf')
+    else:
+        data = request['data']
+        digraph = nx.DiGraph()
+        for (u, v, capacity) in data['edges']:
+            digraph.add_edge(u, v, capacity=capacity)
+        network = Network(digraph, data['source'], data['sink'], request.get('name', 'problem'))
+
+    solver = MAXFLOW_SOLVERS[request.get('solver', 'edmonds-karp')](network)
+    return {'max_flow': float(solver.solve())}
+
+
+def _assignment(request):
+    if request.get('format', 'json') == 'text':
+        problem = _read_file(request, AssignmentProblem.from_file, '.txt')
+    else:
+        data = request['data']
+        problem = AssignmentProblem(request.get('name', 'problem'), np.array(data['costs'], dtype=int), data.get('objective', 'min') == 'min')
+
+    assignment = ASSIGNMENT_SOLVERS[request.get('solver', 'hungarian')](problem).solve()
+    return {'assigned_tasks': [int(t) for t in assignment.assigned_tasks], 'objective': int(assignment.objective)}
+
+
+def _game(request):
+    if request.get('format', 'json') == 'text':
+        game = _read_file(request, Game.from_file, '.txt')
+    else:
+        game = Game(np.array(request['data']['rewards'], dtype=float))
+
+    result = GAME_SOLVERS[request.get('solver', 'mixed')](game).solve()
+    equilibria = result if isinstance(result, list) else [result]
+    return {'equilibria': [{
+        'value': float(e.value),
+        'strategy_a': [float(p) for p in e.strategy_a.probabilities],
+        'strategy_b': [float(p) for p in e.strategy_b.probabilities]
+    } for e in equilibria]}
+
+
+HANDLERS = {
+    'simplex': _simplex,
+    'knapsack': _knapsack,
+    'maxflow': _maxflow,
+    'assignment': _assignment,
+    'game': _game
+}
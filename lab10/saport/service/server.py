@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import collections
+import json
+import math
+import time
+import numpy as np
+
+from ..pool import SolverPool
+from . import handlers
+
+# models in the file formats can be big, the whole request has to fit in a single line
+LINE_LIMIT = 2 ** 28
+
+class SolveServer:
+    """
+        A local solve service speaking a JSON lines protocol over a Unix socket (or TCP).
+        Every line sent by a client is a request (see saport.service.handlers) with an optional "id"
+        and "timeout" (in seconds), the response line contains the same "id", "status" and "result" (or "message").
+        Request {"type": "stats"} returns the statistics of the server instead of solving anything.
+
+        Requests are queued and small ones (with data shorter than small_request_size) are batched,
+        so a single worker process solves a few of them at once. The workers are started (warmed up) with the server.
+        Every request is answered with "timeout" at its own deadline, even if the rest of its batch is still being solved,
+        and the worker stops solving it at the deadline too (see saport.pool.deadline).
+
+        Attributes
+        ----------
+        pool : SolverPool
+            pool of the worker processes
+        batch_size : int
+            maximal number of the small requests sent to a worker at once
+        batch_window : float
+            how long (in seconds) the dispatcher waits for more small requests to fill a batch
+        small_request_size : int
+            requests with serialized data shorter than this are batched
+        latencies : collections.deque[float]
+            latencies (in seconds) of the recently finished requests
+
+        Methods
+        -------
+        __init__(workers: int | None, batch_size: int, batch_window: float, small_request_size: int) -> SolveServer:
+            creates a new server, the worker processes are created immediately
+        async start(path: str | None, host: str, port: int):
+            starts listening on the Unix socket (if the path is given) or on the TCP port
+        async serve_forever():
+            starts the server (if needed) and serves the requests until cancelled
+        async solve(request: dict) -> dict:
+            queues the request and returns the response (used by the connections, but can be called directly),
+            raises ValueError if the request isn't an object, its timeout isn't a nonnegative number or it sets the deadline itself
+        stats() -> dict:
+            returns queue depth, number of the handled requests, latency percentiles, etc.
+        async close():
+            stops the server and the workers
+    """
+
+    def __init__(self, workers = None, batch_size = 16, batch_window = 0.002, small_request_size = 4096):
+        self.pool = SolverPool(max_workers = workers)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.small_request_size = small_request_size
+        self.latencies = collections.deque(maxlen = 10000)
+        self._queue = None
+        self._server = None
+        self._dispatcher = None
+        self._in_progress = 0
+        self._counts = collections.Counter()
+        self._batches = 0
+        self._batched = 0
+        self._tasks = set()
+        self._started = time.time()
+
+    async def start(self, path = None, host = '127.0.0.1', port = 8765):
+        self._queue = asyncio.Queue()
+        await asyncio.gather(*[self.pool.run(handlers.warm_up) for _ in range(self.pool.max_workers)])
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path = path, limit = LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port, limit = LINE_LIMIT)
+        self._started = time.time()
+
+    async def serve_forever(self, path = None, host = '127.0.0.1', port = 8765):
+        if self._server is None:
+            await self.start(path, host, port)
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        self.pool.shutdown()
+
+    async def solve(self, request):
+        _validate(request)
+        arrival = time.time()
+        request['deadline'] = arrival + request['timeout'] if 'timeout' in request else None
+        future = asyncio.get_running_loop().create_future()
+        small = len(json.dumps(request.get('data'))) < self.small_request_size
+        await self._queue.put((request, future, small))
+        response = await future
+        self.latencies.append(time.time() - arrival)
+        self._counts[response['status']] += 1
+        return response
+
+    def stats(self):
+        latencies = np.array(self.latencies) if len(self.latencies) > 0 else np.zeros(1)
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        uptime = time.time() - self._started
+        handled = sum(self._counts.values())
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'in_progress': self._in_progress,
+            'handled': handled,
+            'statuses': dict(self._counts),
+            'batches': self._batches,
+            'average_batch_size': self._batched / self._batches if self._batches > 0 else 0.0,
+            'latency_p50': float(p50),
+            'latency_p90': float(p90),
+            'latency_p99': float(p99),
+            'throughput': handled / uptime if uptime > 0 else 0.0
+        }
+
+    async def _dispatch(self):
+        while True:
+            item = await self._queue.get()
+            batch = [item]
+            if item[2]:
+                batch += await self._collect_small_requests()
+            self._submit(batch)
+
+    def _submit(self, batch):
+        self._in_progress += len(batch)
+        self._batches += 1
+        self._batched += len(batch)
+        # waiting for a free worker slot happens in the task, so the dispatcher keeps batching meanwhile
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _collect_small_requests(self):
+        collected = []
+        deadline = time.time() + self.batch_window
+        while len(collected) + 1 < self.batch_size:
+            try:
+                item = self._queue.get_nowait() if self._queue.qsize() > 0 else await asyncio.wait_for(self._queue.get(), max(deadline - time.time(), 0.0))
+            except asyncio.TimeoutError:
+                break
+            if not item[2]:
+                # a big request is sent on its own
+                self._submit([item])
+                continue
+            collected.append(item)
+        return collected
+
+    async def _run_batch(self, batch):
+        requests = [request for (request, _, _) in batch]
+        timers = []
+        try:
+            deadlines = [request['deadline'] for request in requests]
+            timeout = None if None in deadlines else max(max(deadlines) - time.time(), 0.0)
+            # the batch is bounded by its latest deadline, the earlier ones expire on their own
+            loop = asyncio.get_running_loop()
+            timers = [loop.call_later(max(deadline - time.time(), 0.0), _expire, future) for (deadline, (_, future, _)) in zip(deadlines, batch) if deadline is not None]
+            responses = await asyncio.wait_for(self.pool.run(handlers.solve_batch, requests), timeout)
+        except asyncio.TimeoutError:
+            responses = [{'status': 'timeout'} for _ in requests]
+        except Exception as e:
+            responses = [{'status': 'error', 'message': f"{type(e).__name__}: {e}"} for _ in requests]
+        finally:
+            self._in_progress -= len(batch)
+            for timer in timers:
+                timer.cancel()
+
+        for ((request, future, _), response) in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def _handle_connection(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def respond(line):
+            request = {}
+            try:
+                request = json.loads(line)
+                if isinstance(request, dict) and request.get('type') == 'stats':
+                    response = {'status': 'ok', 'result': self.stats()}
+                else:
+                    response = await self.solve(request)
+            except json.JSONDecodeError as e:
+                response = {'status': 'error', 'message': f"Invalid JSON: {e}"}
+            except Exception as e:
+                response = {'status': 'error', 'message': f"{type(e).__name__}: {e}"}
+            response = dict(response, id = request.get('id') if isinstance(request, dict) else None)
+            async with lock:
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(respond(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+
+def _validate(request):
+    if not isinstance(request, dict):
+        raise ValueError(f"Request should be a JSON object, got {type(request).__name__}")
+    timeout = request.get('timeout', 0.0)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or not (timeout >= 0 and math.isfinite(timeout)):
+        raise ValueError(f"Request timeout should be a nonnegative number, got {timeout!r}")
+    if 'deadline' in request:
+        raise ValueError("Request deadline is set by the server, send the timeout instead")
+
+
+def _expire(future):
+    if not future.done():
+        future.set_result({'status': 'timeout'})
+
+
+def main():
+    parser = argparse.ArgumentParser(description = "Local SAPORT solve service (JSON lines protocol)")
+    parser.add_argument('--socket', help = "path of the Unix socket, TCP is used if missing")
+    parser.add_argument('--host', default = '127.0.0.1')
+    parser.add_argument('--port', type = int, default = 8765)
+    parser.add_argument('--workers', type = int, default = None)
+    parser.add_argument('--batch-size', type = int, default = 16)
+    args = parser.parse_args()
+
+    async def serve():
+        server = SolveServer(workers = args.workers, batch_size = args.batch_size)
+        try:
+            await server.serve_forever(args.socket, args.host, args.port)
+        finally:
+            await server.close()
+
+    asyncio.run(serve())
+
+
+if __name__ == '__main__':
+    main()
@@ -27,7 +27,7 @@ class ObjectiveSensitivityAnalyser:
         self.name = ObjectiveSensitivityAnalyser.name()
     
     def analyse(self, solution):
-        obj_coeffs = solution.normal_model.objective.expression.factors(solution.model)
+        obj_coeffs = solution.standard_form.costs[:solution.standard_form.variables_count]
         final_obj_coeffs = solution.tableaux.table[0,:-1]
         obj_coeffs_ranges = []
 
@@ -52,7 +52,7 @@ class ObjectiveSensitivityAnalyser:
 
 
     def interpret_results(self, solution, obj_coeffs_ranges, print_function):        
-        org_coeffs = solution.normal_model.objective.expression.factors(solution.model)
+        org_coeffs = solution.standard_form.costs[:solution.standard_form.variables_count]
 
         print_function("* Cost Coefficients Sensitivity Analysis:")
         print_function("-> To keep the the current optimum, the cost coefficients should stay in following ranges:")
@@ -0,0 +1,117 @@
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import List
+
+from . import solver as s
+from . import tableaux as t
+import numpy as np
+import threading
+
+
+@dataclass
+class Column:
+    """
+    A dataclass representing a column proposed by the pricing callback.
+
+    Attributes
+    ----------
+    name : str
+        name of the variable created for the column
+    cost : float
+        factor of the new variable in the objective
+    factors : List[float]
+        factors of the new variable in the constraints, order corresponds to model.constraints
+    """
+    name: str
+    cost: float
+    factors: List[float]
+
+
+class ColumnGenerationSolver:
+    """
+        A class to solve a restricted master problem with column generation.
+
+        The model given to the solver contains only a subset of the columns (variables).
+        After every optimization the duals are handed to the pricing callback,
+        the returned columns with a promising reduced cost are added as new variables to the model and to the final tableaux,
+        then the simplex continues from the current basis.
+        The solver works on a copy of the given model, the copy with all the generated variables is the model of the solution.
+        Pricing needs a unique dual for every constraint, so models with redundant constraints are rejected.
+
+        Attributes
+        ----------
+        pricing : Callable[[list[float]], list[Column]]
+            callback receiving duals of the model constraints and returning new columns
+            a column is promising when cost - duals·factors is > 0 for max objective or < 0 for min objective
+        max_iterations : int
+            maximal number of pricing rounds
+        iterations : int
+            number of pricing rounds run by the last solve in the current thread
+            (the solver is re-entrant, so one instance can be used by many threads)
+
+        Methods
+        -------
+        __init__(pricing: Callable, max_iterations: int = inf) -> ColumnGenerationSolver:
+            constructs a new solver with the given pricing callback
+        solve(model: Model) -> Solution:
+            solves a copy of the model, new variables are created in the copy for every column accepted from the pricing
+    """
+
+    def __init__(self, pricing, max_iterations = float('inf')):
+        self.pricing = pricing
+        self.max_iterations = max_iterations
+        self._local = threading.local()
+
+    def __reduce__(self):
+        return (ColumnGenerationSolver, (self.pricing, self.max_iterations))
+
+    @property
+    def iterations(self):
+        return getattr(self._local, 'iterations', 0)
+
+    def solve(self, model):
+        self._local.iterations = 0
+        model = deepcopy(model)
+        solver = s.Solver()
+        (solution, tableaux) = solver.solve_with_tableaux(model)
+
+        while solution.assignment != None and self._local.iterations < self.max_iterations:
+            self._local.iterations += 1
+            if self._add_promising_columns(model, tableaux) == 0:
+                break
+            (solution, tableaux) = solver.reoptimize(model, tableaux, [])
+        return solution
+
+    def _add_promising_columns(self, model, tableaux):
+        standard_form = tableaux.standard_form
+        basis = tableaux.extract_basis()
+        if -1 in basis:
+            # the simplex drives every artificial variable it can out of the basis,
+            # a row left without a basic column belongs to a redundant constraint, which has no unique dual
+            raise Exception("Can't compute the duals for the pricing, the model has redundant constraints")
+        basis_matrix = standard_form.matrix[:, basis]
+        normal_duals = np.linalg.solve(basis_matrix.T, standard_form.costs[basis])
+        duals = list(standard_form.objective_sign * standard_form.row_signs * normal_duals)
+
+        added = 0
+        for column in self.pricing(duals):
+            normal_factors = standard_form.row_signs * np.array(column.factors, dtype=float)
+            normal_cost = standard_form.objective_sign * column.cost
+            reduced_cost = normal_cost - normal_duals @ normal_factors
+            if reduced_cost <= t.eps:
+                continue
+
+            # new variables are placed after the other model variables, both in the model and in the tableaux
+            var = self._add_column(model, column.name, column.cost, column.factors)
+            tableaux.add_column(np.concatenate(([-reduced_cost], np.linalg.solve(basis_matrix, normal_factors))), var.index)
+            tableaux.standard_form = tableaux.standard_form.with_column(column.name, normal_cost, normal_factors)
+            added += 1
+        return added
+
+    def _add_column(self, model, name, cost, factors):
+        var = model.create_variable(name)
+        for (constraint, factor) in zip(model.constraints, factors):
+            if factor != 0:
+                constraint.expression = constraint.expression + var * float(factor)
+        model.objective.expression = model.objective.expression + var * float(cost)
+        return var
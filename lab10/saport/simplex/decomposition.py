@@ -0,0 +1,509 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List
+import threading
+import networkx as nx
+import numpy as np
+
+from . import exact
+from . import model as m
+from . import solution as sol
+from .column_generation import Column, ColumnGenerationSolver
+from .expressions import constraint as co
+from .expressions import expression as ex
+from .tableaux import eps
+
+
+@dataclass
+class Block:
+    """
+    A dataclass representing an independent block of a block-structured model.
+
+    Attributes
+    ----------
+    variables : List[int]
+        indices of the block variables
+    constraints : List[int]
+        indices of the block constraints (they contain only the block variables and the linking variables)
+    """
+    variables: List[int]
+    constraints: List[int]
+
+
+class BlockStructure:
+    """
+        A class to represent a block structure of a model: independent blocks coupled by a few linking constraints
+        (rows shared by the blocks, handled by the Dantzig-Wolfe decomposition)
+        or by a few linking variables (columns shared by the blocks, handled by the Benders decomposition).
+
+        Attributes
+        ----------
+        blocks : list[Block]
+            independent blocks of the model
+        linking_constraints : list[int]
+            indices of the constraints solved in the master problem
+        linking_variables : list[int]
+            indices of the variables solved in the master problem
+
+        Methods
+        -------
+        @staticmethod from_linking(model: Model, linking_constraints: list[int], linking_variables: list[int]) -> BlockStructure:
+            finds the blocks left after removing the given constraints and variables,
+            variables without any block constraint become linking variables and constraints without any block variable become linking constraints
+        @staticmethod detect(model: Model, linking: str, max_linking: float) -> BlockStructure:
+            greedily removes the densest constraints (linking = 'constraints') or variables (linking = 'variables')
+            until the model falls apart into at least two blocks or max_linking fraction of them is removed
+    """
+
+    def __init__(self, blocks, linking_constraints, linking_variables):
+        self.blocks = blocks
+        self.linking_constraints = linking_constraints
+        self.linking_variables = linking_variables
+
+    @staticmethod
+    def from_linking(model, linking_constraints = (), linking_variables = ()):
+        linking_constraints = set(linking_constraints)
+        linking_variables = set(linking_variables)
+        graph = nx.Graph()
+        graph.add_nodes_from(('v', var.index) for var in model.variables if var.index not in linking_variables)
+        graph.add_nodes_from(('c', i) for i in range(len(model.constraints)) if i not in linking_constraints)
+        for (i, constraint) in enumerate(model.constraints):
+            if i not in linking_constraints:
+                graph.add_edges_from((('c', i), ('v', j)) for j in _factors(constraint.expression) if j not in linking_variables)
+
+        blocks = []
+        for component in nx.connected_components(graph):
+            variables = sorted(index for (kind, index) in component if kind == 'v')
+            constraints = sorted(index for (kind, index) in component if kind == 'c')
+            if len(constraints) == 0:
+                linking_variables.update(variables)
+            elif len(variables) == 0:
+                linking_constraints.update(constraints)
+            else:
+                blocks.append(Block(variables, constraints))
+        blocks.sort(key = lambda block: block.variables[0])
+        return BlockStructure(blocks, sorted(linking_constraints), sorted(linking_variables))
+
+    @staticmethod
+    def detect(model, linking = 'constraints', max_linking = 0.25):
+        if linking == 'constraints':
+            candidates = sorted(range(len(model.constraints)), key = lambda i: -len(_factors(model.constraints[i].expression)))
+        elif linking == 'variables':
+            counts = np.zeros(len(model.variables), dtype = int)
+            for constraint in model.constraints:
+                counts[list(_factors(constraint.expression))] += 1
+            candidates = sorted(range(len(model.variables)), key = lambda j: -counts[j])
+        else:
+            raise Exception(f"Unknown kind of the linking: {linking}, expected 'constraints' or 'variables'")
+
+        removed = []
+        while True:
+            if linking == 'constraints':
+                structure = BlockStructure.from_linking(model, linking_constraints = removed)
+            else:
+                structure = BlockStructure.from_linking(model, linking_variables = removed)
+            if len(structure.blocks) >= 2 or len(removed) >= max_linking * len(candidates):
+                return structure
+            removed.append(candidates[len(removed)])
+
+
+class DantzigWolfeSolver:
+    """
+        A class to solve block-structured models with linking constraints by the Dantzig-Wolfe decomposition.
+
+        The master problem chooses convex combinations of the blocks' extreme points subject to the linking constraints.
+        It's solved with the column generation, every pricing round solves all the block subproblems in the worker processes.
+        The master is solved in two phases: the first one minimizes the artificial variables relaxing the linking constraints
+        (with zero costs of the blocks), so the initial points are always feasible, if the artificial variables can't be driven to zero
+        the model is reported unfeasible. The second one starts from the columns of the first one, without the artificial variables.
+        Blocks have to be bounded (extreme rays are not generated).
+
+        Attributes
+        ----------
+        structure : BlockStructure | None
+            block structure of the models, detected (with the linking constraints) for every model if None
+        workers : int | None
+            number of the worker processes solving the blocks (one per core if None, 1 solves them in the calling process)
+        max_iterations : int
+            maximal number of the pricing rounds (in each phase)
+        iterations : int
+            number of the pricing rounds run by the last solve in the current thread
+
+        Methods
+        -------
+        __init__(structure: BlockStructure | None, workers: int | None, max_iterations: int) -> DantzigWolfeSolver:
+            constructs a new solver
+        solve(model: Model) -> Solution:
+            solves the model, the solution contains only the assignment (there is no tableaux of the whole model)
+    """
+
+    def __init__(self, structure = None, workers = None, max_iterations = 1000):
+        self.structure = structure
+        self.workers = workers
+        self.max_iterations = max_iterations
+        self._local = threading.local()
+
+    def __reduce__(self):
+        return (DantzigWolfeSolver, (self.structure, self.workers, self.max_iterations))
+
+    @property
+    def iterations(self):
+        return getattr(self._local, 'iterations', 0)
+
+    def solve(self, model):
+        structure = self.structure if self.structure is not None else BlockStructure.detect(model, 'constraints')
+        linking_variables = set(structure.linking_variables)
+        for block in structure.blocks:
+            if any(j in linking_variables for i in block.constraints for j in _factors(model.constraints[i].expression)):
+                raise Exception("Dantzig-Wolfe decomposition doesn't support linking variables in the block constraints, use the Benders decomposition")
+
+        sense = model.objective.type.value
+        costs = _factors(model.objective.expression)
+        linking_rows = [_factors(model.constraints[i].expression) for i in structure.linking_constraints]
+        rows_count = len(linking_rows) + len(structure.blocks)
+        self._local.iterations = 0
+        # master variable name -> (block index, point) for the convex combination variables, index for the linking variables, None for the artificial ones
+        origins = dict()
+
+        def column(name, phase_costs):
+            origin = origins[name]
+            if origin is None:
+                return None
+            if not isinstance(origin, tuple):
+                return Column(name, phase_costs.get(origin, 0.0), [row.get(origin, 0.0) for row in linking_rows] + [0.0 for _ in structure.blocks])
+            (k, point) = origin
+            block = structure.blocks[k]
+            factors = [sum(row.get(j, 0.0) * x for (j, x) in zip(block.variables, point)) for row in linking_rows]
+            factors += [1.0 if b == k else 0.0 for b in range(len(structure.blocks))]
+            return Column(name, sum(phase_costs.get(j, 0.0) * x for (j, x) in zip(block.variables, point)), factors)
+
+        def point_column(k, point, phase_costs):
+            name = f"lambda_{k}_{len(origins)}"
+            origins[name] = (k, point)
+            return column(name, phase_costs)
+
+        def master_model(columns):
+            master = m.Model(f"{model.name} (master)")
+            variables = [master.create_variable(c.name) for c in columns]
+            bounds = [model.constraints[i].bound for i in structure.linking_constraints] + [1.0 for _ in structure.blocks]
+            types = [model.constraints[i].type for i in structure.linking_constraints] + [co.ConstraintType.EQ for _ in structure.blocks]
+            for (r, (bound, type)) in enumerate(zip(bounds, types)):
+                master.add_constraint(co.Constraint(ex.Expression.from_vectors(variables, [c.factors[r] for c in columns]), bound, type))
+            objective = ex.Expression.from_vectors(variables, [c.cost for c in columns])
+            if sense > 0:
+                master.maximize(objective)
+            else:
+                master.minimize(objective)
+            return master
+
+        with _Executor(self.workers) as executor:
+            def pricing(phase_costs):
+                def price(duals):
+                    self._local.iterations += 1
+                    priced_costs = dict(phase_costs)
+                    for (row, dual) in zip(linking_rows, duals):
+                        for (j, factor) in row.items():
+                            priced_costs[j] = priced_costs.get(j, 0.0) - dual * factor
+                    results = executor.map(_solve_block, [_block_model(model, block, priced_costs) for block in structure.blocks])
+                    if not all(result.is_bounded for result in results):
+                        raise Exception("Dantzig-Wolfe decomposition needs bounded blocks")
+                    # the column generation keeps only the columns with a promising reduced cost
+                    return [point_column(k, result.assignment, phase_costs) for (k, result) in enumerate(results)]
+                return price
+
+            results = executor.map(_solve_block, [_block_model(model, block, costs) for block in structure.blocks])
+            if not all(result.is_feasible for result in results):
+                return sol.Solution.unfeasible(model, None, None, model.standard_form())
+            if not all(result.is_bounded for result in results):
+                raise Exception("Dantzig-Wolfe decomposition needs bounded blocks")
+
+            # the first phase: blocks cost nothing, the artificial variables relaxing the linking constraints are minimized
+            columns = [point_column(k, result.assignment, dict()) for (k, result) in enumerate(results)]
+            for j in structure.linking_variables:
+                origins[model.variables[j].name] = j
+                columns.append(column(model.variables[j].name, dict()))
+            for (r, i) in enumerate(structure.linking_constraints):
+                directions = {co.ConstraintType.LE: [-1.0], co.ConstraintType.GE: [1.0], co.ConstraintType.EQ: [-1.0, 1.0]}[model.constraints[i].type]
+                for direction in directions:
+                    name = f"artificial_{len(origins)}"
+                    origins[name] = None
+                    columns.append(Column(name, -sense, [direction if row == r else 0.0 for row in range(rows_count)]))
+
+            master = master_model(columns)
+            solution = ColumnGenerationSolver(pricing(dict()), self.max_iterations).solve(master)
+            if not solution.is_feasible or any(origins[var.name] is None and solution.value(var) > eps for var in solution.model.variables):
+                return sol.Solution.unfeasible(model, None, None, model.standard_form())
+
+            # the second phase: the columns found so far with their costs, without the artificial variables
+            columns = [c for c in (column(var.name, costs) for var in solution.model.variables) if c is not None]
+            master = master_model(columns)
+            solution = ColumnGenerationSolver(pricing(costs), self.max_iterations).solve(master)
+
+        if not solution.is_bounded:
+            return sol.Solution.unbounded(model, None, None, model.standard_form())
+        if not solution.is_feasible:
+            return sol.Solution.unfeasible(model, None, None, model.standard_form())
+
+        assignment = [0.0 for _ in model.variables]
+        for var in solution.model.variables:
+            origin = origins[var.name]
+            if isinstance(origin, tuple):
+                (k, point) = origin
+                for (j, x) in zip(structure.blocks[k].variables, point):
+                    assignment[j] += solution.value(var) * x
+            elif origin is not None:
+                assignment[origin] = solution.value(var)
+        return sol.Solution.with_assignment(model, assignment, None, None, model.standard_form())
+
+
+class BendersSolver:
+    """
+        A class to solve block-structured models with linking variables by the Benders decomposition.
+
+        The master problem contains the linking variables (with the constraints using only them)
+        and an estimate (theta) of every block's objective value, bounded only by the optimality cuts.
+        The first cuts come from the blocks solved with the linking variables at zero (every cut holds for any values of them),
+        so the estimates are bounded by the values of the blocks from the start.
+        The next cuts are added as lazy constraints of the master: for every master solution all the blocks are solved
+        in the worker processes with the linking variables fixed, and the duals of a block whose value is overestimated
+        give a new cut. The master is re-optimized with the dual simplex from its current basis.
+        Block constraints are relaxed by artificial variables with a big penalty, so the blocks are feasible for any master solution,
+        if any of them is still used in the end, the model is reported unfeasible.
+
+        Attributes
+        ----------
+        structure : BlockStructure | None
+            block structure of the models, detected (with the linking variables) for every model if None
+        workers : int | None
+            number of the worker processes solving the blocks (one per core if None, 1 solves them in the calling process)
+        max_iterations : int
+            maximal number of the rounds solving the blocks
+        penalty : float | None
+            objective factor of the artificial variables, derived from the objective factors if None
+        tolerance : float
+            relative tolerance of the block value estimates
+        iterations : int
+            number of the rounds run by the last solve in the current thread
+
+        Methods
+        -------
+        __init__(structure: BlockStructure | None, workers: int | None, max_iterations: int, penalty: float | None, tolerance: float) -> BendersSolver:
+            constructs a new solver
+        solve(model: Model) -> Solution:
+            solves the model, the solution contains only the assignment (there is no tableaux of the whole model)
+    """
+
+    def __init__(self, structure = None, workers = None, max_iterations = 1000, penalty = None, tolerance = 1e-6):
+        self.structure = structure
+        self.workers = workers
+        self.max_iterations = max_iterations
+        self.penalty = penalty
+        self.tolerance = tolerance
+        self._local = threading.local()
+
+    def __reduce__(self):
+        return (BendersSolver, (self.structure, self.workers, self.max_iterations, self.penalty, self.tolerance))
+
+    @property
+    def iterations(self):
+        return getattr(self._local, 'iterations', 0)
+
+    def solve(self, model):
+        structure = self.structure if self.structure is not None else BlockStructure.detect(model, 'variables')
+        linking_variables = set(structure.linking_variables)
+        for i in structure.linking_constraints:
+            if any(j not in linking_variables for j in _factors(model.constraints[i].expression)):
+                raise Exception("Benders decomposition doesn't support linking constraints with the block variables, use the Dantzig-Wolfe decomposition")
+
+        sense = model.objective.type.value
+        costs = _factors(model.objective.expression)
+        penalty = self.penalty if self.penalty is not None else _default_penalty(costs)
+        self._local.iterations = 0
+
+        master = m.Model(f"{model.name} (master)")
+        ys = {j: master.create_variable(model.variables[j].name) for j in structure.linking_variables}
+        thetas = [(master.create_variable(f"theta_{k}"), master.create_variable(f"theta_{k}_neg")) for k in range(len(structure.blocks))]
+        for i in structure.linking_constraints:
+            constraint = model.constraints[i]
+            factors = _factors(constraint.expression)
+            master.add_constraint(co.Constraint(ex.Expression.from_vectors([ys[j] for j in factors], list(factors.values())), constraint.bound, constraint.type))
+        objective = ex.Expression.from_vectors([ys[j] for j in ys] + [v for pair in thetas for v in pair], [costs.get(j, 0.0) for j in ys] + [1.0, -1.0] * len(thetas))
+        if sense > 0:
+            master.maximize(objective)
+        else:
+            master.minimize(objective)
+
+        with _Executor(self.workers) as executor:
+            # values of the linking variables the blocks were solved for last time and the results
+            last = {'fixed': None, 'results': None, 'unbounded': False}
+
+            def solve_blocks(fixed):
+                models = [_block_model(model, block, costs, fixed, penalty) for block in structure.blocks]
+                last['fixed'], last['results'] = fixed, executor.map(_solve_block, models, [True for _ in models])
+                return last['results']
+
+            def cut(k, result):
+                # the block value is at most (at least for min) duals·(bounds - linking part) for any values of the linking variables
+                linking_factors = dict()
+                bound = 0.0
+                for (i, dual) in zip(structure.blocks[k].constraints, result.duals):
+                    constraint = model.constraints[i]
+                    bound += dual * constraint.bound
+                    for (j, factor) in _factors(constraint.expression).items():
+                        if j in ys:
+                            linking_factors[j] = linking_factors.get(j, 0.0) + dual * factor
+                variables = list(thetas[k]) + [ys[j] for j in linking_factors]
+                factors = [1.0, -1.0] + list(linking_factors.values())
+                return co.Constraint(ex.Expression.from_vectors(variables, [sense * f for f in factors]), sense * bound, co.ConstraintType.LE)
+
+            def separator(assignment):
+                if self._local.iterations >= self.max_iterations or last['unbounded']:
+                    return []
+                self._local.iterations += 1
+                fixed = {j: assignment[y.index] for (j, y) in ys.items()}
+                cuts = []
+                for (k, result) in enumerate(solve_blocks(fixed)):
+                    if not result.is_bounded:
+                        last['unbounded'] = True
+                        return []
+                    (theta, theta_neg) = thetas[k]
+                    estimate = assignment[theta.index] - assignment[theta_neg.index]
+                    if sense * (estimate - result.objective) <= self.tolerance * (1.0 + abs(result.objective)):
+                        continue
+                    cuts.append(cut(k, result))
+                return cuts
+
+            initial = solve_blocks({j: 0.0 for j in ys})
+            if all(result.is_bounded for result in initial):
+                for (k, result) in enumerate(initial):
+                    master.add_constraint(cut(k, result))
+                master.add_lazy_constraints(separator)
+                solution = master.solve()
+                if solution.assignment is not None:
+                    fixed = {j: solution.value(y) for (j, y) in ys.items()}
+                    if last['fixed'] is None or any(abs(fixed[j] - last['fixed'][j]) > eps for j in fixed):
+                        solve_blocks(fixed)
+            else:
+                last['unbounded'] = True
+                solution = None
+
+        if last['unbounded'] or not solution.is_bounded:
+            return sol.Solution.unbounded(model, None, None, model.standard_form())
+        if not solution.is_feasible:
+            return sol.Solution.unfeasible(model, None, None, model.standard_form())
+
+        assignment = [0.0 for _ in model.variables]
+        for (j, y) in ys.items():
+            assignment[j] = solution.value(y)
+        for (block, result) in zip(structure.blocks, last['results']):
+            if not result.is_bounded:
+                return sol.Solution.unbounded(model, None, None, model.standard_form())
+            if max(result.assignment[len(block.variables):], default = 0.0) > eps:
+                return sol.Solution.unfeasible(model, None, None, model.standard_form())
+            for (j, x) in zip(block.variables, result.assignment):
+                assignment[j] = x
+        return sol.Solution.with_assignment(model, assignment, None, None, model.standard_form())
+
+
+@dataclass
+class _BlockResult:
+    is_feasible: bool
+    is_bounded: bool
+    assignment: List[float]
+    objective: float
+    duals: List[float]
+
+
+def _factors(expression):
+    factors = dict()
+    for (i, f) in zip(expression.indices, expression.values):
+        factors[i] = factors.get(i, 0.0) + f
+    return factors
+
+
+def _default_penalty(costs):
+    return 10000.0 * (1.0 + max((abs(c) for c in costs.values()), default = 0.0))
+
+
+def _block_model(model, block, costs, fixed = None, penalty = None):
+    """
+        _block_model(model: Model, block: Block, costs: dict[int, float], fixed: dict[int, float] | None, penalty: float | None) -> Model:
+            creates a model of the block with the given objective factors (the objective sense is the same as the model's one),
+            the linking variables are moved to the bounds with the fixed values,
+            with the penalty every constraint gets artificial variables (after the block variables), so it's always feasible
+    """
+    block_model = m.Model(f"{model.name} (block {block.variables[0]})")
+    variables = {j: block_model.create_variable(model.variables[j].name) for j in block.variables}
+    sense = model.objective.type.value
+    objective_variables = [variables[j] for j in block.variables]
+    objective_factors = [costs.get(j, 0.0) for j in block.variables]
+
+    for i in block.constraints:
+        constraint = model.constraints[i]
+        factors = _factors(constraint.expression)
+        bound = constraint.bound - sum(f * fixed[j] for (j, f) in factors.items() if j not in variables) if fixed is not None else constraint.bound
+        expression = ex.Expression.from_vectors([variables[j] for j in factors if j in variables], [f for (j, f) in factors.items() if j in variables])
+        if penalty is not None:
+            directions = {co.ConstraintType.LE: [-1.0], co.ConstraintType.GE: [1.0], co.ConstraintType.EQ: [-1.0, 1.0]}[constraint.type]
+            for direction in directions:
+                artificial = block_model.create_variable(f"artificial_{len(block_model.variables)}")
+                expression = expression + artificial * direction
+                objective_variables.append(artificial)
+                objective_factors.append(-sense * penalty)
+        block_model.add_constraint(co.Constraint(expression, bound, constraint.type))
+
+    objective = ex.Expression.from_vectors(objective_variables, objective_factors)
+    if sense > 0:
+        block_model.maximize(objective)
+    else:
+        block_model.minimize(objective)
+    return block_model
+
+
+def _solve_block(block_model, with_duals = False):
+    solution = block_model.solve()
+    if solution.assignment is None:
+        return _BlockResult(solution.is_feasible, solution.is_bounded, None, None, None)
+    duals = _duals(solution) if with_duals else None
+    return _BlockResult(True, True, solution.assignment, solution.objective_value(), duals)
+
+
+def _duals(solution):
+    """
+        _duals(solution: Solution) -> list[float]:
+            returns duals of the model constraints (cost - duals·factors is the reduced cost of a column, like in the column generation),
+            a basis left incomplete by a degenerate artificial variable is completed (and kept optimal) by the exact refinement
+    """
+    standard_form = solution.standard_form
+    basis = solution.basis
+    if min(basis, default = 0) < 0:
+        refinement = exact.refine(solution.tableaux)
+        if refinement.status != exact.RefinementStatus.OPTIMAL:
+            raise Exception("Can't find the duals of the block, its basis is incomplete")
+        basis = refinement.basis
+    normal_duals = np.linalg.solve(standard_form.matrix[:, basis].T, standard_form.costs[basis])
+    return list(standard_form.objective_sign * standard_form.row_signs * normal_duals)
+
+
+class _Executor:
+    """
+        Maps the block solves over the worker processes (or the calling process for a single worker).
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+
+    def __enter__(self):
+        if self.workers != 1:
+            self._executor = ProcessPoolExecutor(self.workers)
+        return self
+
+    def __exit__(self, *_):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def map(self, function, *iterables):
+        if self._executor is None:
+            return list(map(function, *iterables))
+        return list(self._executor.map(function, *iterables))
@@ -0,0 +1,244 @@
+import enum
+from fractions import Fraction
+from functools import lru_cache
+import numpy as np
+from . import tableaux as t
+
+
+class RefinementStatus(enum.Enum):
+    """
+        An enum to represent the outcome of the exact refinement:
+        - OPTIMAL = the basis is exactly primal and dual feasible (after the repair pivots)
+        - UNBOUNDED = a repair pivot proved the problem to be unbounded
+        - UNFEASIBLE = a repair pivot proved the problem to be unfeasible
+        - UNVERIFIED = the basis couldn't be repaired within the pivot limit (or it's exactly singular)
+    """
+    OPTIMAL = 1
+    UNBOUNDED = 2
+    UNFEASIBLE = 3
+    UNVERIFIED = 4
+
+
+class Refinement:
+    """
+        A class to represent the final basis recomputed in the rational arithmetic.
+
+        Attributes
+        ----------
+        standard_form : StandardForm
+            standard form the basis belongs to
+        basis : list[int]
+            basis[i] is the column basic in the i-th row
+        status : RefinementStatus
+            whether the basis has been confirmed (or repaired) to be optimal
+        pivots : int
+            how many repair pivots were needed
+        assignment : list[Fraction]
+            exact values of all the columns of the standard form (nonbasic ones are 0)
+        reduced_costs : list[Fraction]
+            exact reduced costs (cost row of the tableaux) of all the columns
+        objective : Fraction
+            exact value of the model objective (already with the min/max sign)
+
+        Methods
+        -------
+        tableaux() -> Tableaux:
+            rebuilds the float tableaux for the refined basis
+    """
+
+    def __init__(self, standard_form, basis, status, pivots, assignment, reduced_costs, objective):
+        self.standard_form = standard_form
+        self.basis = basis
+        self.status = status
+        self.pivots = pivots
+        self.assignment = assignment
+        self.reduced_costs = reduced_costs
+        self.objective = objective
+
+    def tableaux(self):
+        return t.Tableaux.from_basis(self.standard_form, self.basis)
+
+
+def refine(tableaux, max_pivots = 10):
+    """
+        refine(tableaux: Tableaux, max_pivots: int) -> Refinement:
+            recomputes the basic solution and the reduced costs of the tableaux' basis exactly,
+            if the basis turns out to be primal (or dual) infeasible, it's repaired with at most max_pivots
+            exact pivots of the dual (or primal) simplex, using the Bland's rule so they can't cycle.
+            Only the basis matrix is factorized in the rational arithmetic, the pivots themselves are never repeated,
+            so the cost is a small fraction of the rational solve.
+    """
+    standard_form = tableaux.standard_form
+    columns = [_sparse_column(column) for column in standard_form.matrix.T]
+    bounds = [_fraction(b) for b in standard_form.bounds]
+    costs = [_fraction(c) for c in standard_form.costs]
+    basis = _complete_basis(tableaux)
+    if basis is None:
+        return _unverified(standard_form, tableaux)
+
+    pivots = 0
+    while True:
+        try:
+            factorization = _Factorization([columns[col] for col in basis], len(bounds))
+        except ZeroDivisionError:
+            return _unverified(standard_form, tableaux, basis, pivots)
+
+        values = factorization.solve(bounds)
+        duals = factorization.solve_transposed([costs[col] for col in basis])
+        reduced_costs = [_dot(duals, column) - cost for (column, cost) in zip(columns, costs)]
+        for col in basis:
+            reduced_costs[col] = Fraction(0)
+
+        leaving_rows = [row for (row, value) in enumerate(values) if value < 0]
+        entering_columns = [col for (col, cost) in enumerate(reduced_costs) if cost < 0]
+        status = None
+        if len(leaving_rows) == 0 and len(entering_columns) == 0:
+            status = RefinementStatus.OPTIMAL
+        elif pivots >= max_pivots or (len(leaving_rows) > 0 and len(entering_columns) > 0):
+            # neither of the simplex methods can start from a basis that is both primal and dual infeasible
+            status = RefinementStatus.UNVERIFIED
+        elif len(leaving_rows) > 0:
+            row = min(leaving_rows, key = lambda r: basis[r])
+            col = _dual_entering_column(factorization, columns, basis, reduced_costs, row)
+            if col is None:
+                status = RefinementStatus.UNFEASIBLE
+            else:
+                basis[row] = col
+        else:
+            col = entering_columns[0]
+            row = _primal_leaving_row(factorization, columns[col], basis, values)
+            if row is None:
+                status = RefinementStatus.UNBOUNDED
+            else:
+                basis[row] = col
+
+        if status is not None:
+            assignment = [Fraction(0) for _ in columns]
+            for (row, col) in enumerate(basis):
+                assignment[col] = values[row]
+            objective = int(standard_form.objective_sign) * sum(costs[col] * value for (col, value) in zip(basis, values))
+            return Refinement(standard_form, basis, status, pivots, assignment, reduced_costs, objective)
+        pivots += 1
+
+
+@lru_cache(maxsize = 4096)
+def _fraction(value):
+    # the shortest decimal representation is the number the model was written with (e.g. 0.1 and not 0.1000000000000000055...)
+    return Fraction(repr(float(value)))
+
+
+def _sparse_column(column):
+    return [(row, _fraction(value)) for (row, value) in enumerate(column) if value != 0]
+
+
+def _dot(vector, sparse_column):
+    return sum((vector[row] * value for (row, value) in sparse_column), Fraction(0))
+
+
+def _complete_basis(tableaux):
+    """
+        _complete_basis(tableaux: Tableaux) -> list[int] | None:
+            returns the basis of the tableaux, rows without a basic column (e.g. after removing a degenerate artificial variable)
+            get the nonbasic column with the biggest factor in that row, None if the row is empty (redundant constraint)
+    """
+    basis = tableaux.extract_basis()
+    for (row, col) in enumerate(basis):
+        if col >= 0:
+            continue
+        factors = np.abs(tableaux.table[row + 1, :-1])
+        factors[[c for c in basis if c >= 0]] = 0.0
+        if factors.max() <= t.eps:
+            return None
+        basis[row] = int(factors.argmax())
+    return basis
+
+
+def _unverified(standard_form, tableaux, basis = None, pivots = 0):
+    assignment = [Fraction(repr(float(v))) for v in tableaux.extract_assignment()]
+    reduced_costs = [Fraction(repr(float(v))) for v in tableaux.cost_factors()]
+    objective = Fraction(repr(float(tableaux.cost()))) * int(standard_form.objective_sign)
+    return Refinement(standard_form, basis if basis is not None else tableaux.extract_basis(), RefinementStatus.UNVERIFIED, pivots, assignment, reduced_costs, objective)
+
+
+def _primal_leaving_row(factorization, column, basis, values):
+    dense = [Fraction(0) for _ in basis]
+    for (row, value) in column:
+        dense[row] = value
+    direction = factorization.solve(dense)
+    rows = [row for (row, factor) in enumerate(direction) if factor > 0]
+    if len(rows) == 0:
+        return None
+    return min(rows, key = lambda row: (values[row] / direction[row], basis[row]))
+
+
+def _dual_entering_column(factorization, columns, basis, reduced_costs, row):
+    unit = [Fraction(0) for _ in basis]
+    unit[row] = Fraction(1)
+    inverse_row = factorization.solve_transposed(unit)
+    basic = set(basis)
+    candidates = []
+    for (col, column) in enumerate(columns):
+        if col in basic:
+            continue
+        factor = _dot(inverse_row, column)
+        if factor < 0:
+            candidates.append((reduced_costs[col] / -factor, col))
+    return min(candidates)[1] if len(candidates) > 0 else None
+
+
+class _Factorization:
+    """
+        Exact LU factorization (with row permutation) of the basis matrix, given as the list of its sparse columns.
+        solve(b) returns x such that B x = b, solve_transposed(c) returns y such that B^T y = c.
+        A singular matrix raises ZeroDivisionError.
+    """
+
+    def __init__(self, columns, size):
+        lu = [[Fraction(0) for _ in range(size)] for _ in range(size)]
+        for (j, column) in enumerate(columns):
+            for (i, value) in column:
+                lu[i][j] = value
+        permutation = list(range(size))
+
+        for k in range(size):
+            pivot = next((i for i in range(k, size) if lu[i][k] != 0), None)
+            if pivot is None:
+                raise ZeroDivisionError("The basis matrix is singular")
+            lu[k], lu[pivot] = lu[pivot], lu[k]
+            permutation[k], permutation[pivot] = permutation[pivot], permutation[k]
+            pivot_row = lu[k]
+            nonzeros = [j for j in range(k + 1, size) if pivot_row[j] != 0]
+            for i in range(k + 1, size):
+                row = lu[i]
+                if row[k] == 0:
+                    continue
+                factor = row[k] / pivot_row[k]
+                row[k] = factor
+                for j in nonzeros:
+                    row[j] -= factor * pivot_row[j]
+
+        self.lu = lu
+        self.permutation = permutation
+
+    def solve(self, rhs):
+        size = len(self.lu)
+        z = [rhs[p] for p in self.permutation]
+        for i in range(size):
+            row = self.lu[i]
+            z[i] -= sum((row[j] * z[j] for j in range(i) if row[j] != 0), Fraction(0))
+        for i in reversed(range(size)):
+            row = self.lu[i]
+            z[i] = (z[i] - sum((row[j] * z[j] for j in range(i + 1, size) if row[j] != 0), Fraction(0))) / row[i]
+        return z
+
+    def solve_transposed(self, rhs):
+        size = len(self.lu)
+        w = list(rhs)
+        for i in range(size):
+            w[i] = (w[i] - sum((self.lu[j][i] * w[j] for j in range(i) if self.lu[j][i] != 0), Fraction(0))) / self.lu[i][i]
+        for i in reversed(range(size)):
+            w[i] -= sum((self.lu[j][i] * w[j] for j in range(i + 1, size) if self.lu[j][i] != 0), Fraction(0))
+        y = [Fraction(0) for _ in range(size)]
+        for (i, p) in enumerate(self.permutation):
+            y[p] = w[i]
+        return y
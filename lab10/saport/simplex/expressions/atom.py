@@ -1,9 +1,11 @@
-from . import expression as e 
+from . import expression as e
+from array import array
 
 class Atom(e.Expression):
     """
         A class to represent an atom of the linear programming expression, i.e. variable and it's factor (e.g. 4x, -5.3x, etc.)
         It derives from the Expression class and can be intepreted as a expression containing only single atom, itself
+        Atoms aren't stored in expressions, they are created only when requested via Expression.atoms
 
         Attributes
         ----------
@@ -22,10 +24,20 @@ class Atom(e.Expression):
             return new atom with a multiplied factor
     """
 
+    __slots__ = ()
+
     def __init__(self, var, factor):
-        self.var = var 
-        self.factor = float(factor)
-        super().__init__(self)
+        self.table = var.table
+        self.indices = array('q', [var.index])
+        self.values = array('d', [float(factor)])
+
+    @property
+    def var(self):
+        return self._variable(self.indices[0])
+
+    @property
+    def factor(self):
+        return self.values[0]
 
     def evaluate_with_value(self, assigned_value):
         return self.factor * assigned_value
@@ -44,4 +56,4 @@ class Atom(e.Expression):
         elif (float(self.factor) == -1.0):
             return f"-{self.var}"
         else:
-            return f"{self.factor}*{self.var}"
\ No newline at end of file
+            return f"{self.factor}*{self.var}"
@@ -1,5 +1,7 @@
 from enum import Enum
 
+eps = 0.0000001
+
 class ConstraintType(Enum):
     """
         An enum to represent a constraint type:
@@ -39,7 +41,12 @@ class Constraint:
             returns new constraint with the simplified polynomial
         invert():
             inverts type of the constraint (multiplies constraint times -1)
+        is_violated(assignment: list[float]) -> bool:
+            checks whether the given assignment violates the constraint
     """
+
+    __slots__ = ('expression', 'bound', 'type')
+
     def __init__(self, expression, bound, type = ConstraintType.GE):
         self.expression = expression
         self.bound = bound
@@ -53,5 +60,13 @@ class Constraint:
         self.expression = self.expression * -1
         self.bound = self.bound * -1
 
+    def is_violated(self, assignment):
+        value = self.expression.evaluate(assignment)
+        return {
+            ConstraintType.LE: value > self.bound + eps,
+            ConstraintType.EQ: abs(value - self.bound) > eps,
+            ConstraintType.GE: value < self.bound - eps
+        }[self.type]
+
     def __str__(self):
         return f"{self.expression} {self.type} {self.bound}"
\ No newline at end of file
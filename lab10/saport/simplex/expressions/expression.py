@@ -1,17 +1,24 @@
 from . import constraint as co
 
-from itertools import groupby
-from functools import reduce
+from array import array
+from copy import deepcopy
 
 
 class Expression:
     """
         A class to represent a linear polynomial in the linear programming, i.e. a sum of atom (e.g. 4x + 5y - 0.4z)
+        Atoms are not stored as objects, the expression keeps two parallel arrays with variable indices and factors
 
         Attributes
         ----------
-        atoms : list[Atom]
-            list of the atoms in the polynomial
+        table : list[Variable] | None
+            list of the model variables (shared by all the expressions in the model), used to find variables by index
+        indices : array[int]
+            indices of the variables in the polynomial
+        values : array[float]
+            factors corresponding to the indices
+        atoms : tuple[Atom]
+            atoms of the polynomial, created on demand
 
         Methods
         -------
@@ -19,18 +26,20 @@ class Expression:
             constructs an expression with atoms given in the paremeter list
         @classmethod from_vectors(variables : Iterable[Variable], factors: Iterable[float]) -> Expression:
             constructs an expression with collections of factors and corresponding variables
+        @staticmethod from_arrays(table: list[Variable], indices: array[int], values: array[float]) -> Expression:
+            constructs an expression directly from the index/factor arrays (arrays are not copied)
         evaluate(assignment: list[float]) -> float:
             returns value of the expression for the given assignment
             assignment is just a list of values with order corresponding to the variables in the model
         simplify() -> Expression:
-            returns a new expression with sorted and atoms and reduced factors 
+            returns a new expression with sorted and atoms and reduced factors
         factors(model: Model) -> list[float]:
             return list of factors corresponding to the variables in the model
         __add__(other: Expression) -> Expression:
             returns sum of the two polynomials
         __sub__(other: Expression) -> Expression:
             returns sum of the two polynomials, inverting the first atom in the second polynomial
-            useful for expressions like 3*x - 4y, otherwise one would have to write 3*x + -4*y 
+            useful for expressions like 3*x - 4y, otherwise one would have to write 3*x + -4*y
         __mul__(factor: float) -> Expression:
             return a new polynomial with all factors multiplied by the given number
         __eq__(bound: float) -> Constraint:
@@ -41,72 +50,106 @@ class Expression:
             returns a new "greater than or equal" constraint
     """
 
+    __slots__ = ('table', 'indices', 'values')
+
     def __init__(self, *atoms):
-        self.atoms = atoms 
+        self.table = next((a.table for a in atoms if a.table is not None), None)
+        self.indices = array('q')
+        self.values = array('d')
+        for a in atoms:
+            self.indices.extend(a.indices)
+            self.values.extend(a.values)
 
     @classmethod
     def from_vectors(self, variables, factors):
-        from .atom import Atom
         assert len(variables) == len(factors), f"number of factors should correspond to variables in the expression"
-        atoms = [Atom(v,f) for (v,f) in zip(variables, factors)]
-        return Expression(*atoms)
+        table = variables[0].table if len(variables) > 0 else None
+        return Expression.from_arrays(table, array('q', [v.index for v in variables]), array('d', [float(f) for f in factors]))
+
+    @staticmethod
+    def from_arrays(table, indices, values):
+        expression = Expression.__new__(Expression)
+        expression.table = table
+        expression.indices = indices
+        expression.values = values
+        return expression
+
+    @property
+    def atoms(self):
+        from .atom import Atom
+        return tuple(Atom(self._variable(i), f) for (i, f) in zip(self.indices, self.values))
+
+    def _variable(self, index):
+        return self.table[index]
+
+    def _name(self, index):
+        return self.table[index].name if self.table is not None else f"x{index}"
 
     def evaluate(self, assignment):
-        adder = lambda val, a: val + a.evaluate_with_value(assignment[a.var.index])
-        return reduce(adder, self.atoms, 0) 
+        return sum(f * assignment[i] for (i, f) in zip(self.indices, self.values))
 
     def simplify(self):
-        from . import atom
-        projection = lambda a: a.var.index
-        reduce_atoms = lambda a1, a2: atom.Atom(a1.var, a1.factor + a2.factor)
-        reduce_group = lambda g: reduce(reduce_atoms, g[1:], g[0])
-    
-        sorted_atoms = sorted(self.atoms, key=projection)
-        grouped_atoms = [list(g[1]) for g in groupby(sorted_atoms, key=projection)]
- 
-        new_atoms = (reduce_group(g) for g in grouped_atoms) 
-        return Expression(*new_atoms)
+        reduced = dict()
+        for (i, f) in zip(self.indices, self.values):
+            reduced[i] = reduced.get(i, 0.0) + f
+        indices = sorted(reduced)
+        return Expression.from_arrays(self.table, array('q', indices), array('d', [reduced[i] for i in indices]))
 
     def factors(self, model):
-        simplified_expression = self.simplify()
         factors = [0.0 for _ in model.variables]
-        for a in simplified_expression.atoms:
-            factors[a.var.index] = a.factor
+        for (i, f) in zip(self.indices, self.values):
+            factors[i] += f
         return factors
 
     def __add__(self, other):
-        new_atoms = list(self.atoms)
-        new_atoms += other.atoms;
-        return Expression(*new_atoms)
+        table = self.table if self.table is not None else other.table
+        return Expression.from_arrays(table, self.indices + other.indices, self.values + other.values)
 
     def __sub__(self, other):
         return self.__add__(other._invert())
 
     def _invert(self):
-        new_atoms = list(self.atoms)
-        new_atoms[0] = new_atoms[0] * -1
-        return Expression(*new_atoms)
+        values = array('d', self.values)
+        values[0] = -values[0]
+        return Expression.from_arrays(self.table, array('q', self.indices), values)
 
     def __mul__(self, factor):
-        new_atoms = [a * factor for a in self.atoms]
-        return Expression(*new_atoms)
+        return Expression.from_arrays(self.table, array('q', self.indices), array('d', [f * factor for f in self.values]))
 
     __rmul__ = __mul__
 
     def __eq__(self, bound):
         return co.Constraint(self, bound, co.ConstraintType.EQ)
-    
+
     def __ge__(self, bound):
         return co.Constraint(self, bound, co.ConstraintType.GE)
 
     def __le__(self, bound):
         return co.Constraint(self, bound, co.ConstraintType.LE)
 
+    def __deepcopy__(self, memo):
+        copy = Expression.__new__(type(self))
+        memo[id(self)] = copy
+        copy.table = deepcopy(self.table, memo)
+        copy.indices = array('q', self.indices)
+        copy.values = array('d', self.values)
+        return copy
+
     def __str__(self):
-        text = str(self.atoms[0])
-        
-        for atom in self.atoms[1:]:
-            text += ' + ' if atom.factor >= 0 else ' - '
-            factor = "" if abs(atom.factor) == 1.0 else f"{abs(atom.factor)}*"
-            text += f'{factor}{atom.var.name}'
-        return text
\ No newline at end of file
+        if len(self.indices) == 0:
+            return "0"
+
+        first_factor = self.values[0]
+        first_name = self._name(self.indices[0])
+        if first_factor == 1.0:
+            text = first_name
+        elif first_factor == -1.0:
+            text = f"-{first_name}"
+        else:
+            text = f"{first_factor}*{first_name}"
+
+        for (i, f) in zip(self.indices[1:], self.values[1:]):
+            text += ' + ' if f >= 0 else ' - '
+            factor = "" if abs(f) == 1.0 else f"{abs(f)}*"
+            text += f'{factor}{self._name(i)}'
+        return text
@@ -42,6 +42,8 @@ class Objective:
             assignment is just a list of floats corresponding (by index) to the variables in the model 
     """
 
+    __slots__ = ('expression', 'type', 'factor')
+
     def __init__(self, expression, type = ObjectiveType.MAX, factor = 1.0):
         self.expression = expression
         self.type = type
@@ -1,10 +1,13 @@
 from . import atom as a
-from enum import Enum
+from array import array
+from copy import deepcopy
+import sys
 
 class Variable(a.Atom):
     """
         A class to represent a linear programming variable.
         It derives from the Atom class and can be interpreted as Atom with factor = 1.
+        Variables are interned: expressions refer to them only by index, so every model variable exists exactly once.
 
         Attributes
         ----------
@@ -12,18 +15,47 @@ class Variable(a.Atom):
             name of the variable
         index : int
             index of the variable used in the model
-        type : VariableType
-            type of the variable
+        table : list[Variable] | None
+            list of the model variables, the variable is stored there at the `index` position
 
         Methods
         -------
-        __init__(name: str, index: int) -> Variable:
+        __init__(name: str, index: int, table: list[Variable] = None) -> Variable:
             constructs new variable with a specified name and index
     """
-    def __init__(self, name, index):
-        self.name = name
+
+    __slots__ = ('name', 'index', '_indices', '_values')
+
+    def __init__(self, name, index, table = None):
+        self.name = sys.intern(name)
         self.index = index
-        super().__init__(self, 1)
+        self.table = table
+        self._indices = None
+        self._values = None
+
+    # arrays of the variable as a single atom expression are built on its first use in an operator (e.g. x + y) and kept,
+    # expressions built from the vectors never need them
+    @property
+    def indices(self):
+        if self._indices is None:
+            self._indices = array('q', [self.index])
+        return self._indices
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = array('d', [1.0])
+        return self._values
+
+    @property
+    def var(self):
+        return self
+
+    def _variable(self, index):
+        return self
+
+    def _name(self, index):
+        return self.name
 
     def __str__(self):
         return self.name
@@ -37,4 +69,20 @@ class Variable(a.Atom):
     def __eq__(self, other):
         if isinstance(other, Variable):
             return self.__key() == other.__key()
-        return NotImplemented
\ No newline at end of file
+        return NotImplemented
+
+    def __deepcopy__(self, memo):
+        copy = Variable.__new__(Variable)
+        memo[id(self)] = copy
+        copy.name = self.name
+        copy.index = self.index
+        copy._indices = None
+        copy._values = None
+        copy.table = deepcopy(self.table, memo)
+        return copy
+
+    def __reduce__(self):
+        return (Variable, (self.name, self.index), (self.table,))
+
+    def __setstate__(self, state):
+        (self.table,) = state
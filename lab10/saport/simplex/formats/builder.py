@@ -0,0 +1,175 @@
+from array import array
+from ..expressions import constraint as co
+from ..expressions import expression as ex
+import numpy as np
+
+inf = float('inf')
+
+
+class ModelBuilder:
+    """
+        A helper class collecting a model while a file is being read.
+        Rows are kept as index/value arrays, so no atom/expression objects are created before the model is built.
+
+        Attributes
+        ----------
+        name : str
+            name of the model
+        maximize : bool
+            whether the objective should be maximized
+        column_names : list[str]
+            names of the columns (variables), in order of their first appearance
+        row_names : list[str]
+            names of the rows (constraints)
+        row_types : list[ConstraintType]
+            types of the rows
+        rhs : list[float]
+            right hand sides of the rows
+        ranges : dict[int, float]
+            ranges of the rows, interpreted as in the MPS format
+        objective_indices, objective_values : array
+            objective factors
+        lower_bounds, upper_bounds : dict[int, float]
+            column bounds different from the default [0, inf)
+
+        Methods
+        -------
+        column(name: str) -> int:
+            returns index of the column, creating it when it's seen for the first time
+        row(name: str) -> int:
+            returns index of the row with the given name
+        add_row(name: str, type: ConstraintType) -> int:
+            creates a new row
+        add_entry(row: int, column: int, value: float):
+            stores a constraint factor
+        add_objective_entry(column: int, value: float):
+            stores an objective factor
+        build(model_class: type) -> Model:
+            creates the model; bounds become constraints, ranged rows become pairs of constraints
+            and columns with negative lower bounds are split into a difference of two nonnegative variables
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.maximize = False
+        self.column_names = []
+        self._columns = dict()
+        self.row_names = []
+        self._rows = dict()
+        self.row_types = []
+        self.rhs = []
+        self.ranges = dict()
+        self._row_indices = []
+        self._row_values = []
+        self.objective_indices = array('q')
+        self.objective_values = array('d')
+        self.lower_bounds = dict()
+        self.upper_bounds = dict()
+
+    def column(self, name):
+        index = self._columns.get(name)
+        if index is None:
+            index = len(self.column_names)
+            self._columns[name] = index
+            self.column_names.append(name)
+        return index
+
+    def row(self, name):
+        if name not in self._rows:
+            raise Exception(f"Unknown row: {name}")
+        return self._rows[name]
+
+    def add_row(self, name, type):
+        if name in self._rows:
+            raise Exception(f"There is already a row named {name}")
+        index = len(self.row_names)
+        self._rows[name] = index
+        self.row_names.append(name)
+        self.row_types.append(type)
+        self.rhs.append(0.0)
+        self._row_indices.append(array('q'))
+        self._row_values.append(array('d'))
+        return index
+
+    def add_entry(self, row, column, value):
+        self._row_indices[row].append(column)
+        self._row_values[row].append(value)
+
+    def add_objective_entry(self, column, value):
+        self.objective_indices.append(column)
+        self.objective_values.append(value)
+
+    def build(self, model_class):
+        model = model_class(self.name)
+        for name in self.column_names:
+            model.create_variable(name)
+
+        split_columns = {c: model.create_variable(f"{self.column_names[c]}_neg").index for (c, lower) in self.lower_bounds.items() if lower < 0}
+
+        def expression(indices, values):
+            if len(split_columns) > 0:
+                indices, values = self._with_split_columns(indices, values, split_columns)
+            return ex.Expression.from_arrays(model.variables, indices, values)
+
+        objective = expression(self.objective_indices, self.objective_values)
+        if self.maximize:
+            model.maximize(objective)
+        else:
+            model.minimize(objective)
+
+        for (i, type) in enumerate(self.row_types):
+            lower, upper = self._row_bounds(i, type)
+            self._add_bounded(model, expression(self._row_indices[i], self._row_values[i]), lower, upper)
+
+        for c in range(len(self.column_names)):
+            lower = self.lower_bounds.get(c, 0.0)
+            upper = self.upper_bounds.get(c, inf)
+            if c in split_columns:
+                column_expression = expression(array('q', [c]), array('d', [1.0]))
+            else:
+                column_expression = model.variables[c]
+                lower = lower if lower > 0 else -inf
+            self._add_bounded(model, column_expression, lower, upper)
+
+        return model
+
+    def _row_bounds(self, row, type):
+        rhs = self.rhs[row]
+        lower, upper = {
+            co.ConstraintType.LE: (-inf, rhs),
+            co.ConstraintType.GE: (rhs, inf),
+            co.ConstraintType.EQ: (rhs, rhs)
+        }[type]
+
+        if row in self.ranges:
+            r = self.ranges[row]
+            if type == co.ConstraintType.LE:
+                lower = rhs - abs(r)
+            elif type == co.ConstraintType.GE:
+                upper = rhs + abs(r)
+            elif r >= 0:
+                upper = rhs + r
+            else:
+                lower = rhs + r
+        return lower, upper
+
+    def _add_bounded(self, model, expression, lower, upper):
+        if lower == upper:
+            model.add_constraint(co.Constraint(expression, lower, co.ConstraintType.EQ))
+            return
+        if lower > -inf:
+            model.add_constraint(co.Constraint(expression, lower, co.ConstraintType.GE))
+        if upper < inf:
+            model.add_constraint(co.Constraint(expression, upper, co.ConstraintType.LE))
+
+    def _with_split_columns(self, indices, values, split_columns):
+        np_indices = np.asarray(indices, dtype=int)
+        mask = np.isin(np_indices, list(split_columns.keys()))
+        if not mask.any():
+            return indices, values
+        new_indices = array('q', indices)
+        new_values = array('d', values)
+        for k in np.nonzero(mask)[0]:
+            new_indices.append(split_columns[indices[k]])
+            new_values.append(-values[k])
+        return new_indices, new_values
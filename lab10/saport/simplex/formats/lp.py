@@ -0,0 +1,242 @@
+import os.path
+import re
+from ..expressions import constraint as co
+from .builder import ModelBuilder, inf
+
+TOKEN = re.compile(r"<=|>=|=<|=>|<|>|=|[+\-:]|(?:\d+\.?\d*|\.\d+)(?:[eE][+\-]?\d+)?|[^\s+\-<>=:]+")
+SECTION = re.compile(r"^\s*(maximize|maximum|max|minimize|minimum|min|subject\s+to|such\s+that|st|s\.t\.|bounds?|generals?|gen|integers?|binary|binaries|bin|end)(?=\s|$)", re.IGNORECASE)
+OPERATORS = {
+    '<=': co.ConstraintType.LE, '=<': co.ConstraintType.LE, '<': co.ConstraintType.LE,
+    '>=': co.ConstraintType.GE, '=>': co.ConstraintType.GE, '>': co.ConstraintType.GE,
+    '=': co.ConstraintType.EQ
+}
+TERMS_PER_LINE = 8
+
+
+def read(path, model_class):
+    """
+        read(path: str, model_class: type) -> Model:
+            reads a model from the CPLEX-LP file, the file is streamed line by line
+            and rows are collected directly in the index/value arrays
+            supported sections: objective, constraints (including ranged ones), bounds, generals and binaries
+            integrality of the generals is ignored, binaries get the [0, 1] bounds
+    """
+    builder = ModelBuilder(os.path.splitext(os.path.basename(path))[0])
+    section = None
+    tokens = []
+
+    with open(path) as f:
+        for line in f:
+            line = line.split('\\', 1)[0]
+            match = SECTION.match(line)
+            if match is not None:
+                _flush(builder, section, tokens)
+                tokens = []
+                section = _section(match.group(1))
+                line = line[match.end():]
+                if section == 'end':
+                    break
+
+            tokens += _tokens(line)
+            if section == 'constraints':
+                tokens = _read_constraints(builder, tokens)
+            elif section in ('bounds', 'generals', 'binaries'):
+                _flush(builder, section, tokens)
+                tokens = []
+
+    _flush(builder, section, tokens)
+    return builder.build(model_class)
+
+
+def _section(keyword):
+    keyword = keyword.lower()
+    if keyword.startswith('max'):
+        return 'maximize'
+    if keyword.startswith('min'):
+        return 'minimize'
+    if keyword.startswith('bound'):
+        return 'bounds'
+    if keyword.startswith('gen') or keyword.startswith('integer'):
+        return 'generals'
+    if keyword.startswith('bin'):
+        return 'binaries'
+    if keyword == 'end':
+        return 'end'
+    return 'constraints'
+
+
+def _tokens(line):
+    tokens = []
+    for token in TOKEN.findall(line):
+        # signs are merged with the following numbers, so "-3" or "- inf" becomes a single token
+        if len(tokens) > 0 and tokens[-1] in ('+', '-') and (_is_number(token) or token.lower() in ('inf', 'infinity')) and (len(tokens) == 1 or tokens[-2] in OPERATORS or tokens[-2] == ':'):
+            token = tokens.pop() + token
+        tokens.append(token)
+    return tokens
+
+
+def _is_number(token):
+    try:
+        float(token)
+        return True
+    except ValueError:
+        return False
+
+
+def _number(token):
+    lowered = token.lower().lstrip('+')
+    if lowered in ('inf', 'infinity'):
+        return inf
+    if lowered in ('-inf', '-infinity'):
+        return -inf
+    return float(token)
+
+
+def _flush(builder, section, tokens):
+    if len(tokens) == 0:
+        return
+    if section in ('maximize', 'minimize'):
+        builder.maximize = section == 'maximize'
+        if len(tokens) > 1 and tokens[1] == ':':
+            tokens = tokens[2:]
+        for (column, value) in _read_expression(builder, tokens, 0)[0]:
+            builder.add_objective_entry(column, value)
+    elif section == 'constraints':
+        rest = _read_constraints(builder, tokens)
+        if len(rest) > 0:
+            raise Exception(f"Incomplete constraint: {' '.join(rest)}")
+    elif section == 'bounds':
+        _read_bound(builder, tokens)
+    elif section == 'generals':
+        for name in tokens:
+            builder.column(name)
+    elif section == 'binaries':
+        for name in tokens:
+            column = builder.column(name)
+            builder.lower_bounds[column] = 0.0
+            builder.upper_bounds[column] = 1.0
+
+
+def _read_expression(builder, tokens, position):
+    """
+        reads terms until an operator or the end of tokens,
+        returns list of (column, factor) pairs, the constant part and the position after the expression
+    """
+    terms = []
+    constant = 0.0
+    sign = 1.0
+    factor = None
+    while position < len(tokens) and tokens[position] not in OPERATORS:
+        token = tokens[position]
+        if token == '+' or token == '-':
+            if factor is not None:
+                constant += sign * factor
+                factor = None
+            sign = 1.0 if token == '+' else -1.0
+        elif _is_number(token):
+            factor = float(token) if factor is None else factor * float(token)
+        else:
+            terms.append((builder.column(token), sign * (1.0 if factor is None else factor)))
+            sign, factor = 1.0, None
+        position += 1
+    if factor is not None:
+        constant += sign * factor
+    return terms, constant, position
+
+
+def _read_constraints(builder, tokens):
+    """
+        reads all the complete constraints and returns tokens of the last, incomplete one
+    """
+    position = 0
+    while position < len(tokens):
+        start = position
+        name = f"c{len(builder.row_names)}"
+        if position + 1 < len(tokens) and tokens[position + 1] == ':':
+            name = tokens[position]
+            position += 2
+
+        range_bound, range_type = None, None
+        if position + 1 < len(tokens) and _is_number(tokens[position]) and tokens[position + 1] in OPERATORS:
+            range_bound, range_type = _number(tokens[position]), OPERATORS[tokens[position + 1]]
+            position += 2
+
+        terms, constant, position = _read_expression(builder, tokens, position)
+        if position + 1 >= len(tokens):
+            return tokens[start:]
+
+        type = OPERATORS[tokens[position]]
+        bound = _number(tokens[position + 1]) - constant
+        position += 2
+
+        if range_bound is not None:
+            lower, upper = (range_bound - constant, bound) if range_type == co.ConstraintType.LE else (bound, range_bound - constant)
+            row = builder.add_row(name, co.ConstraintType.GE)
+            builder.rhs[row] = lower
+            builder.ranges[row] = upper - lower
+        else:
+            row = builder.add_row(name, type)
+            builder.rhs[row] = bound
+        for (column, value) in terms:
+            builder.add_entry(row, column, value)
+    return []
+
+
+def _read_bound(builder, tokens):
+    if len(tokens) == 2 and tokens[1].lower() == 'free':
+        column = builder.column(tokens[0])
+        builder.lower_bounds[column] = -inf
+        builder.upper_bounds[column] = inf
+        return
+
+    if _is_number(tokens[0]) or tokens[0].lower().lstrip('+-') in ('inf', 'infinity'):
+        # value <= x [<= value]
+        column = builder.column(tokens[2])
+        _set_bound(builder, column, OPERATORS[tokens[1]], _number(tokens[0]), reversed = True)
+        if len(tokens) == 5:
+            _set_bound(builder, column, OPERATORS[tokens[3]], _number(tokens[4]))
+    else:
+        # x <= value
+        column = builder.column(tokens[0])
+        _set_bound(builder, column, OPERATORS[tokens[1]], _number(tokens[2]))
+
+
+def _set_bound(builder, column, type, value, reversed = False):
+    if type == co.ConstraintType.EQ:
+        builder.lower_bounds[column] = value
+        builder.upper_bounds[column] = value
+    elif (type == co.ConstraintType.LE) != reversed:
+        builder.upper_bounds[column] = value
+    else:
+        builder.lower_bounds[column] = value
+
+
+def write(model, path):
+    """
+        write(model: Model, path: str):
+            writes the model to a CPLEX-LP file, constraints are named c0, c1, ...
+            all the variables are nonnegative, so there is no bounds section
+            objective lists all the variables (maybe with zero factors), so the variables keep their order
+    """
+    with open(path, 'w') as f:
+        f.write(f"\\ Problem: {model.name}\n")
+        f.write(f"{'Maximize' if model.objective.type.value > 0 else 'Minimize'}\n")
+        objective = model.objective.expression
+        f.write(f" obj: {_expression(model, objective.from_vectors(model.variables, objective.factors(model)))}\n")
+        f.write("Subject To\n")
+        for (i, constraint) in enumerate(model.constraints):
+            f.write(f" c{i}: {_expression(model, constraint.expression)} {constraint.type} {float(constraint.bound):.17g}\n")
+        f.write("End\n")
+
+
+def _expression(model, expression):
+    expression = expression.simplify() if len(expression.indices) > 0 else expression
+    if len(expression.indices) == 0:
+        return "0"
+
+    text = ""
+    for (k, (i, f)) in enumerate(zip(expression.indices, expression.values)):
+        if k > 0 and k % TERMS_PER_LINE == 0:
+            text += "\n  "
+        text += f"{'-' if f < 0 else '+'} {abs(f):.17g} {model.variables[i].name} "
+    return text.strip()
@@ -0,0 +1,156 @@
+import os.path
+import numpy as np
+from ..expressions import constraint as co
+from .builder import ModelBuilder, inf
+
+ROW_TYPES = {
+    'L': co.ConstraintType.LE,
+    'G': co.ConstraintType.GE,
+    'E': co.ConstraintType.EQ
+}
+
+SECTIONS = {'NAME', 'OBJSENSE', 'ROWS', 'COLUMNS', 'RHS', 'RANGES', 'BOUNDS', 'ENDATA'}
+
+
+def read(path, model_class):
+    """
+        read(path: str, model_class: type) -> Model:
+            reads a model from the free MPS file, the file is streamed line by line
+            and rows are collected directly in the index/value arrays
+            supported sections: NAME, OBJSENSE, ROWS, COLUMNS, RHS, RANGES, BOUNDS, ENDATA
+            integrality markers are skipped, semi-continuous bounds are not supported
+            rhs of the objective row (the objective constant) is ignored
+    """
+    builder = ModelBuilder(os.path.splitext(os.path.basename(path))[0])
+    objective_row = None
+    free_rows = set()
+    section = None
+
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) == 0 or line.startswith('*'):
+                continue
+
+            if not line[0].isspace() and fields[0].upper() in SECTIONS:
+                section = fields[0].upper()
+                if section == 'NAME' and len(fields) > 1:
+                    builder.name = fields[1]
+                elif section == 'OBJSENSE' and len(fields) > 1:
+                    builder.maximize = fields[1].upper() in ('MAX', 'MAXIMIZE')
+                elif section == 'ENDATA':
+                    break
+                continue
+
+            if section == 'OBJSENSE':
+                builder.maximize = fields[0].upper() in ('MAX', 'MAXIMIZE')
+            elif section == 'ROWS':
+                type, name = fields[0].upper(), fields[1]
+                if type == 'N':
+                    if objective_row is None:
+                        objective_row = name
+                    else:
+                        free_rows.add(name)
+                else:
+                    builder.add_row(name, ROW_TYPES[type])
+            elif section == 'COLUMNS':
+                if len(fields) > 2 and fields[1] == "'MARKER'":
+                    continue
+                column = builder.column(fields[0])
+                for (row_name, value) in zip(fields[1::2], fields[2::2]):
+                    if row_name == objective_row:
+                        builder.add_objective_entry(column, float(value))
+                    elif row_name not in free_rows:
+                        builder.add_entry(builder.row(row_name), column, float(value))
+            elif section in ('RHS', 'RANGES'):
+                pairs = fields[1:] if len(fields) % 2 == 1 else fields
+                for (row_name, value) in zip(pairs[0::2], pairs[1::2]):
+                    if row_name == objective_row or row_name in free_rows:
+                        continue
+                    if section == 'RHS':
+                        builder.rhs[builder.row(row_name)] = float(value)
+                    else:
+                        builder.ranges[builder.row(row_name)] = float(value)
+            elif section == 'BOUNDS':
+                _read_bound(builder, fields)
+
+    return builder.build(model_class)
+
+
+def _read_bound(builder, fields):
+    type = fields[0].upper()
+    if type in ('FR', 'MI', 'PL', 'BV'):
+        column = builder.column(fields[-1])
+        value = None
+    else:
+        column = builder.column(fields[-2])
+        value = float(fields[-1])
+
+    if type == 'UP' or type == 'UI':
+        builder.upper_bounds[column] = value
+        if value < 0 and builder.lower_bounds.get(column, 0.0) == 0.0:
+            builder.lower_bounds[column] = -inf
+    elif type == 'LO' or type == 'LI':
+        builder.lower_bounds[column] = value
+    elif type == 'FX':
+        builder.lower_bounds[column] = value
+        builder.upper_bounds[column] = value
+    elif type == 'FR':
+        builder.lower_bounds[column] = -inf
+        builder.upper_bounds[column] = inf
+    elif type == 'MI':
+        builder.lower_bounds[column] = -inf
+    elif type == 'PL':
+        builder.upper_bounds[column] = inf
+    elif type == 'BV':
+        builder.lower_bounds[column] = 0.0
+        builder.upper_bounds[column] = 1.0
+    else:
+        raise Exception(f"Unsupported bound type: {type}")
+
+
+def write(model, path):
+    """
+        write(model: Model, path: str):
+            writes the model to a free MPS file, constraints are named c0, c1, ...
+            all the variables are nonnegative, so there is no BOUNDS section
+    """
+    rows, columns, values = [], [], []
+    for (i, constraint) in enumerate([model.objective] + model.constraints):
+        expression = constraint.expression.simplify()
+        rows.append(np.full(len(expression.indices), i - 1))
+        columns.append(np.asarray(expression.indices, dtype=int))
+        values.append(np.asarray(expression.values))
+
+    # columns without any factor get a zero objective entry, otherwise they would be lost (or reordered)
+    present = np.zeros(len(model.variables), dtype=bool)
+    present[np.concatenate(columns)] = True
+    missing = np.nonzero(~present)[0]
+    rows.append(np.full(len(missing), -1))
+    columns.append(missing)
+    values.append(np.zeros(len(missing)))
+
+    rows, columns, values = np.concatenate(rows), np.concatenate(columns), np.concatenate(values)
+    order = np.argsort(columns, kind='stable')
+
+    with open(path, 'w') as f:
+        f.write(f"NAME {_name(model.name)}\n")
+        f.write(f"OBJSENSE\n    {'MAX' if model.objective.type.value > 0 else 'MIN'}\n")
+        f.write("ROWS\n N  obj\n")
+        for (i, constraint) in enumerate(model.constraints):
+            f.write(f" {'LEG'[constraint.type.value + 1]}  c{i}\n")
+
+        f.write("COLUMNS\n")
+        for k in order:
+            row = 'obj' if rows[k] < 0 else f"c{rows[k]}"
+            f.write(f"    {model.variables[columns[k]].name}  {row}  {values[k]:.17g}\n")
+
+        f.write("RHS\n")
+        for (i, constraint) in enumerate(model.constraints):
+            if constraint.bound != 0:
+                f.write(f"    RHS  c{i}  {float(constraint.bound):.17g}\n")
+        f.write("ENDATA\n")
+
+
+def _name(name):
+    return "_".join(name.split())
@@ -0,0 +1,84 @@
+import json
+import os
+import numpy as np
+from .. import standard_form as sf
+from .. import tableaux as tb
+
+
+def save(path, standard_form, tableaux = None, include_table = True):
+    """
+        save(path: str, standard_form: StandardForm, tableaux: Tableaux | None, include_table: bool):
+            writes the standard form (and optionally the tableaux) to the directory as separate .npy files,
+            so every array can be memory-mapped when the snapshot is loaded
+            basis of the tableaux is always stored, the table itself only if include_table is set
+            (otherwise it's rebuilt from the basis when loaded)
+    """
+    os.makedirs(path, exist_ok=True)
+    arrays = {
+        'matrix': standard_form.matrix,
+        'bounds': standard_form.bounds,
+        'costs': standard_form.costs,
+        'row_signs': standard_form.row_signs,
+        'names': np.array(standard_form.names, dtype=str),
+        'slack_variables': _pairs(standard_form.slack_variables),
+        'surplus_variables': _pairs(standard_form.surplus_variables),
+        'artificial_variables': _pairs(standard_form.artificial_variables)
+    }
+    if tableaux is not None:
+        arrays['basis'] = np.array(tableaux.extract_basis(), dtype=np.int64)
+        if include_table:
+            arrays['table'] = tableaux.table
+
+    for (name, array) in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(array))
+
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump({
+            'name': standard_form.name,
+            'objective_sign': float(standard_form.objective_sign),
+            'variables_count': int(standard_form.variables_count),
+            'arrays': sorted(arrays.keys())
+        }, f)
+
+
+def load(path, mmap_mode = 'r'):
+    """
+        load(path: str, mmap_mode: str | None) -> (StandardForm, Tableaux | None):
+            reads the snapshot saved with the save function, arrays are memory-mapped with the given mode
+            (use mmap_mode=None to read them into memory), the tableaux is None if it wasn't saved
+            memory-mapped arrays are read-only by default, it's fine for the simplex which creates new tables when pivoting
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+
+    def array(name):
+        return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    standard_form = sf.StandardForm(
+        meta['name'],
+        array('matrix'),
+        array('bounds'),
+        array('costs'),
+        array('row_signs'),
+        meta['objective_sign'],
+        meta['variables_count'],
+        array('names').tolist(),
+        _dict(array('slack_variables')),
+        _dict(array('surplus_variables')),
+        _dict(array('artificial_variables'))
+    )
+
+    tableaux = None
+    if 'table' in meta['arrays']:
+        tableaux = tb.Tableaux(standard_form, array('table'))
+    elif 'basis' in meta['arrays']:
+        tableaux = tb.Tableaux.from_basis(standard_form, np.asarray(array('basis')))
+    return standard_form, tableaux
+
+
+def _pairs(mapping):
+    return np.array(sorted(mapping.items()), dtype=np.int64).reshape(-1, 2)
+
+
+def _dict(pairs):
+    return {int(column): int(row) for (column, row) in pairs}
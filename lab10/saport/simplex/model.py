@@ -1,13 +1,19 @@
 from copy import deepcopy
 import enum
+import hashlib
 from itertools import permutations
 
 from . import solver as s
+from . import solution as sol
+from . import standard_form as sf
 from .expressions import expression as ex
 from .expressions import variable as va
 from .expressions import objective as ob
 from .expressions import constraint as co
+from .formats import mps, lp
+from .. import pool as solver_pool
 import numpy as np
+import os.path
 
 class Model:
     """
@@ -24,64 +30,130 @@ class Model:
             list containing problem constraints
         objective : Objective
             object representing the objective function
+        separators : list[Callable[[list[float]], list[Constraint]]]
+            lazy constraint callbacks, every one receives a candidate assignment and returns constraints it violates
+        solution_cache : SolutionCache | None
+            cache checked by solve() before solving, it's a class attribute, so it can be set for all the models at once
+            (models with lazy constraints are never cached)
 
         Methods
         -------
         __init__(name: str) -> Model:
             constructs new model with a specified name
+        @classmethod from_file(path: str) -> Model:
+            reads a model from a MPS (.mps) or CPLEX-LP (.lp) file,
+            variables with negative lower bounds are split into two nonnegative variables (x and x_neg)
+        serialize(path: str)
+            writes the model to a MPS (.mps) or CPLEX-LP (.lp) file, depending on the extension
         create_variable(name: str) -> Variable
             returns a new variable with a specified named, the variable is automatically indexed and added to the variables list
         add_constraint(constraint: Constraint)
             add a new constraint to the model
+        add_lazy_constraints(separator: Callable[[list[float]], list[Constraint]])
+            registers a separation callback, constraints returned by it are added only when they are violated by the solver
         maximize(expression: Expression)
             sets objective to maximize the specified Expression
         minimize(expression: Expression)
             sets objective to minimize the specified Expression
         translate_to_standard_form() -> Model
             creates a new equivalent model in a standard form (max objective and <= / = constraints)
+        standard_form() -> StandardForm
+            returns the model compiled to the array-based standard form used by the simplex,
+            the result is cached, the cache is checked against the contents of the model (so changes of the constraints
+            made directly, e.g. of their bounds, compile the model again)
+        fingerprint() -> str
+            returns a hash of the compiled standard form, the same for renamed copies and copies with reordered constraints
         is_equivalent(other: Model) -> bool
             checks whether the model is equivalent to another one (ignores variables' names, etc.), useful when writing tests
+            models with different fingerprints are rejected without the full comparison
         dual() -> Model
             creates a dual model 
 
-        solve() -> Solution
+        solve(exact: bool, retention: Retention) -> Solution
             solves the current model using Simplex solver and returns the result
             when called, the model should already contain at least one variable and objective
+            if the solution cache is set, the cached solution (remapped to this model) is returned when available
+            and it keeps at least as much of its tableaux as the retention asks for
+            if exact is True, the final basis is verified (and repaired) in the rational arithmetic, such solves bypass the cache
+            retention decides what the solution keeps of its tableaux (by default only the basis, see saport.simplex.solution)
+        async solve_async(*args, pool: SolverPool | None) -> Solution
+            solves the model in a worker process of the given (or the default) pool, arguments are passed to solve()
+            the model is shipped with its compiled standard form, the returned solution refers to the copy of the model made by the worker,
+            a cancelled solve is stopped at the next simplex pivot,
+            separators of models with lazy constraints have to be picklable (e.g. module level functions)
     """
-    
+
+    solution_cache = None
+
     def __init__(self, name):
         self.name = name
         self.variables = []
         self.constraints = []
         self.objective = None
+        self.separators = []
+        self._standard_form = None
+        self._standard_form_contents = None
+        self._variable_names = set()
+
+    @classmethod
+    def from_file(cls, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.mps':
+            return mps.read(path, cls)
+        if extension == '.lp':
+            return lp.read(path, cls)
+        raise Exception(f"Unsupported model file format: {extension}")
+
+    def serialize(self, path):
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.mps':
+            mps.write(self, path)
+        elif extension == '.lp':
+            lp.write(self, path)
+        else:
+            raise Exception(f"Unsupported model file format: {extension}")
 
     def create_variable(self, name):
-        for var in self.variables:
-            if (var.name == name):
-                raise Exception(f"There is already a variable named {name}")
+        if name in self._variable_names:
+            raise Exception(f"There is already a variable named {name}")
 
+        self._variable_names.add(name)
+        self._standard_form = None
         new_index = len(self.variables)
-        variable = va.Variable(name, new_index)
+        variable = va.Variable(name, new_index, self.variables)
         self.variables.append(variable)
         return variable 
 
     def add_constraint(self, constraint):
+        self._standard_form = None
         self.constraints.append(constraint)
+
+    def add_lazy_constraints(self, separator):
+        self.separators.append(separator)
          
     def maximize(self, expression):
+        self._standard_form = None
         self.objective = ob.Objective(expression, ob.ObjectiveType.MAX)
     
     def minimize(self, expression):
+        self._standard_form = None
         self.objective = ob.Objective(expression, ob.ObjectiveType.MIN)
         
     def _simplify(self):
+        self._standard_form = None
         self.constraints = [c.simplify() for c in self.constraints]
         self.objective = self.objective.simplify()
 
+    def fingerprint(self):
+        return self.standard_form().fingerprint()
+
     def is_equivalent(self, other):
         if not isinstance(other, Model):
             return False
 
+        if self.fingerprint() != other.fingerprint():
+            return False
+
         m1 = self.translate_to_standard_form()
         m2 = other.translate_to_standard_form()
 
@@ -123,6 +195,25 @@ class Model:
         self._create_dual_constraints(primal, dual)
         return dual
 
+    def standard_form(self):
+        contents = self._contents()
+        if self._standard_form is None or self._standard_form_contents != contents:
+            self._standard_form = sf.StandardForm.from_model(self)
+            self._standard_form_contents = contents
+        return self._standard_form
+
+    def _contents(self):
+        # digest of the raw arrays of the expressions, it's much cheaper than compiling the model again
+        digest = hashlib.blake2b(digest_size = 16)
+        digest.update(repr((len(self.variables), len(self.constraints))).encode())
+        expressions = [self.objective] if self.objective is not None else []
+        for item in expressions + self.constraints:
+            factor = item.factor if isinstance(item, ob.Objective) else item.bound
+            digest.update(repr((item.type.value, factor, len(item.expression.indices))).encode())
+            digest.update(item.expression.indices.tobytes())
+            digest.update(item.expression.values.tobytes())
+        return digest.digest()
+
     def translate_to_standard_form(self):
         standard = deepcopy(self)
         standard._simplify()
@@ -159,15 +250,31 @@ class Model:
             if constraint.type == co.ConstraintType.GE:
                 constraint.invert()
 
-    def solve(self):
+    def solve(self, exact = False, retention = sol.Retention.BASIS):
         if len(self.variables) == 0:
             raise Exception("Can't solve a model without any variables")
 
         if self.objective == None:
             raise Exception("Can't solve a model without an objective")
 
-        solver = s.Solver()
-        return solver.solve(deepcopy(self))
+        cache = self.solution_cache if len(self.separators) == 0 and not exact else None
+        if cache is not None:
+            solution = cache.get(self, retention)
+            if solution is not None:
+                return solution
+
+        self.standard_form()
+        solver = s.Solver(exact, retention = retention)
+        solution = solver.solve(deepcopy(self))
+        if cache is not None:
+            cache.put(self, solution)
+        return solution
+
+    async def solve_async(self, *args, pool = None):
+        # the standard form is compiled here and pickled with the model, so the worker only checks that it's up to date
+        self.standard_form()
+        pool = pool if pool is not None else solver_pool.default_pool()
+        return await pool.run(_solve, self, *args)
 
     def __str__(self):
         separator = '\n\t'
@@ -177,5 +284,7 @@ class Model:
 - objective:{separator}{self.objective}
 '''
         return text
-    
 
+
+def _solve(model, *args):
+    return model.solve(*args)
@@ -0,0 +1,194 @@
+import threading
+import numpy as np
+
+from . import model as m
+from . import solution as sol
+from .column_generation import Column, ColumnGenerationSolver
+from .expressions import constraint as co
+from .expressions import expression as ex
+from .tableaux import eps
+
+
+class SiftingSolver:
+    """
+        A class to solve linear programming problems with many more columns than rows by sifting (sprint).
+
+        The model is never compiled to the dense standard form, its columns are kept in a sparse (column-major) store.
+        A working model with a small subset of the columns is solved by the column generation,
+        every pricing round computes the reduced costs of all the other columns in chunks (a dense block of chunk_size columns at once)
+        and appends the most attractive ones, until no column prices out. Memory used by the tableaux is set by the working set.
+        If zero doesn't satisfy some constraints, the sifting runs in two phases: the first one relaxes them by artificial variables
+        and minimizes those (all the columns cost nothing), if they can't be driven to zero the model is reported unfeasible.
+        The second one starts from the working set of the first one, without the artificial variables.
+
+        Attributes
+        ----------
+        working_size : int | None
+            number of the columns in the initial working set (those with the best objective factors), twice the number of rows if None
+        columns_per_round : int | None
+            maximal number of the columns added in a single pricing round, the number of rows if None
+        chunk_size : int
+            number of the columns priced at once
+        max_iterations : int
+            maximal number of the pricing rounds (in each phase)
+        iterations : int
+            number of the pricing rounds run by the last solve in the current thread
+        working_set_size : int
+            number of the model columns in the final working set of the last solve in the current thread
+
+        Methods
+        -------
+        __init__(working_size: int | None, columns_per_round: int | None, chunk_size: int, max_iterations: int) -> SiftingSolver:
+            constructs a new solver
+        solve(model: Model) -> Solution:
+            solves the model, the solution contains only the assignment (there is no tableaux of the whole model)
+    """
+
+    def __init__(self, working_size = None, columns_per_round = None, chunk_size = 10000, max_iterations = float('inf')):
+        self.working_size = working_size
+        self.columns_per_round = columns_per_round
+        self.chunk_size = chunk_size
+        self.max_iterations = max_iterations
+        self._local = threading.local()
+
+    def __reduce__(self):
+        return (SiftingSolver, (self.working_size, self.columns_per_round, self.chunk_size, self.max_iterations))
+
+    @property
+    def iterations(self):
+        return getattr(self._local, 'iterations', 0)
+
+    @property
+    def working_set_size(self):
+        return getattr(self._local, 'working_set_size', 0)
+
+    def solve(self, model):
+        columns = _SparseColumns(model)
+        rows_count = len(model.constraints)
+        sense = model.objective.type.value
+        working_size = self.working_size if self.working_size is not None else 2 * rows_count
+        columns_per_round = self.columns_per_round if self.columns_per_round is not None else max(rows_count, 1)
+        in_working_set = np.zeros(columns.count, dtype = bool)
+        self._local.iterations = 0
+
+        initial = columns.best(columns.costs, np.zeros(rows_count), sense, in_working_set, working_size, self.chunk_size, -np.inf)
+        in_working_set[initial] = True
+
+        def working_model(indices, costs, artificial):
+            working = m.Model(f"{model.name} (working set)")
+            variables = [working.create_variable(model.variables[j].name) for j in indices]
+            factors = [columns.factors(j) for j in indices]
+            objective_factors = [costs[j] for j in indices]
+            for (i, direction) in artificial:
+                variables.append(working.create_variable(f"artificial_{i}"))
+                factors.append(np.where(np.arange(rows_count) == i, direction, 0.0))
+                objective_factors.append(-sense)
+            for (i, constraint) in enumerate(model.constraints):
+                working.add_constraint(co.Constraint(ex.Expression.from_vectors(variables, [f[i] for f in factors]), constraint.bound, constraint.type))
+            objective = ex.Expression.from_vectors(variables, objective_factors)
+            if sense > 0:
+                working.maximize(objective)
+            else:
+                working.minimize(objective)
+            return working
+
+        def pricing(costs):
+            def price(duals):
+                self._local.iterations += 1
+                best = columns.best(costs, np.array(duals), sense, in_working_set, columns_per_round, self.chunk_size, eps)
+                in_working_set[best] = True
+                return [Column(model.variables[j].name, costs[j], list(columns.factors(j))) for j in best]
+            return price
+
+        artificial = [(i, d) for (i, d) in ((i, _artificial_direction(c)) for (i, c) in enumerate(model.constraints)) if d != 0.0]
+        if len(artificial) > 0:
+            # the first phase: columns cost nothing, the artificial variables are minimized
+            phase_costs = np.zeros(columns.count)
+            working = working_model(initial, phase_costs, artificial)
+            solution = ColumnGenerationSolver(pricing(phase_costs), self.max_iterations).solve(working)
+            # the artificial variables follow the initial columns, the priced ones are appended after them
+            artificial_variables = working.variables[len(initial):len(initial) + len(artificial)]
+            if not solution.is_feasible or any(solution.value(var) > eps for var in artificial_variables):
+                self._local.working_set_size = int(in_working_set.sum())
+                return sol.Solution.unfeasible(model, None, None, model.standard_form())
+
+        working = working_model(np.nonzero(in_working_set)[0], columns.costs, [])
+        solution = ColumnGenerationSolver(pricing(columns.costs), self.max_iterations).solve(working)
+        self._local.working_set_size = int(in_working_set.sum())
+
+        if not solution.is_bounded:
+            return sol.Solution.unbounded(model, None, None, model.standard_form())
+        if not solution.is_feasible:
+            return sol.Solution.unfeasible(model, None, None, model.standard_form())
+
+        indices = {var.name: var.index for var in model.variables}
+        assignment = [0.0 for _ in model.variables]
+        for var in solution.model.variables:
+            assignment[indices[var.name]] = solution.value(var)
+        return sol.Solution.with_assignment(model, assignment, None, None, model.standard_form())
+
+
+class _SparseColumns:
+    """
+        Constraint factors of the model stored column by column (CSC-like arrays) with the objective factors.
+    """
+
+    def __init__(self, model):
+        self.count = len(model.variables)
+        self.rows_count = len(model.constraints)
+        rows = [np.full(len(c.expression.indices), i, dtype = np.int64) for (i, c) in enumerate(model.constraints)]
+        cols = [np.frombuffer(c.expression.indices, dtype = np.int64) for c in model.constraints]
+        values = [np.frombuffer(c.expression.values, dtype = np.float64) for c in model.constraints]
+        rows = np.concatenate(rows) if len(rows) > 0 else np.zeros(0, dtype = np.int64)
+        cols = np.concatenate(cols) if len(cols) > 0 else np.zeros(0, dtype = np.int64)
+        values = np.concatenate(values) if len(values) > 0 else np.zeros(0)
+
+        order = np.argsort(cols, kind = 'stable')
+        self.rows = rows[order]
+        self.values = values[order]
+        self.starts = np.searchsorted(cols[order], np.arange(self.count + 1))
+
+        objective = model.objective.expression
+        self.costs = np.zeros(self.count)
+        np.add.at(self.costs, np.frombuffer(objective.indices, dtype = np.int64), np.frombuffer(objective.values, dtype = np.float64))
+
+    def factors(self, col):
+        factors = np.zeros(self.rows_count)
+        (start, end) = (self.starts[col], self.starts[col + 1])
+        np.add.at(factors, self.rows[start:end], self.values[start:end])
+        return factors
+
+    def best(self, costs, duals, sense, excluded, count, chunk_size, threshold):
+        """
+            best(costs: numpy.Array, duals: numpy.Array, sense: int, excluded: numpy.Array, count: int, chunk_size: int, threshold: float) -> numpy.Array:
+                returns indices of (at most) count columns with the best reduced costs (with the given objective factors) above the threshold,
+                the reduced costs are computed for chunk_size columns at once
+        """
+        best_columns = np.zeros(0, dtype = np.int64)
+        best_costs = np.zeros(0)
+        for start in range(0, self.count, chunk_size):
+            end = min(start + chunk_size, self.count)
+            (first, last) = (self.starts[start], self.starts[end])
+            chunk = np.zeros((self.rows_count, end - start))
+            np.add.at(chunk, (self.rows[first:last], np.repeat(np.arange(end - start), np.diff(self.starts[start:end + 1]))), self.values[first:last])
+            reduced_costs = sense * (costs[start:end] - duals @ chunk)
+            reduced_costs[excluded[start:end]] = -np.inf
+            candidates = np.nonzero(reduced_costs > threshold)[0]
+            best_columns = np.concatenate((best_columns, candidates + start))
+            best_costs = np.concatenate((best_costs, reduced_costs[candidates]))
+            if len(best_columns) > count:
+                kept = np.argpartition(-best_costs, count - 1)[:count]
+                (best_columns, best_costs) = (best_columns[kept], best_costs[kept])
+        return best_columns[np.argsort(-best_costs, kind = 'stable')]
+
+
+def _artificial_direction(constraint):
+    """
+        _artificial_direction(constraint: Constraint) -> float:
+            factor of the artificial variable needed by the constraint, 0.0 if zero satisfies the constraint
+    """
+    if constraint.type == co.ConstraintType.LE:
+        return -1.0 if constraint.bound < 0 else 0.0
+    if constraint.type == co.ConstraintType.GE:
+        return 1.0 if constraint.bound > 0 else 0.0
+    return float(np.sign(constraint.bound))
@@ -1,3 +1,68 @@
+from copy import deepcopy
+import enum
+import os.path
+from .formats import snapshot
+from . import exact
+from . import tableaux as t
+
+
+class Retention(enum.Enum):
+    """
+        An enum to represent what a solution keeps of its tableaux:
+        - NONE = nothing, only the assignment (and the flags) are available
+        - BASIS = only the basis indices, the tableaux are rebuilt from them on demand
+        - FULL = the whole tables
+    """
+    NONE = 0
+    BASIS = 1
+    FULL = 2
+
+
+class RetainedTableaux:
+    """
+        A tableaux kept by a solution according to its retention policy.
+        A tableaux whose basis is incomplete (e.g. with a degenerate artificial variable removed)
+        can't be rebuilt from the basis, so it's always kept whole.
+
+        Attributes
+        ----------
+        standard_form : StandardForm
+            standard form of the tableaux
+        basis : list[int]
+            basis of the tableaux
+        kept : Tableaux | None
+            the whole tableaux, None until it's rebuilt
+
+        Methods
+        -------
+        @staticmethod retain(tableaux: Tableaux | RetainedTableaux | None, retention: Retention, copy: bool) -> RetainedTableaux | None:
+            returns what should be kept of the tableaux (a copy of it, if copy is True and it's kept whole)
+        tableaux() -> Tableaux:
+            returns the tableaux, rebuilt from the basis when needed (and kept since then)
+    """
+
+    def __init__(self, standard_form, basis, kept = None):
+        self.standard_form = standard_form
+        self.basis = basis
+        self.kept = kept
+
+    @staticmethod
+    def retain(tableaux, retention, copy = False):
+        if tableaux is None or retention == Retention.NONE:
+            return None
+        if isinstance(tableaux, RetainedTableaux):
+            return tableaux
+        basis = tableaux.extract_basis()
+        if retention == Retention.BASIS and min(basis, default = 0) >= 0:
+            return RetainedTableaux(tableaux.standard_form, basis)
+        return RetainedTableaux(tableaux.standard_form, basis, deepcopy(tableaux) if copy else tableaux)
+
+    def tableaux(self):
+        if self.kept is None:
+            self.kept = t.Tableaux.from_basis(self.standard_form, self.basis)
+        return self.kept
+
+
 class Solution:
     """
         A class to represent a solution to linear programming problem.
@@ -10,39 +75,93 @@ class Solution:
         assignment : list[float] | None
             list with the values assigned to the variables if solution is feasible and bounded, otherwise None
             order of values should correspond to the order of variables in model.variables list
-        initial_tableaux: Tableaux
+        initial_tableaux: Tableaux | None
             a simplex tableaux corresponding to the first base solution
-        tableaux: Tableaux
+        tableaux: Tableaux | None
             a simplex tableaux corresponding to the solution 
+            with the BASIS retention both tableaux are rebuilt on the first access, with NONE retention the access raises an exception
+        basis: list[int] | None
+            basis of the final tableaux (without rebuilding it)
+        retention: Retention
+            what the solution keeps of its tableaux (by default only the basis)
+        standard_form: StandardForm
+            compiled standard form (with slack and surplus variables) corresponding to the final tableaux
         normal_model: Model
-            normal model with slack and surplus variables
+            normal model with slack and surplus variables, created from the standard form on demand
         is_feasible: bool
             whether the problem is feasible
         is_bounded: bool
             whether the problem is bounded
+        refinement: Refinement | None
+            the final basis recomputed in the rational arithmetic, available only if the model was solved in the exact mode
 
 
         Methods
         -------
-        __init__(model: Model, assignment: list[float] | None, initial_tableaux: Tableaux, tableaux: Tableaux, normal_model: Model,  is_feasible: bool, is_bounded: bool) -> Solution:
-            constructs a new solution for the specified model, assignment, tableaux and normal model
+        __init__(model: Model, assignment: list[float] | None, initial_tableaux: Tableaux, tableaux: Tableaux, standard_form: StandardForm,  is_feasible: bool, is_bounded: bool, retention: Retention) -> Solution:
+            constructs a new solution for the specified model, assignment, tableaux and standard form
+            the tableaux are kept according to the retention policy (they can also be already retained, see RetainedTableaux)
             if the assignment is null, one of the flags should false - either the solution is infeasible or is unbounded
         value(var: Variable) -> float | None:
             returns a value assigned to the specified variable if the model is feasible and bounded, otherwise None
         objective_value() -> float | None:
             returns a value of the objective function if the model is feasible and bounded, otherwise None
+        is_verified() -> bool:
+            whether the solution has been confirmed to be optimal in the rational arithmetic
+        exact_value(var: Variable) -> Fraction | None:
+            returns the exact value assigned to the variable if the solution has been verified to be optimal, otherwise None
+        exact_objective_value() -> Fraction | None:
+            returns the exact value of the objective function if the solution has been verified to be optimal, otherwise None
         has_assignment() -> bool:
             helper method returning info if the model is feasible and bounded, only then there is an assignment available
+        swap_out(path: str):
+            saves both tableaux to the snapshot directory and replaces them with memory-mapped copies,
+            so a long living solution doesn't keep the tables in RAM (the retention becomes FULL)
     """
 
-    def __init__(self, model, assignment, initial_tableaux, tableaux, normal_model, is_feasible, is_bounded):
+    def __init__(self, model, assignment, initial_tableaux, tableaux, standard_form, is_feasible, is_bounded, retention = Retention.BASIS):
         self.model = model 
-        self.normal_model = normal_model
+        self.standard_form = standard_form
         self.is_feasible = is_feasible
         self.is_bounded = is_bounded
         self.assignment = assignment
-        self.tableaux = tableaux
-        self.initial_tableaux = initial_tableaux
+        self.retention = retention
+        self.retained_initial_tableaux = RetainedTableaux.retain(initial_tableaux, retention)
+        self.retained_tableaux = RetainedTableaux.retain(tableaux, retention)
+        self.refinement = None
+
+    @property
+    def initial_tableaux(self):
+        return self._rebuild(self.retained_initial_tableaux)
+
+    @initial_tableaux.setter
+    def initial_tableaux(self, tableaux):
+        self.retained_initial_tableaux = RetainedTableaux.retain(tableaux, self.retention)
+
+    @property
+    def tableaux(self):
+        return self._rebuild(self.retained_tableaux)
+
+    @tableaux.setter
+    def tableaux(self, tableaux):
+        self.retained_tableaux = RetainedTableaux.retain(tableaux, self.retention)
+
+    @property
+    def basis(self):
+        retained = self.retained_tableaux
+        if retained is None:
+            return None
+        # a kept tableaux could have been pivoted since it was retained
+        return retained.basis if retained.kept is None else retained.kept.extract_basis()
+
+    def _rebuild(self, retained):
+        if self.retention == Retention.NONE:
+            raise Exception("The solution doesn't keep its tableaux, solve the model with a different retention policy")
+        return None if retained is None else retained.tableaux()
+
+    @property
+    def normal_model(self):
+        return self.standard_form.normal_model()
 
     def value(self, var):
         return None if self.assignment == None else self.assignment[var.index]
@@ -50,20 +169,38 @@ class Solution:
     def objective_value(self):
         return None if self.assignment == None else self.model.objective.evaluate(self.assignment) 
 
+    def is_verified(self):
+        return self.refinement is not None and self.refinement.status == exact.RefinementStatus.OPTIMAL
+
+    def exact_value(self, var):
+        return self.refinement.assignment[var.index] if self.is_verified() else None
+
+    def exact_objective_value(self):
+        return self.refinement.objective if self.is_verified() else None
+
     def has_assignment(self):
         return self.assignment == None
 
+    def swap_out(self, path):
+        initial_path = os.path.join(path, 'initial')
+        final_path = os.path.join(path, 'final')
+        snapshot.save(initial_path, self.initial_tableaux.standard_form, self.initial_tableaux)
+        snapshot.save(final_path, self.standard_form, self.tableaux)
+        self.retention = Retention.FULL
+        _, self.initial_tableaux = snapshot.load(initial_path)
+        self.standard_form, self.tableaux = snapshot.load(final_path)
+
     @staticmethod
-    def with_assignment(model, assignment, initial_tableaux, tableaux, normal_model):
-        return Solution(model, assignment, initial_tableaux, tableaux, normal_model, True, True)  
+    def with_assignment(model, assignment, initial_tableaux, tableaux, standard_form, retention = Retention.BASIS):
+        return Solution(model, assignment, initial_tableaux, tableaux, standard_form, True, True, retention)  
 
     @staticmethod
-    def unfeasible(model, initial_tableaux, tableaux, normal_model):
-        return Solution(model, None, initial_tableaux, tableaux, normal_model, False, True)   
+    def unfeasible(model, initial_tableaux, tableaux, standard_form, retention = Retention.BASIS):
+        return Solution(model, None, initial_tableaux, tableaux, standard_form, False, True, retention)   
 
     @staticmethod
-    def unbounded(model, initial_tableaux, tableaux, normal_model):
-        return Solution(model, None, initial_tableaux, tableaux, normal_model, True, False)
+    def unbounded(model, initial_tableaux, tableaux, standard_form, retention = Retention.BASIS):
+        return Solution(model, None, initial_tableaux, tableaux, standard_form, True, False, retention)
 
     def __str__(self):
 
@@ -0,0 +1,158 @@
+import os
+import pickle
+import threading
+import numpy as np
+from cachetools import LRUCache
+from . import solution as s
+from . import tableaux as t
+
+
+class SolutionCache:
+    """
+        A cache of the simplex solutions, models are identified by the fingerprint of their standard form,
+        so renamed copies and copies with reordered constraints share the same entry.
+        Entries are kept in memory and optionally in a directory on disk (one pickle file per entry).
+        All the operations are guarded by a lock, so the cache can be shared by many threads.
+
+        Attributes
+        ----------
+        memory : cachetools.Cache
+            in-memory cache, its class decides about the eviction (e.g. LRUCache, LFUCache, FIFOCache)
+        path : str | None
+            directory with the disk entries, None if the disk cache is disabled
+        disk_maxsize : int
+            maximal number of the disk entries, the least recently used files are removed first
+        hits : int
+            how many times a solution was found in the cache
+        misses : int
+            how many times a solution was missing
+
+        Methods
+        -------
+        __init__(maxsize: int, path: str | None, disk_maxsize: int, cache_class: type) -> SolutionCache:
+            constructs a new cache with the given sizes and eviction policy of the in-memory part
+        get(model: Model, retention: Retention | None) -> Solution | None:
+            returns the cached solution remapped to the given model (its variables, constraints order, etc.),
+            a solution keeping less of its tableaux than the given retention is treated as missing
+        put(model: Model, solution: Solution):
+            stores the solution of the given model
+        clear():
+            removes all the entries (also from the disk)
+    """
+
+    def __init__(self, maxsize = 128, path = None, disk_maxsize = 1024, cache_class = LRUCache):
+        self.memory = cache_class(maxsize = maxsize)
+        self.path = path
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def get(self, model, retention = None):
+        fingerprint = model.standard_form().fingerprint()
+        with self._lock:
+            entry = self.memory.get(fingerprint)
+            if entry is None:
+                entry = self._read(fingerprint)
+                if entry is not None:
+                    self.memory[fingerprint] = entry
+
+            if entry is None or (retention is not None and entry[0].retention.value < retention.value):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._remap(entry, model)
+
+    def put(self, model, solution):
+        standard_form = model.standard_form()
+        fingerprint = standard_form.fingerprint()
+        entry = (solution, standard_form.canonical_order())
+        with self._lock:
+            self.memory[fingerprint] = entry
+            self._write(fingerprint, entry)
+
+    def clear(self):
+        with self._lock:
+            self.memory.clear()
+            if self.path is not None:
+                for file in self._files():
+                    os.remove(file)
+
+    def _file(self, fingerprint):
+        return os.path.join(self.path, f"{fingerprint}.pickle")
+
+    def _files(self):
+        return [os.path.join(self.path, f) for f in os.listdir(self.path) if f.endswith('.pickle')]
+
+    def _read(self, fingerprint):
+        if self.path is None or not os.path.exists(self._file(fingerprint)):
+            return None
+        with open(self._file(fingerprint), 'rb') as f:
+            entry = pickle.load(f)
+        # modification time marks the recently used entries
+        os.utime(self._file(fingerprint))
+        return entry
+
+    def _write(self, fingerprint, entry):
+        if self.path is None:
+            return
+        with open(self._file(fingerprint), 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        files = self._files()
+        if len(files) > self.disk_maxsize:
+            files.sort(key=os.path.getmtime)
+            for file in files[:len(files) - self.disk_maxsize]:
+                os.remove(file)
+
+    def _remap(self, entry, model):
+        solution, order = entry
+        standard_form = model.standard_form()
+        model_order = standard_form.canonical_order()
+
+        if np.array_equal(order, model_order) and solution.standard_form.objective_sign == standard_form.objective_sign:
+            initial_tableaux = self._copy(solution.retained_initial_tableaux)
+            tableaux = self._copy(solution.retained_tableaux)
+            standard_form = solution.standard_form
+        else:
+            # constraints are in a different order (or the objective is inverted),
+            # so the final tableaux is rebuilt from the remapped basis
+            initial_tableaux = None
+            tableaux = self._remapped_tableaux(solution, order, model_order, standard_form)
+
+        assignment = None if solution.assignment is None else list(solution.assignment)
+        return s.Solution(model, assignment, initial_tableaux, tableaux, standard_form, solution.is_feasible, solution.is_bounded, solution.retention)
+
+    def _copy(self, retained):
+        if retained is None:
+            return None
+        kept = None if retained.kept is None else t.Tableaux(retained.kept.standard_form, retained.kept.table.copy())
+        return s.RetainedTableaux(retained.standard_form, list(retained.basis), kept)
+
+    def _remapped_tableaux(self, solution, order, model_order, standard_form):
+        if solution.assignment is None or solution.basis is None:
+            return None
+
+        rows_map = np.empty(len(order), dtype=int)
+        rows_map[order] = model_order
+        cached_form = solution.standard_form
+        slack_columns = {row: col for (col, row) in standard_form.slack_variables.items()}
+        surplus_columns = {row: col for (col, row) in standard_form.surplus_variables.items()}
+
+        basis = []
+        for col in solution.basis:
+            if 0 <= col < cached_form.variables_count:
+                basis.append(col)
+            elif col in cached_form.slack_variables:
+                basis.append(slack_columns[rows_map[cached_form.slack_variables[col]]])
+            elif col in cached_form.surplus_variables:
+                basis.append(surplus_columns[rows_map[cached_form.surplus_variables[col]]])
+            else:
+                return None
+
+        try:
+            return t.Tableaux.from_basis(standard_form, basis)
+        except np.linalg.LinAlgError:
+            return None
@@ -1,43 +1,152 @@
-from copy import deepcopy
-from os import name
-
-from . import model as m 
-from .expressions import objective as o 
+from copy import copy
 from .expressions import constraint as c
-from .expressions import variable as v
-from . import solution as s 
+from . import solution as s
 from . import tableaux as t
-import numpy as np 
+from . import exact as e
+from .. import pool as solver_pool
+import numpy as np
 
 
 class Solver:
     """
         A class to represent a simplex solver.
+        All the tableaux are built from the standard form compiled (and cached) by the model.
+        The solver keeps no state between the calls (everything lives in the tableaux and its standard form),
+        so one instance can be shared by many threads.
+        In a worker of the solver pool every pivot checks whether the task has been cancelled (see saport.pool.check_cancelled).
+
+        Attributes
+        ----------
+        exact : bool
+            whether the final basis of the optimal solutions is verified (and repaired) in the rational arithmetic
+        max_repair_pivots : int
+            how many exact pivots can be used to repair the final basis
+        retention : Retention
+            what the returned solutions keep of their tableaux (by default only the basis)
 
         Methods
         -------
+        __init__(exact: bool, max_repair_pivots: int, retention: Retention) -> Solver:
+            constructs a new solver, by default without the exact verification
         solve(model: Model) -> Solution:
             solves the given model and return the first solution
+            if the model has lazy constraint separators, violated rows are added to the final tableaux
+            and the solution is re-optimized with the dual simplex until no separator reports a violation
+            in the exact mode the solution's assignment comes from the refined basis (see saport.simplex.exact),
+            unless the basis couldn't be verified, then the float assignment is kept
+        solve_with_tableaux(model: Model) -> (Solution, Tableaux):
+            solves the given model and returns the solution together with the final tableaux (whatever the retention)
+        reoptimize(model: Model, tableaux: Tableaux, constraints: list[Constraint]) -> (Solution, Tableaux):
+            warm starts from the optimal tableaux of a model without the given constraints (e.g. a parent in the branch and bound),
+            adds the constraints as new rows and re-optimizes with the dual simplex, the given tableaux is left untouched
+        probe(tableaux: Tableaux, constraints: list[Constraint], max_pivots: int) -> float | None:
+            like reoptimize, but stops after max_pivots dual simplex pivots and returns only the cost of the tableaux
+            (a bound of the objective with the constraints), None if the constraints make the model unfeasible
+        drop_rows(tableaux: Tableaux, columns: list[int]) -> Tableaux:
+            returns a tableaux without the rows of the slack variables in the given columns, which aren't binding (are basic),
+            the rows of the binding ones are kept, the given tableaux is left untouched
     """
 
+    def __init__(self, exact = False, max_repair_pivots = 10, retention = s.Retention.BASIS):
+        self.exact = exact
+        self.max_repair_pivots = max_repair_pivots
+        self.retention = retention
+
     def solve(self, model):
-        normal_model = self._normalize_model(model)
-        if len(self.slack_variables) < len(normal_model.constraints):
-            tableaux, success = self._presolve(normal_model)
+        return self.solve_with_tableaux(model)[0]
+
+    def solve_with_tableaux(self, model):
+        standard_form = model.standard_form()
+        if len(standard_form.slack_variables) < len(standard_form.bounds):
+            tableaux, success = self._presolve(standard_form)
             if not success:
-                return s.Solution.unfeasible(model, tableaux, tableaux, normal_model)
+                return (s.Solution.unfeasible(model, tableaux, tableaux, standard_form, self.retention), tableaux)
         else:
-            tableaux = self._basic_initial_tableaux(normal_model)
+            tableaux = self._basic_initial_tableaux(standard_form)
+
+        initial_tableaux = s.RetainedTableaux.retain(tableaux, self.retention, copy=True)
+        if self._optimize(tableaux) == False:
+            return (s.Solution.unbounded(model, initial_tableaux, tableaux, standard_form, self.retention), tableaux)
+        return (self._finish(model, initial_tableaux, tableaux), tableaux)
 
-        initial_tableaux = deepcopy(tableaux)
+    def reoptimize(self, model, tableaux, constraints):
+        tableaux = copy(tableaux)
+        for constraint in constraints:
+            self._add_constraint_rows(tableaux, constraint)
+
+        initial_tableaux = s.RetainedTableaux.retain(tableaux, self.retention, copy=True)
+        if self._dual_optimize(tableaux) == False:
+            return (s.Solution.unfeasible(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention), tableaux)
         if self._optimize(tableaux) == False:
-            return s.Solution.unbounded(model, initial_tableaux, tableaux, normal_model)
+            return (s.Solution.unbounded(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention), tableaux)
+        return (self._finish(model, initial_tableaux, tableaux), tableaux)
+
+    def probe(self, tableaux, constraints, max_pivots):
+        tableaux = copy(tableaux)
+        for constraint in constraints:
+            self._add_constraint_rows(tableaux, constraint)
+
+        for _ in range(max_pivots):
+            if tableaux.is_feasible():
+                break
+            solver_pool.check_cancelled()
+            pivot_row = tableaux.choose_leaving_row()
+            if tableaux.is_unfeasible(pivot_row):
+                return None
+            tableaux.pivot(pivot_row, tableaux.choose_entering_column(pivot_row))
+        return tableaux.cost()
+
+    def drop_rows(self, tableaux, columns):
+        tableaux = copy(tableaux)
+        for column in sorted(columns, reverse = True):
+            basis = tableaux.extract_basis()
+            if column not in basis:
+                continue
+            row = basis.index(column)
+            tableaux.table = np.delete(np.delete(tableaux.table, row + 1, 0), column, 1)
+            tableaux.standard_form = tableaux.standard_form.without_row(tableaux.standard_form.slack_variables[column], column)
+        return tableaux
+
+    def _finish(self, model, initial_tableaux, tableaux):
+        """
+            _finish(model: Model, initial_tableaux: RetainedTableaux, tableaux: Tableaux) -> Solution:
+                separates the lazy constraints of the optimal tableaux and creates the solution
+        """
+        while len(model.separators) > 0:
+            violated_constraints = self._separate(model, tableaux)
+            if len(violated_constraints) == 0:
+                break
+            for constraint in violated_constraints:
+                self._add_lazy_constraint(model, tableaux, constraint)
+            if self._dual_optimize(tableaux) == False:
+                return s.Solution.unfeasible(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention)
+            if self._optimize(tableaux) == False:
+                return s.Solution.unbounded(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention)
+
+        if self.exact:
+            return self._refine(model, initial_tableaux, tableaux)
 
         assignment = tableaux.extract_assignment()
-        return self._create_solution(assignment, model, initial_tableaux, tableaux, normal_model)
+        return self._create_solution(assignment, model, initial_tableaux, tableaux)
+
+    def _refine(self, model, initial_tableaux, tableaux):
+        refinement = e.refine(tableaux, self.max_repair_pivots)
+        if refinement.status == e.RefinementStatus.UNBOUNDED:
+            solution = s.Solution.unbounded(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention)
+        elif refinement.status == e.RefinementStatus.UNFEASIBLE:
+            solution = s.Solution.unfeasible(model, initial_tableaux, tableaux, tableaux.standard_form, self.retention)
+        elif refinement.status == e.RefinementStatus.OPTIMAL:
+            if refinement.pivots > 0:
+                tableaux = s.RetainedTableaux(refinement.standard_form, refinement.basis)
+            solution = self._create_solution([float(v) for v in refinement.assignment], model, initial_tableaux, tableaux)
+        else:
+            solution = self._create_solution(tableaux.extract_assignment(), model, initial_tableaux, tableaux)
+        solution.refinement = refinement
+        return solution
 
     def _optimize(self, tableaux):
         while not tableaux.is_optimal():
+            solver_pool.check_cancelled()
             pivot_col = tableaux.choose_entering_variable()
             if tableaux.is_unbounded(pivot_col):
                 return False
@@ -46,116 +155,132 @@ class Solver:
             tableaux.pivot(pivot_row, pivot_col)
         return True
 
-    def _presolve(self, model):
+    def _dual_optimize(self, tableaux):
+        while not tableaux.is_feasible():
+            solver_pool.check_cancelled()
+            pivot_row = tableaux.choose_leaving_row()
+            if tableaux.is_unfeasible(pivot_row):
+                return False
+            pivot_col = tableaux.choose_entering_column(pivot_row)
+
+            tableaux.pivot(pivot_row, pivot_col)
+        return True
+
+    def _separate(self, model, tableaux):
+        assignment = tableaux.extract_assignment()
+        assignment = [assignment[var.index] for var in model.variables]
+        violated_constraints = []
+        for separator in model.separators:
+            violated_constraints += [c for c in separator(assignment) if c.is_violated(assignment)]
+        return violated_constraints
+
+    def _add_lazy_constraint(self, model, tableaux, constraint):
+        model.add_constraint(constraint)
+        self._add_constraint_rows(tableaux, constraint)
+
+    def _add_constraint_rows(self, tableaux, constraint):
+        rows = [constraint] if constraint.type != c.ConstraintType.EQ else [
+            c.Constraint(constraint.expression, constraint.bound, c.ConstraintType.LE),
+            c.Constraint(constraint.expression, constraint.bound, c.ConstraintType.GE)
+        ]
+
+        for row_constraint in rows:
+            sign = -1.0 if row_constraint.type == c.ConstraintType.GE else 1.0
+            factors = np.zeros(tableaux.standard_form.variables_count)
+            expression = row_constraint.expression
+            np.add.at(factors, np.asarray(expression.indices, dtype=int), sign * np.asarray(expression.values))
+            self._add_row(tableaux, factors, sign * row_constraint.bound, sign)
+
+    def _add_row(self, tableaux, factors, bound, sign):
+        """
+            _add_row(tableaux: Tableaux, factors: numpy.Array, bound: float, sign: float):
+                adds a new "<=" row (with its own slack variable) to the tableaux, expressing it in terms of the current basis
         """
-            _presolve(model: Model) -> Tableaux:
+        standard_form = tableaux.standard_form
+        basis = tableaux.extract_basis()
+        new_form = standard_form.with_row(factors, bound, sign, f"s{len(standard_form.bounds)}")
+
+        tableaux.add_column(np.zeros(tableaux.table.shape[0]))
+        row = np.concatenate((new_form.matrix[-1], [bound]))
+        for (constr_index, col) in enumerate(basis):
+            if col >= 0 and row[col] != 0:
+                row = row - row[col] * tableaux.table[constr_index + 1]
+        tableaux.add_row(row)
+        tableaux.standard_form = new_form
+
+    def _presolve(self, standard_form):
+        """
+            _presolve(standard_form: StandardForm) -> Tableaux:
                 returns a initial tableaux for the second phase of simplex
         """
-        presolve_model = self._create_presolve_model(model)
-        tableaux = self._presolve_initial_tableaux(presolve_model)
-        
+        presolve_form = standard_form.with_artificial_variables()
+        tableaux = self._presolve_initial_tableaux(presolve_form)
+
         self._optimize(tableaux)
 
         if self._artifical_variables_are_positive(tableaux):
             return (tableaux, False)
 
+        self._drive_out_artificial_variables(tableaux)
         basis = tableaux.extract_basis()
 
-        tableaux = self._remove_artificial_variables(tableaux)
-        tableaux = self._restore_original_objective_row(tableaux, model)
+        tableaux = self._remove_artificial_variables(tableaux, standard_form)
+        tableaux = self._restore_original_objective_row(tableaux)
         tableaux = self._fix_objective_row_to_the_basis(tableaux, basis)
         return (tableaux, True)
 
-    def _normalize_model(self, original_model):
-        """
-            _normalize_model(model: Model) -> Model:
-                returns a normalized version of the given model 
-        """
-
-        model = original_model.translate_to_standard_form()
-        self._change_constraints_bounds_to_nonnegative(model)
-        self.slack_variables = self._add_slack_variables(model)
-        self.surplus_variables = self._add_surplus_variables(model)   
-        return model
-
-    def _create_presolve_model(self, normalized_model):
-        presolve_model = deepcopy(normalized_model)
-        self.artificial_variables = self._add_artificial_variables(presolve_model)
-        return presolve_model    
-
-    def _change_constraints_bounds_to_nonnegative(self, model):
-        for constraint in model.constraints:
-            if constraint.bound < 0:
-                constraint.invert()
-    
-    def _add_slack_variables(self, model):
-        slack_variables = dict()
-        for (i,constraint) in enumerate(model.constraints.copy()):
-            if constraint.type == c.ConstraintType.LE:
-                slack_var = model.create_variable(f"s{i}")
-                slack_variables[slack_var] = i
-                constraint.expression = constraint.expression + slack_var
-                constraint.type = c.ConstraintType.EQ
-        return slack_variables
-
-    def _add_surplus_variables(self, model):
-        surplus_variables = dict()
-        for (i,constraint) in enumerate(model.constraints.copy()):
-            if constraint.type == c.ConstraintType.GE:
-                surplus_var = model.create_variable(f"s{i}")
-                surplus_variables[surplus_var] = i
-                constraint.expression = constraint.expression - surplus_var
-                constraint.type = c.ConstraintType.EQ
-        return surplus_variables 
-
-    def _add_artificial_variables(self, model):
-        artificial_variables = dict()
-        for (i,constraint) in enumerate(model.constraints.copy()):
-            if i in self.slack_variables.values():
-                continue
-            artificial_var = model.create_variable(f"R{i}")
-            artificial_variables[artificial_var] = i
-            constraint.expression = constraint.expression + artificial_var
-        return artificial_variables
-
-    def _presolve_initial_tableaux(self, model):
-        objective_row = np.array([0.0 for _ in model.variables] + [0.0])
-
-        for var in self.artificial_variables.keys():
-            objective_row[var.index] = 1.0
+    def _constraints_table(self, standard_form):
+        return np.column_stack((standard_form.matrix, standard_form.bounds))
 
-        table = np.array([objective_row] + [c.expression.factors(model) + [c.bound] for c in model.constraints])
+    def _presolve_initial_tableaux(self, presolve_form):
+        constraints_table = self._constraints_table(presolve_form)
+        artificial_columns = list(presolve_form.artificial_variables.keys())
+        artificial_rows = list(presolve_form.artificial_variables.values())
 
-        for constraint_index in self.artificial_variables.values():
-            constraint = model.constraints[constraint_index]
-            factors_row = np.array(constraint.expression.factors(model) + [constraint.bound])
-            objective_row = objective_row - factors_row
+        objective_row = np.zeros(constraints_table.shape[1])
+        objective_row[artificial_columns] = 1.0
+        objective_row = objective_row - constraints_table[artificial_rows].sum(axis=0)
 
-        table = np.array([objective_row] + [c.expression.factors(model) + [c.bound] for c in model.constraints])
-        return t.Tableaux(model, table)
+        table = np.vstack((objective_row, constraints_table))
+        return t.Tableaux(presolve_form, table)
 
-    def _basic_initial_tableaux(self, model):
-        objective_row = np.array((-1 * model.objective.expression).factors(model) + [0.0])
-        table = np.array([objective_row] + [c.expression.factors(model) + [c.bound] for c in model.constraints])
-        return t.Tableaux(model, table)
+    def _basic_initial_tableaux(self, standard_form):
+        objective_row = np.concatenate((-standard_form.costs, [0.0]))
+        table = np.vstack((objective_row, self._constraints_table(standard_form)))
+        return t.Tableaux(standard_form, table)
 
     def _artifical_variables_are_positive(self, tableaux):
         assignment = tableaux.extract_assignment()
-        for artificial_var in self.artificial_variables:
-            if assignment[artificial_var.index] > 0:
-                return True 
+        for artificial_col in tableaux.standard_form.artificial_variables:
+            if assignment[artificial_col] > t.eps:
+                return True
         return False
 
-    def _remove_artificial_variables(self, tableaux):
-        columns_to_remove = [var.index for var in self.artificial_variables.keys()]
+    def _drive_out_artificial_variables(self, tableaux):
+        """
+            _drive_out_artificial_variables(tableaux: Tableaux):
+                replaces artificial variables left in the basis (at zero) with other variables of their rows,
+                otherwise the rows would lose their basic variables when the artificial columns are removed
+                (rows of the redundant constraints have no other variables and keep the artificial one)
+        """
+        artificial_columns = tableaux.standard_form.artificial_variables
+        for (row, col) in enumerate(tableaux.extract_basis()):
+            if col not in artificial_columns:
+                continue
+            factors = np.abs(tableaux.table[row + 1, :-1])
+            factors[list(artificial_columns)] = 0.0
+            if factors.max() > t.eps:
+                tableaux.pivot(row + 1, int(factors.argmax()))
+
+    def _remove_artificial_variables(self, tableaux, standard_form):
+        columns_to_remove = list(tableaux.standard_form.artificial_variables.keys())
         table = np.delete(tableaux.table, columns_to_remove, 1)
-        return t.Tableaux(tableaux.model, table)
+        return t.Tableaux(standard_form, table, tableaux.pivots)
 
-    def _restore_original_objective_row(self, tableaux, model):
-        objective_row = np.array((-1 * model.objective.expression).factors(model) + [0.0])
+    def _restore_original_objective_row(self, tableaux):
         new_table = np.array(tableaux.table)
-        new_table[0] = objective_row
-        return t.Tableaux(model, new_table)
+        new_table[0] = np.concatenate((-tableaux.standard_form.costs, [0.0]))
+        return t.Tableaux(tableaux.standard_form, new_table, tableaux.pivots)
 
     def _fix_objective_row_to_the_basis(self, tableaux, basis):
         objective_row = tableaux.table[0].copy()
@@ -163,7 +288,7 @@ class Solver:
         for (constr_index, col) in enumerate(basis):
             if col >= len(objective_row) - 1:
                 continue
-            
+
             row = constr_index + 1
             objective_factor = objective_row[col]
             if objective_factor == 0:
@@ -172,8 +297,8 @@ class Solver:
 
         new_table = np.array(tableaux.table)
         new_table[0] = objective_row
-        return t.Tableaux(tableaux.model, new_table)
+        return t.Tableaux(tableaux.standard_form, new_table, tableaux.pivots)
 
-    def _create_solution(self, assignment, model, initial_tableaux, tableaux, normal_model):
+    def _create_solution(self, assignment, model, initial_tableaux, tableaux):
         assignment = [assignment[var.index] for var in model.variables]
-        return s.Solution.with_assignment(model, assignment, initial_tableaux, tableaux, normal_model)
+        return s.Solution.with_assignment(model, assignment, initial_tableaux, tableaux, tableaux.standard_form, self.retention)
@@ -0,0 +1,196 @@
+from .expressions import constraint as co
+from .expressions import expression as ex
+import hashlib
+import numpy as np
+
+
+class StandardForm:
+    """
+        A class to represent a linear programming model compiled to the standard form used by the simplex:
+        max objective, equality constraints with nonnegative bounds, slack and surplus columns added.
+        It's compiled in a single pass over the model and never modified afterwards, methods return new objects.
+
+        Attributes
+        ----------
+        name : str
+            name of the compiled model
+        matrix : numpy.Array
+            2d-array with the constraint factors, columns correspond to model variables followed by slack and surplus variables
+        bounds : numpy.Array
+            constraint bounds
+        costs : numpy.Array
+            objective factors in the maximization form (inverted for min objectives)
+        row_signs : numpy.Array
+            +1/-1 for every row, row i of the matrix (without slack/surplus) equals row_signs[i] * the i-th model constraint
+        objective_sign : float
+            1.0 for max objectives, -1.0 for min objectives
+        variables_count : int
+            how many of the columns correspond to the model variables
+        names : list[str]
+            names of the columns
+        slack_variables : dict[int, int]
+            maps columns of the slack variables to the rows they belong to
+        surplus_variables : dict[int, int]
+            maps columns of the surplus variables to the rows they belong to
+        artificial_variables : dict[int, int]
+            maps columns of the artificial variables to the rows they belong to (present only in the presolve form)
+
+        Methods
+        -------
+        from_model(model: Model) -> StandardForm:
+            compiles the given model
+        objective_name() -> str:
+            returns name of the cost variable used in the tableaux
+        canonical_order() -> numpy.Array:
+            returns order of the rows used by the fingerprint (rows sorted by their type, bound and factors)
+        fingerprint() -> str:
+            returns a hash of the rows in the canonical order and the costs,
+            names of the variables, order of the constraints and min/max form of the objective don't change it
+        with_artificial_variables() -> StandardForm:
+            returns a new standard form of the first phase: an artificial variable is added to every row without a slack variable
+            and the costs maximize minus their sum
+        with_column(name: str, cost: float, factors: numpy.Array) -> StandardForm:
+            returns a new standard form with a column of a new model variable (cost and factors already in the standard form),
+            it's placed after the other model variables, so the slack and surplus columns move by one
+        with_row(factors: numpy.Array, bound: float, sign: float, slack_name: str) -> StandardForm:
+            returns a new standard form with an additional "<=" row (already multiplied by sign) and its slack variable
+        without_row(row: int, column: int) -> StandardForm:
+            returns a new standard form without the given row and the column of its slack (or surplus) variable
+        normal_model() -> Model:
+            creates a model object equivalent to the standard form (e.g. to print it)
+    """
+
+    def __init__(self, name, matrix, bounds, costs, row_signs, objective_sign, variables_count, names, slack_variables, surplus_variables, artificial_variables = None):
+        self.name = name
+        self.matrix = matrix
+        self.bounds = bounds
+        self.costs = costs
+        self.row_signs = row_signs
+        self.objective_sign = objective_sign
+        self.variables_count = variables_count
+        self.names = names
+        self.slack_variables = slack_variables
+        self.surplus_variables = surplus_variables
+        self.artificial_variables = dict() if artificial_variables is None else artificial_variables
+
+    @staticmethod
+    def from_model(model):
+        variables_count = len(model.variables)
+        rows_count = len(model.constraints)
+        row_signs = np.ones(rows_count)
+        bounds = np.zeros(rows_count)
+        rows_types = []
+
+        for (i, constraint) in enumerate(model.constraints):
+            sign = -1.0 if constraint.type == co.ConstraintType.GE else 1.0
+            if sign * constraint.bound < 0:
+                sign = -sign
+            row_signs[i] = sign
+            bounds[i] = sign * constraint.bound
+            rows_types.append(co.ConstraintType(constraint.type.value * int(sign)))
+
+        slack_rows = [i for (i, type) in enumerate(rows_types) if type == co.ConstraintType.LE]
+        surplus_rows = [i for (i, type) in enumerate(rows_types) if type == co.ConstraintType.GE]
+        columns_count = variables_count + len(slack_rows) + len(surplus_rows)
+
+        matrix = np.zeros((rows_count, columns_count))
+        for (i, constraint) in enumerate(model.constraints):
+            expression = constraint.expression
+            np.add.at(matrix[i], np.asarray(expression.indices, dtype=int), row_signs[i] * np.asarray(expression.values))
+
+        slack_variables = {variables_count + k: i for (k, i) in enumerate(slack_rows)}
+        surplus_variables = {variables_count + len(slack_rows) + k: i for (k, i) in enumerate(surplus_rows)}
+        for (col, row) in slack_variables.items():
+            matrix[row, col] = 1.0
+        for (col, row) in surplus_variables.items():
+            matrix[row, col] = -1.0
+
+        objective_sign = float(model.objective.type.value)
+        costs = np.zeros(columns_count)
+        objective = model.objective.expression
+        np.add.at(costs, np.asarray(objective.indices, dtype=int), objective_sign * np.asarray(objective.values))
+
+        names = [var.name for var in model.variables] + [f"s{i}" for i in slack_rows + surplus_rows]
+        return StandardForm(model.name, matrix, bounds, costs, row_signs, objective_sign, variables_count, names, slack_variables, surplus_variables)
+
+    def objective_name(self):
+        return f"{'-' if self.objective_sign < 0 else ''}z"
+
+    def _row_keys(self):
+        types = np.zeros(len(self.bounds))
+        types[list(self.slack_variables.values())] = 1.0
+        types[list(self.surplus_variables.values())] = -1.0
+        # adding 0.0 turns -0.0 into 0.0, so both have the same bytes
+        return np.column_stack((types, self.bounds, self.matrix[:, :self.variables_count])) + 0.0
+
+    def canonical_order(self):
+        keys = self._row_keys()
+        return np.lexsort(keys.T[::-1])
+
+    def fingerprint(self):
+        keys = self._row_keys()
+        digest = hashlib.sha256()
+        digest.update(np.array([self.variables_count, len(self.bounds)]).tobytes())
+        digest.update((self.costs[:self.variables_count] + 0.0).tobytes())
+        digest.update(np.ascontiguousarray(keys[np.lexsort(keys.T[::-1])]).tobytes())
+        return digest.hexdigest()
+
+    def with_artificial_variables(self):
+        rows_with_slack = set(self.slack_variables.values())
+        artificial_rows = [i for i in range(len(self.bounds)) if i not in rows_with_slack]
+        columns_count = self.matrix.shape[1]
+
+        artificial_columns = np.zeros((len(self.bounds), len(artificial_rows)))
+        artificial_columns[artificial_rows, range(len(artificial_rows))] = 1.0
+        matrix = np.hstack((self.matrix, artificial_columns))
+        # the phase one objective: the sum of the artificial variables is minimized, the original costs don't count
+        costs = np.concatenate((np.zeros(columns_count), np.full(len(artificial_rows), -1.0)))
+        names = self.names + [f"R{i}" for i in artificial_rows]
+        artificial_variables = {columns_count + k: i for (k, i) in enumerate(artificial_rows)}
+        return StandardForm(self.name, matrix, self.bounds, costs, self.row_signs, self.objective_sign, self.variables_count, names, self.slack_variables, self.surplus_variables, artificial_variables)
+
+    def with_column(self, name, cost, factors):
+        def shifted(variables):
+            return {c + int(c >= column): r for (c, r) in variables.items()}
+
+        column = self.variables_count
+        matrix = np.insert(self.matrix, column, factors, axis=1)
+        costs = np.insert(self.costs, column, cost)
+        names = self.names[:column] + [name] + self.names[column:]
+        return StandardForm(self.name, matrix, self.bounds, costs, self.row_signs, self.objective_sign, self.variables_count + 1, names, shifted(self.slack_variables), shifted(self.surplus_variables), shifted(self.artificial_variables))
+
+    def with_row(self, factors, bound, sign, slack_name):
+        rows_count, columns_count = self.matrix.shape
+        row = np.zeros(columns_count + 1)
+        row[:len(factors)] = factors
+        row[-1] = 1.0
+        matrix = np.vstack((np.column_stack((self.matrix, np.zeros(rows_count))), row))
+        bounds = np.append(self.bounds, bound)
+        costs = np.append(self.costs, 0.0)
+        row_signs = np.append(self.row_signs, sign)
+        slack_variables = dict(self.slack_variables)
+        slack_variables[columns_count] = rows_count
+        return StandardForm(self.name, matrix, bounds, costs, row_signs, self.objective_sign, self.variables_count, self.names + [slack_name], slack_variables, self.surplus_variables, self.artificial_variables)
+
+    def without_row(self, row, column):
+        def shifted(variables):
+            return {c - int(c > column): r - int(r > row) for (c, r) in variables.items() if c != column}
+
+        matrix = np.delete(np.delete(self.matrix, row, 0), column, 1)
+        names = self.names[:column] + self.names[column + 1:]
+        return StandardForm(self.name, matrix, np.delete(self.bounds, row), np.delete(self.costs, column), np.delete(self.row_signs, row), self.objective_sign, self.variables_count, names, shifted(self.slack_variables), shifted(self.surplus_variables), shifted(self.artificial_variables))
+
+    def normal_model(self):
+        from .model import Model
+        model = Model(self.name)
+        variables = [model.create_variable(name) for name in self.names]
+
+        def expression(factors):
+            columns = np.nonzero(factors)[0]
+            return ex.Expression.from_vectors([variables[c] for c in columns], factors[columns])
+
+        for (row, bound) in zip(self.matrix, self.bounds):
+            model.add_constraint(expression(row) == bound)
+        model.maximize(expression(self.costs))
+        model.objective.factor = self.objective_sign
+        return model
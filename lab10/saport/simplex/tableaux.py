@@ -10,15 +10,20 @@ class Tableaux:
 
         Attributes
         ----------
-        model : Model
-            model corresponding to the tableaux
+        standard_form : StandardForm
+            compiled standard form corresponding to the tableaux (its columns match the table columns)
         table : numpy.Array
             2d-array with the tableaux
+        pivots : int
+            number of the pivots made so far (including those made on the tableaux it has been derived from)
 
         Methods
         -------
-        __init__(model: Model, table: array) -> Tableaux:
-            constructs a new tableaux for the specified model and initial table
+        __init__(standard_form: StandardForm, table: array, pivots: int) -> Tableaux:
+            constructs a new tableaux for the specified standard form and initial table
+        @staticmethod from_basis(standard_form: StandardForm, basis: list[int]) -> Tableaux:
+            rebuilds the tableaux for the given basis (basis[i] is the column basic in the i-th row)
+            by solving the system with the basis matrix instead of repeating the pivots
         cost_factors() -> numpy.Array:
             returns a vector containing factors in the cost row
         cost() -> float:
@@ -37,11 +42,37 @@ class Tableaux:
             returns assignment corresponding to the tableaux
         extract_basis() -> list[int]
             returns list of indexes corresponding to the variables belonging to the basis
+        add_column(column: numpy.Array, index: int = None):
+            inserts a new column (cost factor first) at the given index or just before the bound column, keeping the current basis
+        add_row(row: numpy.Array):
+            appends a new constraint row, the row should already be expressed in terms of the current basis
+        is_feasible() -> bool:
+            checks whether the current basic solution is primal feasible (used by the dual simplex)
+        choose_leaving_row() -> int:
+            finds index of the row, that should leave the basis next in the dual simplex
+        is_unfeasible(row: int) -> bool:
+            checks whether the row proves that the problem is unfeasible (dual simplex)
+        choose_entering_column(row: int) -> int:
+            finds index of the variable, that should enter the basis next in the dual simplex
     """
 
-    def __init__(self, model, table):
-        self.model = model
+    def __init__(self, standard_form, table, pivots = 0):
+        self.standard_form = standard_form
         self.table = table
+        self.pivots = pivots
+
+    @staticmethod
+    def from_basis(standard_form, basis):
+        if len(basis) > 0 and min(basis) < 0:
+            raise Exception("Can't rebuild the tableaux, the basis is incomplete")
+
+        system = np.column_stack((standard_form.matrix, standard_form.bounds))
+        rows = np.linalg.solve(standard_form.matrix[:, basis], system)
+        cost_row = standard_form.costs[basis] @ rows - np.append(standard_form.costs, 0.0)
+        # basic columns have to be exact unit vectors, otherwise extract_basis wouldn't find them
+        rows[:, basis] = np.eye(len(basis))
+        cost_row[basis] = 0.0
+        return Tableaux(standard_form, np.vstack((cost_row, rows)))
 
     def cost_factors(self):
         return self.table[0,:-1] 
@@ -56,36 +87,26 @@ class Tableaux:
         return self.cost_factors().argmin()
 
     def is_unbounded(self, col):
-        return self.table[1:, col].max() <= 0 
+        return self.table[1:, col].max() <= eps
 
     def choose_leaving_variable(self, col):
         column = np.copy(self.table[1:, col])
-        column = np.where(column > 0, column, -1)
+        column = np.where(column > eps, column, -1)
         indicators = self.table[1:, -1] / column
-        quotients = np.where(column > 0, indicators, np.inf)
+        quotients = np.where(column > eps, indicators, np.inf)
         index = len(quotients) - np.argmin(quotients[::-1])
 
         return index
 
     def pivot(self, row, col):
-        rows_n, cols_n = self.table.shape
-        pivot_factor = self.table[row, col]
-
-        new_table = self.table.copy()
-        new_table[row] = self.table[row] / pivot_factor
-
+        pivot_row = self.table[row] / self.table[row, col]
+        # every other row loses its factor in the pivot column times the pivot row (the whole table at once)
+        new_table = self.table - np.outer(self.table[:, col], pivot_row)
+        new_table[row] = pivot_row
         new_table[:, col] = 0.0
         new_table[row, col] = 1.0
-        
-        for r in range(rows_n):
-            if r == row:
-                continue
-            for c in range(cols_n):
-                if c == col:
-                    continue 
-                new_table[r,c] = (-self.table[r, col]) * new_table[row, c] + self.table[r,c]
-
         self.table = new_table
+        self.pivots += 1
 
     def extract_assignment(self):
         rows_n, cols_n = self.table.shape
@@ -93,32 +114,56 @@ class Tableaux:
         basis = self.extract_basis()
         for r in range(1, rows_n):
             var_index = basis[r - 1]
-            assignment[var_index] = self.table[r, -1]
+            # a row of a redundant constraint can be left without a basic variable
+            if var_index >= 0:
+                assignment[var_index] = self.table[r, -1]
         
         return assignment
     
     def extract_basis(self):
-        rows_n, cols_n = self.table.shape
+        rows_n, _ = self.table.shape
         basis = [-1 for _ in range(rows_n -1)]
-        for c in range(cols_n - 1):
-            column = self.table[:,c]
-            belongs_to_basis = column.min() == 0.0 and column.max() == 1.0 and column.sum() == 1.0
-            if belongs_to_basis:
-                row = np.where(column == 1.0)[0][0]
-                # [row-1] because we ignore the cost variable in the basis
-                basis[row-1] = c
+        columns = self.table[:, :-1]
+        # a column without any constraint factors (e.g. of a variable missing in all the constraints) can have 1.0 in the cost row only
+        belongs_to_basis = (columns.min(axis=0) == 0.0) & (columns.max(axis=0) == 1.0) & (columns.sum(axis=0) == 1.0) & (columns[0] == 0.0)
+        basic_columns = np.nonzero(belongs_to_basis)[0]
+        rows = np.argmax(columns[:, basic_columns] == 1.0, axis=0)
+        for (row, c) in zip(rows, basic_columns):
+            # [row-1] because we ignore the cost variable in the basis
+            basis[row-1] = int(c)
         return basis
 
+    def add_column(self, column, index = None):
+        index = self.table.shape[1] - 1 if index is None else index
+        self.table = np.insert(self.table, index, column, axis=1)
+
+    def add_row(self, row):
+        self.table = np.vstack((self.table, row))
+
+    def is_feasible(self):
+        return self.table[1:, -1].min() >= -eps
+
+    def choose_leaving_row(self):
+        return self.table[1:, -1].argmin() + 1
+
+    def is_unfeasible(self, row):
+        return self.table[row, :-1].min() >= -eps
+
+    def choose_entering_column(self, row):
+        row_factors = self.table[row, :-1]
+        quotients = np.where(row_factors < -eps, self.cost_factors() / np.where(row_factors < -eps, -row_factors, 1.0), np.inf)
+        return quotients.argmin()
+
     def __str__(self):
         def cell(x, w):
             return '{0: >{1}}'.format(x, w)
 
-        cost_name = self.model.objective.name()
+        cost_name = self.standard_form.objective_name()
         basis = self.extract_basis()
-        header = ["basis", cost_name] + [var.name for var in self.model.variables] + ["b"]
+        header = ["basis", cost_name] + self.standard_form.names + ["b"]
         longest_col = max([len(h) for h in header])
 
-        rows = [[cost_name]] + [[self.model.variables[i].name] for i in basis]
+        rows = [[cost_name]] + [[self.standard_form.names[i]] for i in basis]
 
         for (i,r) in enumerate(rows):
             cost_factor = 0.0 if i > 0 else 1.0
@@ -0,0 +1,38 @@
+import logging
+from itertools import combinations
+from saport.integer.model import Model
+from saport.simplex.expressions.expression import Expression
+
+N = 6
+WEIGHTS = [3, 1, 4, 1, 5, 9]
+
+def create_model(name):
+    model = Model(name)
+    xs = [model.create_variable(f"x{i}") for i in range(N)]
+    for x in xs:
+        model.add_constraint(x <= 1)
+    model.maximize(Expression.from_vectors(xs, WEIGHTS))
+    return model, xs
+
+def conflict_constraints(xs):
+    return [xs[i] + xs[j] <= 1 for (i, j) in combinations(range(N), 2) if (i * j) % 2 == 0]
+
+def run():
+    full_model, full_xs = create_model("integer_02_full")
+    for constraint in conflict_constraints(full_xs):
+        full_model.add_constraint(constraint)
+    full_solution = full_model.solve()
+
+    lazy_model, lazy_xs = create_model("integer_02_lazy")
+    lazy_model.add_lazy_constraints(lambda assignment: [c for c in conflict_constraints(lazy_xs) if c.is_violated(assignment)][:1])
+    lazy_solution = lazy_model.solve()
+    logging.info(lazy_solution)
+
+    assert lazy_solution.objective_value() == full_solution.objective_value(), "lazy constraints should lead to the same optimum as the full model"
+    assert not any(c.is_violated(lazy_solution.assignment) for c in conflict_constraints(lazy_xs)), "the solution violates one of the lazy constraints"
+
+    logging.info("Congratulations! The lazy constraints work in the branch and bound :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,46 @@
+import logging
+import random
+from concurrent.futures import ThreadPoolExecutor
+from saport.integer.model import Model
+from saport.integer import solver as ips
+from saport.simplex import solver as lps
+from saport.simplex.expressions.expression import Expression
+
+SOLVES = 300
+THREADS = 16
+
+def create_model(seed):
+    generator = random.Random(seed)
+    model = Model(f"integer_03_{seed}")
+    xs = [model.create_variable(f"x{i}") for i in range(4)]
+    weights = [generator.randint(1, 9) for _ in xs]
+    values = [generator.randint(1, 9) for _ in xs]
+    model.add_constraint(Expression.from_vectors(xs, weights) <= generator.randint(5, 20))
+    for x in xs:
+        model.add_constraint(x <= 2)
+    model.maximize(Expression.from_vectors(xs, values))
+    return model.translate_to_standard_form()
+
+def run():
+    models = [create_model(seed) for seed in range(SOLVES)]
+    expected = [(lps.Solver().solve(m).objective_value(), ips.Solver().solve(m, float('inf')).objective_value()) for m in models]
+
+    # the same two solver instances are shared by all the threads
+    lp_solver = lps.Solver()
+    ip_solver = ips.Solver()
+    def solve(model):
+        return (lp_solver.solve(model).objective_value(), ip_solver.solve(model, float('inf')).objective_value(), ip_solver.interrupted)
+
+    with ThreadPoolExecutor(max_workers = THREADS) as executor:
+        results = list(executor.map(solve, models))
+
+    for (i, ((lp_value, ip_value, interrupted), (expected_lp, expected_ip))) in enumerate(zip(results, expected)):
+        assert abs(lp_value - expected_lp) < 0.0001, f"Concurrent relaxation {i} has objective {lp_value} instead of {expected_lp}"
+        assert abs(ip_value - expected_ip) < 0.0001, f"Concurrent integer solve {i} has objective {ip_value} instead of {expected_ip}"
+        assert not interrupted, f"Concurrent integer solve {i} shouldn't be interrupted"
+
+    logging.info("Congratulations! The solvers seem to be safe to share between threads :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
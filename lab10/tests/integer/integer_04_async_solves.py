@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import time
+from saport.pool import SolverPool
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.dfs import DFSSolver
+from saport.simplex.model import Model as LinearModel
+from saport.simplex.expressions.expression import Expression
+from tests.integer.integer_03_concurrent_solves import create_model
+
+MODELS = 8
+KNAPSACK_PROBLEM = os.path.join(os.path.dirname(__file__), '..', 'knapsack', 'knapsack_problems', 'ks_100_0')
+
+def klee_minty(n):
+    # the simplex with the Dantzig's rule visits all the 2^n vertices of the Klee-Minty cube
+    model = LinearModel("klee_minty")
+    variables = [model.create_variable(f"x{i}") for i in range(n)]
+    for i in range(n):
+        model.add_constraint(Expression.from_vectors(variables[:i + 1], [2 ** (i - j + 1) for j in range(i)] + [1]) <= 5 ** (i + 1))
+    model.maximize(Expression.from_vectors(variables, [2 ** (n - j - 1) for j in range(n)]))
+    return model
+
+async def solve_all(models, pool):
+    ticks = []
+    solving = True
+    async def tick():
+        while solving:
+            ticks.append(time.time())
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    solutions = await asyncio.gather(*[m.solve_async(float('inf'), pool = pool) for m in models])
+    solving = False
+    await ticker
+    longest_pause = max(b - a for (a, b) in zip(ticks, ticks[1:]))
+    return solutions, longest_pause
+
+async def cancel_long_solve(pool):
+    # dfs over 100 items with a huge timelimit would run for ages without the cancellation
+    solver = DFSSolver(Problem.from_path(KNAPSACK_PROBLEM), 3600)
+    task = asyncio.create_task(solver.solve_async(pool))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+        raise AssertionError("Cancelled solve should raise CancelledError")
+    except asyncio.CancelledError:
+        pass
+
+    start = time.time()
+    solution = await create_model(0).solve_async(float('inf'), pool = pool)
+    return solution, time.time() - start
+
+async def cancel_long_lp(pool):
+    # millions of pivots, the linear solve has no timelimit, so only the cancellation can stop it
+    task = asyncio.create_task(klee_minty(22).solve_async(pool = pool))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    start = time.time()
+    solution = await klee_minty(5).solve_async(pool = pool)
+    return solution, time.time() - start
+
+async def cancel_and_leave(pool):
+    # the loop is closed right after the cancellation, while the worker is still busy with the problem
+    solver = DFSSolver(Problem.from_path(KNAPSACK_PROBLEM), 3600)
+    task = asyncio.create_task(solver.solve_async(pool))
+    await asyncio.sleep(0.5)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+async def solve_in_new_loop(pool):
+    return await asyncio.wait_for(create_model(0).solve_async(float('inf'), pool = pool), 30)
+
+def run():
+    models = [create_model(seed) for seed in range(MODELS)]
+    expected = [m.solve().objective_value() for m in models]
+
+    pool = SolverPool(max_workers = 2)
+    try:
+        solutions, longest_pause = asyncio.run(solve_all(models, pool))
+        for (i, (solution, value)) in enumerate(zip(solutions, expected)):
+            assert abs(solution.objective_value() - value) < 0.0001, f"Async solve {i} has objective {solution.objective_value()} instead of {value}"
+        assert longest_pause < 0.5, f"Event loop has been blocked for {longest_pause:.2f}s"
+    finally:
+        pool.shutdown()
+
+    pool = SolverPool(max_workers = 1)
+    try:
+        solution, waiting_time = asyncio.run(cancel_long_solve(pool))
+        assert abs(solution.objective_value() - expected[0]) < 0.0001, "Solve after the cancellation should find the correct solution"
+        assert waiting_time < 10, f"Cancelled solve should release the worker, but the next solve waited {waiting_time:.2f}s"
+    finally:
+        pool.shutdown()
+
+    pool = SolverPool(max_workers = 1)
+    try:
+        solution, waiting_time = asyncio.run(cancel_long_lp(pool))
+        assert abs(solution.objective_value() - 5 ** 5) < 0.0001, "Linear solve after the cancellation should find the correct solution"
+        assert waiting_time < 10, f"Cancelled linear solve should release the worker, but the next solve waited {waiting_time:.2f}s"
+    finally:
+        pool.shutdown()
+
+    pool = SolverPool(max_workers = 1, max_concurrency = 1)
+    try:
+        asyncio.run(cancel_and_leave(pool))
+        try:
+            solution = asyncio.run(solve_in_new_loop(pool))
+        except asyncio.TimeoutError:
+            raise AssertionError("Slot of a task cancelled in a closed event loop should be released")
+        assert abs(solution.objective_value() - expected[0]) < 0.0001, "Solve in a new event loop should find the correct solution"
+    finally:
+        pool.shutdown()
+
+    logging.info("Congratulations! The async solves seem to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
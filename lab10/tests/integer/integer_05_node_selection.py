@@ -0,0 +1,61 @@
+import logging
+import inspect
+import sys
+import numpy as np
+from saport.integer.model import Model
+from saport.integer.nodes import NodeSelection
+from saport.simplex.expressions.expression import Expression
+from saport.integer.options import Options
+
+def create_model(seed = 0, size = 8):
+    generator = np.random.default_rng(seed)
+    model = Model(f"integer_05_random_{seed}")
+    xs = [model.create_variable(f"x{i}") for i in range(size)]
+    for _ in range(3):
+        model.add_constraint(Expression.from_vectors(xs, generator.integers(1, 10, size)) <= int(generator.integers(20, 40)))
+    model.maximize(Expression.from_vectors(xs, generator.integers(1, 10, size)))
+    return model
+
+def create_deep_model(size):
+    # every variable is fractional in the relaxation, so the first dive goes through all of them
+    model = Model("integer_05_deep")
+    xs = [model.create_variable(f"x{i}") for i in range(size)]
+    for x in xs:
+        model.add_constraint(2 * x <= 3)
+    model.maximize(Expression.from_vectors(xs, [1 for _ in xs]))
+    return model
+
+def run():
+    for seed in range(3):
+        model = create_model(seed)
+        objectives = {}
+        for selection in NodeSelection:
+            solution = model.solve(options = Options(selection = selection))
+            objectives[selection] = solution.objective_value()
+            context = model.solver.context
+            logging.info(f"{model.name}, {selection.value}: {solution.objective_value()} after {context.nodes} nodes")
+            assert context.upper_bound == context.lower_bound, "Global bound of the finished solve should be equal to the best objective"
+            assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Solution should satisfy all the constraints"
+        assert len(set(objectives.values())) == 1, f"All the node selection strategies should find the same optimum, found {objectives}"
+
+    model = create_model(3, 12)
+    model.solve(timelimit = 0)
+    context = model.solver.context
+    assert model.solver.interrupted and context.upper_bound >= context.lower_bound, "Interrupted solve should report the global bound"
+    assert context.upper_bound >= model.solve().objective_value(), "Global bound should never be below the optimum"
+
+    size = 120
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + size // 2)
+    try:
+        solution = create_deep_model(size).solve(options = Options(selection = NodeSelection.DEPTH_FIRST))
+    finally:
+        sys.setrecursionlimit(limit)
+    assert solution.objective_value() == size, "Deep tree should be explored without the recursion"
+
+    logging.info("Congratulations! The node selection strategies seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,44 @@
+import logging
+import time
+import numpy as np
+from saport.integer.model import Model
+from saport.simplex.expressions.expression import Expression
+from saport.integer.options import Options
+
+ITEMS = 25
+
+def binary_model(seed, items, constraints = 3, capacities = (100, 200)):
+    # a 0-1 knapsack with a few capacity constraints, shared by the branch and bound tests
+    generator = np.random.default_rng(seed)
+    model = Model(f"integer_binary_{items}_{seed}")
+    xs = [model.create_variable(f"x{i}") for i in range(items)]
+    for x in xs:
+        model.add_constraint(x <= 1)
+    for _ in range(constraints):
+        model.add_constraint(Expression.from_vectors(xs, generator.integers(5, 30, items)) <= int(generator.integers(*capacities)))
+    model.maximize(Expression.from_vectors(xs, generator.integers(5, 30, items)))
+    return model
+
+def run():
+    for seed in range(3):
+        model = binary_model(seed, ITEMS)
+        results = {}
+        for warm_start in [True, False]:
+            start = time.time()
+            solution = model.solve(options = Options(warm_start = warm_start))
+            elapsed = time.time() - start
+            context = model.solver.context
+            assert len(context.node_pivots) == context.nodes, "Every explored node should record its pivots"
+            results[warm_start] = (solution.objective_value(), np.mean(context.node_pivots))
+            logging.info(f"{model.name}, {'warm' if warm_start else 'cold'} start: {solution.objective_value()}, "
+                         f"{context.nodes} nodes, {context.nodes / elapsed:.0f} nodes/s, {np.mean(context.node_pivots):.1f} pivots per node")
+
+        assert results[True][0] == results[False][0], "Warm start shouldn't change the optimum"
+        assert results[True][1] < results[False][1] / 2, "Warm started nodes should need much fewer pivots"
+
+    logging.info("Congratulations! The child nodes are warm started :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
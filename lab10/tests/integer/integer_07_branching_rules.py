@@ -0,0 +1,26 @@
+import logging
+from saport.integer.branching import LastFractional, MostFractional, PseudoCostBranching, StrongBranching, ReliabilityBranching
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    rules = [LastFractional(), MostFractional(), PseudoCostBranching(), StrongBranching(), ReliabilityBranching()]
+    for seed in range(2):
+        model = binary_model(seed, 30, 4)
+        results = {}
+        for rule in rules:
+            solution = model.solve(options = Options(branching = rule))
+            results[rule.name()] = (solution.objective_value(), model.solver.context.nodes)
+            logging.info(f"{model.name}, {rule.name()} branching: {solution.objective_value()}, "
+                         f"{model.solver.context.nodes} nodes in {model.solver.total_time:.3f}s")
+            assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Solution should satisfy all the constraints"
+
+        assert len(set(objective for (objective, _) in results.values())) == 1, f"All the branching rules should find the same optimum, found {results}"
+        assert results["strong"][1] < results["last fractional"][1], "Strong branching should explore a smaller tree than the arbitrary choice"
+
+    logging.info("Congratulations! The branching rules seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
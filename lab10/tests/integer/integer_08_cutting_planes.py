@@ -0,0 +1,45 @@
+import logging
+import numpy as np
+from saport.integer.model import Model
+from saport.integer.cuts import CuttingPlanes, CutMode, CutPool, Cut
+from saport.simplex.expressions.expression import Expression
+from saport.integer.options import Options
+
+VARIABLES = 8
+
+def create_model(seed = 0):
+    generator = np.random.default_rng(seed)
+    model = Model(f"integer_08_random_{seed}")
+    xs = [model.create_variable(f"x{i}") for i in range(VARIABLES)]
+    for _ in range(4):
+        model.add_constraint(Expression.from_vectors(xs, generator.integers(1, 20, VARIABLES)) <= int(generator.integers(30, 90)))
+    model.maximize(Expression.from_vectors(xs, generator.integers(5, 30, VARIABLES)))
+    return model
+
+def run():
+    for seed in range(4):
+        model = create_model(seed)
+        results = {}
+        for cuts in [None, CuttingPlanes(CutMode.ROOT), CuttingPlanes(CutMode.EVERY_NODE)]:
+            name = 'no cuts' if cuts is None else f'{cuts.mode.value} cuts'
+            solution = model.solve(options = Options(cuts = cuts))
+            context = model.solver.context
+            results[name] = (solution.objective_value(), context.nodes)
+            logging.info(f"{model.name}, {name}: {solution.objective_value()}, {context.nodes} nodes, {context.cuts} cuts added")
+            assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Solution should satisfy all the constraints"
+        assert len(set(objective for (objective, _) in results.values())) == 1, f"Cuts shouldn't change the optimum, found {results}"
+        assert results['every-node cuts'][1] <= results['no cuts'][1], "Cuts should make the tree smaller"
+
+    pool = CutPool(max_size = 2, max_age = 1)
+    assert pool.add(Cut(np.array([1.0, 2.0]), 3.0)), "New cut should be added to the pool"
+    assert not pool.add(Cut(np.array([2.0, 4.0]), 6.0)), "Scaled duplicate shouldn't be added to the pool"
+    pool.separate(np.array([5.0, 5.0]), 0.0001)
+    pool.separate(np.array([5.0, 5.0]), 0.0001)
+    assert len(pool) == 0, "Cuts which are never violated should age out of the pool"
+
+    logging.info("Congratulations! The cutting planes seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
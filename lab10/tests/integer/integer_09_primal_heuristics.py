@@ -0,0 +1,31 @@
+import logging
+from saport.integer.nodes import NodeSelection
+from saport.integer.heuristics import default_heuristics
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    for seed in range(2):
+        model = binary_model(seed, 30, 4)
+        expected = model.solve(options = Options(selection = NodeSelection.DEPTH_FIRST))
+        plain_nodes = model.solver.context.nodes
+        solution = model.solve(options = Options(selection = NodeSelection.DEPTH_FIRST, heuristics = default_heuristics()))
+        context = model.solver.context
+        logging.info(f"{model.name}: {solution.objective_value()}, {context.nodes} nodes with the heuristics, {plain_nodes} without, "
+                     f"incumbents: {', '.join(f'{objective} ({source})' for (_, objective, source) in context.incumbents)}")
+        assert solution.objective_value() == expected.objective_value(), "Heuristics shouldn't change the optimum"
+        assert context.incumbents[0][2] != "relaxation", "The first incumbent should be found by a heuristic"
+        assert context.nodes < plain_nodes, "Early incumbents should prune the tree"
+
+        solution = model.solve(timelimit = 0, options = Options(heuristics = default_heuristics()))
+        assert model.solver.interrupted and solution is not None, "Heuristics should find a solution before the timeout"
+        assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Heuristic solution should satisfy all the constraints"
+        assert all(v == round(v) for v in solution.assignment), "Heuristic solution should be integer"
+        assert solution.standard_form is not None and solution.standard_form.variables_count == len(model.variables), "Heuristic solution should have the standard form of the model"
+
+    logging.info("Congratulations! The primal heuristics seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,43 @@
+import logging
+from saport.integer.heuristics import default_heuristics
+from saport.integer.cuts import CuttingPlanes, CutMode
+from saport.integer.limits import Limits
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    for seed in range(2):
+        model = binary_model(seed, 30, 4)
+        expected = model.solve()
+        for workers in [2, 3]:
+            solution = model.solve(options = Options(workers = workers))
+            context = model.solver.context
+            logging.info(f"{model.name}, {workers} workers: {solution.objective_value()} (serial: {expected.objective_value()}), {context.nodes} nodes")
+            assert solution.objective_value() == expected.objective_value(), "Parallel solver should find the same optimum as the serial one"
+            assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Solution should satisfy all the constraints"
+            assert context.upper_bound == context.lower_bound, "Finished parallel solve should close the gap"
+            assert solution.standard_form is not None, "Solutions of the workers should have the standard form of the model"
+
+    # a single node per worker, so the idle workers have to steal the nodes of the busy ones
+    model = binary_model(3, 30, 4)
+    solution = model.solve(options = Options(workers = 3, ramp_up = 1))
+    assert solution.objective_value() == model.solve().objective_value(), "Parallel solver should find the optimum with the work stealing"
+
+    model = binary_model(2, 30, 4)
+    solution = model.solve(options = Options(workers = 2, heuristics = default_heuristics()))
+    assert solution.objective_value() == model.solve().objective_value(), "Parallel solver should work with the heuristics"
+
+    # with a single node per worker the coordinator explores only the root, the workers can add only the pooled root cuts
+    model = binary_model(0, 30, 4)
+    model.solve(options = Options(cuts = CuttingPlanes(CutMode.ROOT), limits = Limits(nodes = 1)))
+    root_cuts = model.solver.context.cuts
+    solution = model.solve(options = Options(workers = 2, ramp_up = 1, cuts = CuttingPlanes(CutMode.ROOT)))
+    assert model.solver.context.cuts > root_cuts, "Workers should add the violated root cuts to their relaxations"
+    assert solution.objective_value() == model.solve().objective_value(), "Parallel solver should find the optimum with the cutting planes"
+
+    logging.info("Congratulations! The parallel branch and bound seems to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,53 @@
+import logging
+from saport.integer.limits import Limits
+from saport.integer import solver as ips
+from saport.integer.nodes import NodeSelection
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    model = binary_model(0, 40, 3, (150, 250))
+    reports = []
+    optimum = model.solve(options = Options(progress = reports.append)).objective_value()
+    context = model.solver.context
+    full_nodes = context.nodes
+    assert not context.interrupted and context.stop_reason is None, "Full solve shouldn't be interrupted"
+    assert len(reports) > 0 and reports[-1].gap == 0.0 and reports[-1].nodes == full_nodes, "Full solve should end with a report of the closed gap"
+    assert reports[-1].incumbent == optimum and reports[-1].open_nodes == 0, "Final report should show the optimum without open nodes"
+
+    for gap in [0.005, 0.02]:
+        solution = model.solve(options = Options(limits = Limits(relative_gap = gap)))
+        context = model.solver.context
+        logging.info(f"{model.name}, relative gap {gap}: {solution.objective_value()} (optimum: {optimum}) after {context.nodes} of {full_nodes} nodes, gap {context.gap():.4f}")
+        assert context.gap() <= gap, "Solve should stop only when the gap limit is reached"
+        assert context.upper_bound >= optimum >= solution.objective_value(), "Global bound should never be below the optimum"
+        assert optimum - solution.objective_value() <= gap * abs(solution.objective_value()) + 1e-9, "Solution should be within the gap from the optimum"
+        assert context.nodes <= full_nodes, "Gap limit shouldn't explore more nodes than the full solve"
+        assert context.stop_reason in (None, "gap"), "Solve should be stopped by the gap limit"
+
+    solution = model.solve(options = Options(limits = Limits(absolute_gap = 10)))
+    context = model.solver.context
+    assert context.upper_bound - context.lower_bound <= 10 and optimum - solution.objective_value() <= 10, "Solution should be within the absolute gap from the optimum"
+
+    solution = model.solve(options = Options(limits = Limits(nodes = 10)))
+    context = model.solver.context
+    assert context.nodes == 10 and context.interrupted and context.stop_reason == "nodes", "Solve should stop after the node limit"
+    assert context.upper_bound >= optimum, "Global bound of the interrupted solve should never be below the optimum"
+
+    reports = []
+    solver = ips.Solver(options = Options(selection = NodeSelection.DEPTH_FIRST, progress = reports.append, progress_interval = 0.0))
+    solver.solve(model.translate_to_standard_form(), float('inf'))
+    assert len(reports) > full_nodes // 2, "Progress should be reported before every node with the zero interval"
+    assert all(a.nodes <= b.nodes and a.bound >= b.bound for (a, b) in zip(reports, reports[1:])), "Explored nodes should grow and the bound should fall"
+    logging.info(f"last report: {reports[-1]}")
+
+    solution = model.solve(options = Options(workers = 2, limits = Limits(relative_gap = 0.02)))
+    context = model.solver.context
+    assert context.upper_bound >= optimum and optimum - solution.objective_value() <= 0.02 * abs(solution.objective_value()) + 1e-9, "Parallel solve should respect the gap limit"
+
+    logging.info("Congratulations! The limits and the progress reporting seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,64 @@
+import logging
+import numpy as np
+from saport.integer.model import Model
+from saport.integer.nodes import Node, NodeSelection
+from saport.integer.presolve import Domains, NodePresolve
+from saport.integer.heuristics import SimpleRounding
+from saport.simplex.expressions.constraint import ConstraintType
+from saport.simplex.expressions.expression import Expression
+from saport.integer.options import Options
+
+VARIABLES = 10
+
+def create_model(seed = 0):
+    # bounded general integers with a few covering and packing constraints
+    generator = np.random.default_rng(seed)
+    model = Model(f"integer_12_random_{seed}")
+    xs = [model.create_variable(f"x{i}") for i in range(VARIABLES)]
+    for x in xs:
+        model.add_constraint(x <= int(generator.integers(1, 4)))
+    for _ in range(3):
+        model.add_constraint(Expression.from_vectors(xs, generator.integers(1, 15, VARIABLES)) <= int(generator.integers(30, 60)))
+    model.add_constraint(Expression.from_vectors(xs, generator.integers(0, 5, VARIABLES)) >= int(generator.integers(5, 15)))
+    model.maximize(Expression.from_vectors(xs, generator.integers(5, 30, VARIABLES)))
+    return model
+
+def run():
+    totals = {'off': 0, 'on': 0}
+    for seed in range(1, 5):
+        model = create_model(seed)
+        expected = model.solve()
+        totals['off'] += model.solver.context.nodes
+        for selection in [NodeSelection.BEST_BOUND, NodeSelection.DEPTH_FIRST]:
+            solution = model.solve(options = Options(selection = selection, presolve = NodePresolve(), heuristics = [SimpleRounding()]))
+            context = model.solver.context
+            logging.info(f"{model.name}, {selection.value}: {solution.objective_value()}, {context.nodes} nodes, {context.presolved} pruned by the propagation, {context.fixings} bounds tightened")
+            assert solution.objective_value() == expected.objective_value(), "Presolve shouldn't change the optimum"
+            assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Solution should satisfy all the constraints"
+        totals['on'] += context.nodes
+    assert totals['on'] < totals['off'], f"Presolve should make the trees smaller, explored {totals}"
+
+    # 2x + 3y <= 12 with x >= 3 leaves y <= 2, and x >= 5 can't be satisfied at all
+    model = Model("integer_12_propagation")
+    (x, y) = (model.create_variable("x"), model.create_variable("y"))
+    model.add_constraint(2 * x + 3 * y <= 12)
+    model.add_constraint(y <= 5)
+    model.maximize(x + y)
+    presolve = NodePresolve()
+    domains = Domains(model)
+    assert domains.upper[y.index] == 5 and domains.matrix.shape == (1, 2), "Single variable constraints should become the bounds"
+    context = type('Context', (), {'domains': domains, 'lower_bound': float('-inf')})()
+    implied = presolve.propagate(context, Node(((x.index, ConstraintType.GE, 3),), 1))
+    assert (y.index, ConstraintType.LE, 2) in implied, f"Propagation should bound y, found {implied}"
+    assert presolve.propagate(context, Node(((x.index, ConstraintType.GE, 7),), 1)) is None, "Unfeasible node should be detected without the relaxation"
+
+    model.add_constraint(x + y >= 10)
+    solution = model.solve(options = Options(presolve = presolve))
+    assert solution.assignment is None, "Unfeasible model should stay unfeasible with the presolve"
+
+    logging.info("Congratulations! The node presolve seems to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
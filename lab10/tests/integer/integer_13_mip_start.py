@@ -0,0 +1,48 @@
+import logging
+from saport.integer.nodes import NodeSelection
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    for seed in range(3):
+        model = binary_model(seed, 25)
+        optimum = model.solve(options = Options(selection = NodeSelection.DEPTH_FIRST))
+        cold_nodes = model.solver.context.nodes
+
+        solution = model.solve(options = Options(selection = NodeSelection.DEPTH_FIRST), start = [optimum.assignment])
+        context = model.solver.context
+        logging.info(f"{model.name}: {solution.objective_value()} after {context.nodes} nodes with the optimal start, {cold_nodes} without it")
+        assert solution.objective_value() == optimum.objective_value(), "Start shouldn't change the optimum"
+        assert context.incumbents[0][2] == "start" and context.incumbents[0][1] == optimum.objective_value(), "Start should be the first incumbent"
+        assert context.nodes <= cold_nodes, "Known optimum should prune the tree from the first node"
+        assert solution.standard_form is not None and solution.standard_form.variables_count == len(model.variables), "Start should have the standard form of the model"
+
+    model = binary_model(0, 25)
+    optimum = model.solve()
+    empty = [0.0 for _ in model.variables]
+    overfull = [1.0 for _ in model.variables]
+    fractional = [0.5 for _ in model.variables]
+    model.solve(start = [overfull, fractional, empty])
+    sources = [(objective, source) for (_, objective, source) in model.solver.context.incumbents if source == "start"]
+    assert sources == [(0.0, "start")], f"Only the feasible start should become the incumbent, found {sources}"
+
+    # the partial start is completed by the restricted relaxation
+    xs = model.variables
+    partial = {xs[0]: 1, xs[1]: 0, "x2": 1}
+    solution = model.solve(start = [partial])
+    context = model.solver.context
+    assert context.incumbents[0][2] == "start", "Partial start should be completed and installed"
+    assert solution.objective_value() == optimum.objective_value(), "Partial start shouldn't change the optimum"
+
+    try:
+        model.solve(start = [[1.0, 0.0]])
+        assert False, "Start with a wrong number of values should be rejected"
+    except Exception as e:
+        assert "values" in str(e), f"Unexpected error: {e}"
+
+    logging.info("Congratulations! The initial solutions seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,53 @@
+import logging
+import os
+import tempfile
+import numpy as np
+from saport.integer.limits import Limits
+from saport.integer.branching import PseudoCostBranching
+from saport.integer.checkpoint import Checkpoint
+from saport.integer.cuts import CuttingPlanes
+from saport.integer.options import Options
+from tests.integer.integer_06_warm_start import binary_model
+
+def run():
+    model = binary_model(0, 30)
+    options = Options(branching = PseudoCostBranching(), cuts = CuttingPlanes())
+    optimum = model.solve(options = options)
+    full_nodes = model.solver.context.nodes
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'solve.checkpoint')
+        model.solve(options = Options(branching = options.branching, cuts = options.cuts, limits = Limits(nodes = 20), checkpoint = path, checkpoint_interval = 0.0))
+        context = model.solver.context
+        assert context.interrupted and os.path.exists(path), "Interrupted solve should leave its checkpoint"
+        assert not os.path.exists(f"{path}.tmp"), "Checkpoint should be written completely"
+
+        checkpoint = Checkpoint.load(path)
+        assert len(checkpoint.nodes) == len(context.queue) and checkpoint.explored == context.nodes, "Checkpoint should store all the open nodes"
+        assert set(n.bounds for n in checkpoint.nodes) == set(n.bounds for n in context.queue.nodes()), "Checkpoint should store the bounds of the nodes"
+        assert checkpoint.assignment == (context.best_solution.assignment if context.best_solution is not None else None), "Checkpoint should store the incumbent"
+        assert np.array_equal(checkpoint.pseudo_costs.state(), context.pseudo_costs.state()), "Checkpoint should store the pseudo costs"
+        assert len(checkpoint.cuts) == len(context.cut_pool), "Checkpoint should store the cut pool"
+
+        solution = model.solve(options = Options(branching = options.branching, cuts = options.cuts, checkpoint = path), resume = path)
+        context = model.solver.context
+        logging.info(f"{model.name}: {solution.objective_value()} after {context.nodes} nodes with the resume, {full_nodes} without it")
+        assert solution.objective_value() == optimum.objective_value(), "Resumed solve should find the optimum"
+        assert not context.interrupted and len(Checkpoint.load(path).nodes) == 0, "Finished solve should leave a checkpoint without the open nodes"
+
+        solution = model.solve(options = options, resume = path)
+        assert solution.objective_value() == optimum.objective_value() and model.solver.context.incumbents[0][2] == "checkpoint", "Finished checkpoint should resume with its incumbent"
+        assert solution.standard_form is not None, "Resumed incumbent should have the standard form of the model"
+
+        try:
+            binary_model(0, 29).solve(resume = path)
+            assert False, "Checkpoint of another model shouldn't be resumed"
+        except Exception as e:
+            assert "variables" in str(e), f"Unexpected error: {e}"
+
+    logging.info("Congratulations! The checkpoints seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
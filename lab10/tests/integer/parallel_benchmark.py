@@ -0,0 +1,39 @@
+from saport.integer.model import Model
+from saport.simplex.expressions.expression import Expression
+from saport.integer.options import Options
+import numpy as np
+import time
+
+# manipulate following parameters to customize the benchmark
+ITEMS = 40
+CONSTRAINTS = 5
+WORKERS = [1, 2, 4, 8, 16]
+
+def create_model(seed = 0):
+    generator = np.random.default_rng(seed)
+    model = Model("parallel_benchmark")
+    xs = [model.create_variable(f"x{i}") for i in range(ITEMS)]
+    for x in xs:
+        model.add_constraint(x <= 1)
+    for _ in range(CONSTRAINTS):
+        model.add_constraint(Expression.from_vectors(xs, generator.integers(5, 30, ITEMS)) <= int(generator.integers(100, 200)))
+    model.maximize(Expression.from_vectors(xs, generator.integers(5, 30, ITEMS)))
+    return model
+
+def run():
+    model = create_model()
+    start = time.time()
+    expected = model.solve()
+    serial_time = time.time() - start
+    print(f"* serial: {expected.objective_value()}, {model.solver.context.nodes} nodes, {serial_time:.2f}s")
+
+    for workers in WORKERS:
+        start = time.time()
+        solution = model.solve(options = Options(workers = workers))
+        elapsed = time.time() - start
+        matches = "matches" if solution.objective_value() == expected.objective_value() else "DOESN'T MATCH"
+        print(f"* {workers} workers: {solution.objective_value()} ({matches} the serial one), {model.solver.context.nodes} nodes, "
+              f"{elapsed:.2f}s, speed-up {serial_time / elapsed:.2f}x")
+
+if __name__ == '__main__':
+    run()
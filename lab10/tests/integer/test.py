@@ -0,0 +1,21 @@
+import importlib
+import os
+test_modules = ['integer_01_solvable', 'integer_02_lazy_constraints', 'integer_03_concurrent_solves', 'integer_04_async_solves', 'integer_05_node_selection', 'integer_06_warm_start', 'integer_07_branching_rules', 'integer_08_cutting_planes', 'integer_09_primal_heuristics', 'integer_10_parallel', 'integer_11_limits', 'integer_12_node_presolve', 'integer_13_mip_start', 'integer_14_checkpoints']
+test_dir = 'tests.integer'
+print("Running tests...")
+success = True
+for test_module in test_modules:
+    test = importlib.import_module(f"{test_dir}.{test_module}")
+    try:
+        test.run()
+        print(f'- test "{test_module}":\t PASSED')
+    except Exception as e:
+        success = False
+        print(f'- test "{test_module}":\t FAILED (message: {e})')
+
+if success:
+    print("Congratulations, your integer programming tools seem to work correctly!")
+else:
+    print("Some of the tests failed. Fix your implementation ASAP :)")
+
+    
\ No newline at end of file
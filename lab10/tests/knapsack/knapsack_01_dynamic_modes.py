@@ -0,0 +1,26 @@
+import logging
+import os
+from saport.knapsack.model import Problem
+from saport.knapsack.solvers.dynamic import DynamicSolver
+
+PROBLEMS_DIR = os.path.join(os.path.dirname(__file__), 'knapsack_problems')
+# the full table is filled cell by cell, so only the problems with small capacities are compared
+PROBLEMS = ['ks_lecture_dp_1', 'ks_lecture_dp_2', 'ks_4_0', 'ks_19_0', 'ks_45_0', 'ks_50_1', 'ks_100_2']
+
+def run():
+    for name in PROBLEMS:
+        problem = Problem.from_path(os.path.join(PROBLEMS_DIR, name))
+        table = DynamicSolver(problem, float('inf'), rolling = False).solve()
+        rolling = DynamicSolver(problem, float('inf')).solve()
+        logging.info(f"{name}: {rolling.value} (table: {table.value})")
+        assert table.optimal and rolling.optimal, f"Both modes should solve {name} to optimality"
+        assert rolling.value == table.value, f"Rolling mode found value {rolling.value} of {name} instead of {table.value}"
+        assert sorted(item.index for item in rolling.items) == sorted(item.index for item in table.items), f"Rolling mode took other items of {name} than the table mode"
+        assert sum(item.weight for item in rolling.items) <= problem.capacity, f"Rolling mode exceeded the capacity of {name}"
+
+    logging.info("Congratulations! Both modes of the dynamic solver agree :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
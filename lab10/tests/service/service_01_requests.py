@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import time
+import os
+import tempfile
+from saport.service.server import SolveServer
+from saport.service.client import Client, load_test
+
+TESTS_DIR = os.path.join(os.path.dirname(__file__), '..')
+ASSIGNMENT_DIR = os.path.join(TESTS_DIR, '..', 'assignment_tests')
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+async def check_requests(client):
+    mps = await client.solve({'type': 'simplex', 'format': 'mps', 'data': read(os.path.join(TESTS_DIR, 'simplex', 'models', 'example_10.mps'))})
+    assert mps['status'] == 'ok' and abs(mps['result']['objective'] - 26.0) < 0.0001, f"MPS model should be solved with objective 26, got {mps}"
+
+    lp = await client.solve({'type': 'simplex', 'data': {
+        'objective': {'sense': 'max', 'factors': [5, 8]},
+        'constraints': [{'factors': [1, 1], 'type': '<=', 'bound': 6}, {'factors': [5, 9], 'type': '<=', 'bound': 45}]
+    }})
+    assert lp['status'] == 'ok' and abs(lp['result']['objective'] - 41.25) < 0.0001, f"JSON linear model should be solved with objective 41.25, got {lp}"
+
+    ip = await client.solve({'type': 'simplex', 'integer': True, 'data': {
+        'objective': {'sense': 'max', 'factors': [5, 8]},
+        'constraints': [{'factors': [1, 1], 'type': '<=', 'bound': 6}, {'factors': [5, 9], 'type': '<=', 'bound': 45}]
+    }})
+    assert ip['status'] == 'ok' and abs(ip['result']['objective'] - 40.0) < 0.0001, f"JSON integer model should be solved with objective 40, got {ip}"
+
+    knapsack = await client.solve({'type': 'knapsack', 'solver': 'dynamic', 'data': {'capacity': 10, 'items': [[10, 5], [40, 4], [30, 6], [50, 3]]}})
+    assert knapsack['status'] == 'ok' and knapsack['result']['value'] == 90, f"Knapsack should be solved with value 90, got {knapsack}"
+
+    maxflow = await client.solve({'type': 'maxflow', 'format': 'text', 'data': read(os.path.join(TESTS_DIR, 'maxflow', 'networks', '04_05_ahuja.dnf'))})
+    expected = await client.solve({'type': 'maxflow', 'format': 'text', 'solver': 'networkx', 'data': read(os.path.join(TESTS_DIR, 'maxflow', 'networks', '04_05_ahuja.dnf'))})
+    assert maxflow['status'] == 'ok' and maxflow['result'] == expected['result'], f"Max flow should be the same as found by networkx, got {maxflow} and {expected}"
+
+    assignment = await client.solve({'type': 'assignment', 'format': 'text', 'data': read(os.path.join(ASSIGNMENT_DIR, 'square_min_04_22.txt'))})
+    assert assignment['status'] == 'ok' and assignment['result']['objective'] == 22, f"Assignment should have cost 22, got {assignment}"
+
+    game = await client.solve({'type': 'game', 'format': 'text', 'solver': 'pure', 'data': read(os.path.join(TESTS_DIR, 'minimax', 'games', '4_5_pure.txt'))})
+    assert game['status'] == 'ok' and abs(game['result']['equilibria'][0]['value'] - 1.0) < 0.0001, f"Game should have value 1, got {game}"
+
+    broken = await client.solve({'type': 'knapsack', 'data': {'capacity': 10}})
+    assert broken['status'] == 'error', "Broken request should be reported as an error"
+
+    # dfs over 100 items won't finish before the deadline
+    slow = await client.solve({'type': 'knapsack', 'solver': 'dfs', 'format': 'text', 'timeout': 0.5, 'data': read(os.path.join(TESTS_DIR, 'knapsack', 'knapsack_problems', 'ks_100_0'))})
+    assert slow['status'] == 'timeout' or not slow['result']['optimal'], f"Request exceeding its deadline shouldn't be solved to optimality, got {slow}"
+
+async def check_malicious_requests(client, path, directory):
+    # names of the requests are only the names of the problems, never the paths
+    target = os.path.join(directory, 'escaped')
+    named = await client.solve({'type': 'simplex', 'format': 'mps', 'name': target, 'data': read(os.path.join(TESTS_DIR, 'simplex', 'models', 'example_10.mps'))})
+    assert named['status'] == 'ok', f"Named request should be solved, got {named}"
+    assert not any(name.startswith('escaped') for name in os.listdir(directory)), "Request name shouldn't be used as a file path"
+
+    reader, writer = await asyncio.open_unix_connection(path)
+    try:
+        malformed = [
+            ('[1, 2]', None),
+            ('{"id": 7, "type": "knapsack", "timeout": "x"}', 7),
+            ('{"id": 8, "type": "knapsack", "timeout": -1}', 8),
+            ('{"id": 9, "type": "knapsack", "deadline": "soon", "data": {"capacity": 10, "items": [[10, 5]]}}', 9)
+        ]
+        for (line, id) in malformed:
+            writer.write((line + '\n').encode())
+            await writer.drain()
+            response = json.loads(await asyncio.wait_for(reader.readline(), 10))
+            assert response['status'] == 'error' and response['id'] == id, f"Malformed request {line} should be answered with an error, got {response}"
+    finally:
+        writer.close()
+
+async def check_deadlines(client):
+    # both requests are small, so they're batched together, but the quick one shouldn't wait for the slow one
+    slow = asyncio.create_task(client.solve({'type': 'knapsack', 'solver': 'dfs', 'format': 'text', 'timeout': 5, 'data': read(os.path.join(TESTS_DIR, 'knapsack', 'knapsack_problems', 'ks_100_0'))}))
+    start = time.time()
+    quick = await client.solve({'type': 'knapsack', 'solver': 'dfs', 'format': 'text', 'timeout': 0.3, 'data': read(os.path.join(TESTS_DIR, 'knapsack', 'knapsack_problems', 'ks_100_0'))})
+    waiting_time = time.time() - start
+    assert quick['status'] == 'timeout' or not quick['result']['optimal'], f"Request exceeding its deadline shouldn't be solved to optimality, got {quick}"
+    assert waiting_time < 2, f"Request should be answered at its own deadline, but it waited {waiting_time:.2f}s"
+    await slow
+
+def klee_minty(n):
+    # the simplex visits all the 2^n vertices, so it would run for minutes
+    return {
+        'objective': {'sense': 'max', 'factors': [2 ** (n - j - 1) for j in range(n)]},
+        'constraints': [{'factors': [2 ** (i - j + 1) for j in range(i)] + [1] + [0] * (n - i - 1), 'type': '<=', 'bound': 5 ** (i + 1)} for i in range(n)]
+    }
+
+async def check_worker_release(server, client):
+    # the only worker should stop the linear solve at its deadline, so the next request gets it
+    slow = await client.solve({'type': 'simplex', 'timeout': 0.5, 'data': klee_minty(22)})
+    assert slow['status'] == 'timeout', f"Linear solve exceeding its deadline should time out, got {slow}"
+    quick = await client.solve({'type': 'knapsack', 'timeout': 1.0, 'data': {'capacity': 10, 'items': [[10, 5], [40, 4], [30, 6], [50, 3]]}})
+    assert quick['status'] == 'ok' and quick['result']['value'] == 90, f"Request after a timed out one should be solved, got {quick}"
+
+    # both are small, so they're batched together, the request without a timeout shouldn't wait for the whole slow solve
+    start = time.time()
+    (slow, quick) = await asyncio.gather(
+        client.solve({'type': 'simplex', 'timeout': 0.5, 'data': klee_minty(22)}),
+        client.solve({'type': 'knapsack', 'data': {'capacity': 10, 'items': [[10, 5], [40, 4], [30, 6], [50, 3]]}})
+    )
+    waiting_time = time.time() - start
+    assert slow['status'] == 'timeout' and quick['status'] == 'ok', f"Only the linear solve should time out, got {slow} and {quick}"
+    assert waiting_time < 10, f"Batched request should be solved right after the deadline of the slow one, but it waited {waiting_time:.2f}s"
+    await asyncio.sleep(0.1)
+    assert server.stats()['in_progress'] == 0, "No request should be left in progress"
+
+async def serve_and_check(directory):
+    server = SolveServer(workers = 2)
+    path = os.path.join(directory, 'saport.sock')
+    await server.start(path)
+    client = await Client.connect(path)
+    try:
+        await check_requests(client)
+        await check_malicious_requests(client, path, directory)
+        await check_deadlines(client)
+        report = await load_test(client, requests = 200, concurrency = 16)
+        assert report['statuses'] == {'ok': 200}, f"All the load test requests should be solved, got {report['statuses']}"
+        stats = await client.stats()
+        assert stats['handled'] >= 200 and stats['queue_depth'] == 0, f"Server stats should count the handled requests, got {stats}"
+        logging.info(f"throughput: {report['throughput']:.1f} req/s, average batch: {stats['average_batch_size']:.2f}, p99 latency: {stats['latency_p99']:.4f}s")
+    finally:
+        await client.close()
+        await server.close()
+
+async def serve_single_worker(directory):
+    server = SolveServer(workers = 1)
+    path = os.path.join(directory, 'single.sock')
+    await server.start(path)
+    client = await Client.connect(path)
+    try:
+        await check_worker_release(server, client)
+    finally:
+        await client.close()
+        await server.close()
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(serve_and_check(directory))
+        asyncio.run(serve_single_worker(directory))
+    logging.info("Congratulations! The solve service seems to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
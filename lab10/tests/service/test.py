@@ -0,0 +1,21 @@
+import importlib
+import os
+test_modules = ['service_01_requests']
+test_dir = 'tests.service'
+print("Running tests...")
+success = True
+for test_module in test_modules:
+    test = importlib.import_module(f"{test_dir}.{test_module}")
+    try:
+        test.run()
+        print(f'- test "{test_module}":\t PASSED')
+    except Exception as e:
+        success = False
+        print(f'- test "{test_module}":\t FAILED (message: {e})')
+
+if success:
+    print("Congratulations, your solve service seems to work correctly!")
+else:
+    print("Some of the tests failed. Fix your implementation ASAP :)")
+
+    
\ No newline at end of file
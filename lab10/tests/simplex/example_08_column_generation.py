@@ -0,0 +1,60 @@
+import logging
+import math
+from itertools import product
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.column_generation import Column, ColumnGenerationSolver
+
+ROLL_WIDTH = 20
+WIDTHS = [3, 5, 7, 9]
+DEMANDS = [25, 20, 18, 10]
+
+def all_patterns():
+    ranges = [range(ROLL_WIDTH // w + 1) for w in WIDTHS]
+    return [list(p) for p in product(*ranges) if 0 < sum(n * w for (n, w) in zip(p, WIDTHS)) <= ROLL_WIDTH]
+
+def create_model(name, patterns):
+    model = Model(name)
+    xs = [model.create_variable(f"p{i}") for (i, _) in enumerate(patterns)]
+    for (i, demand) in enumerate(DEMANDS):
+        model.add_constraint(Expression.from_vectors(xs, [p[i] for p in patterns]) >= demand)
+    model.minimize(Expression.from_vectors(xs, [1 for _ in patterns]))
+    return model
+
+def run():
+    full_solution = create_model("example_08_full", all_patterns()).solve()
+
+    homogeneous_patterns = [[ROLL_WIDTH // w if i == j else 0 for (j, _) in enumerate(WIDTHS)] for (i, w) in enumerate(WIDTHS)]
+    master = create_model("example_08_column_generation", homogeneous_patterns)
+    patterns = all_patterns()
+    generated = []
+
+    def pricing(duals):
+        best = max(patterns, key=lambda p: sum(d * n for (d, n) in zip(duals, p)))
+        generated.append(best)
+        return [Column(f"g{len(generated)}", 1.0, best)]
+
+    solver = ColumnGenerationSolver(pricing)
+    solution = solver.solve(master)
+    logging.info(solution)
+
+    assert math.isclose(solution.objective_value(), full_solution.objective_value(), abs_tol=0.0001), "column generation should find the same optimum as the full model"
+    assert len(master.variables) == len(homogeneous_patterns), "column generation shouldn't modify the given model"
+    assert len(solution.model.variables) < len(patterns), "column generation shouldn't need all the patterns"
+    for (i, demand) in enumerate(DEMANDS):
+        assert solution.model.constraints[i].expression.evaluate(solution.assignment) >= demand - 0.0001, "the solution doesn't satisfy the demand"
+
+    redundant = create_model("example_08_redundant", homogeneous_patterns)
+    redundant.add_constraint(redundant.constraints[0].expression == DEMANDS[0] * 2)
+    redundant.add_constraint(redundant.constraints[0].expression * 2 == DEMANDS[0] * 4)
+    try:
+        solver.solve(redundant)
+        assert False, "column generation should reject a model with redundant constraints"
+    except Exception as error:
+        assert "redundant" in str(error), "column generation should reject a model with redundant constraints"
+
+    logging.info("Congratulations! The column generation seems to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
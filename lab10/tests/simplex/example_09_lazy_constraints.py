@@ -0,0 +1,50 @@
+import logging
+import math
+from itertools import combinations
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+
+N = 6
+WEIGHTS = [3, 1, 4, 1, 5, 9]
+
+def create_model(name):
+    model = Model(name)
+    xs = [model.create_variable(f"x{i}") for i in range(N)]
+    for x in xs:
+        model.add_constraint(x <= 1)
+    model.maximize(Expression.from_vectors(xs, WEIGHTS))
+    return model, xs
+
+def pair_constraints(xs):
+    return [xs[i] + xs[j] <= 1 for (i, j) in combinations(range(N), 2) if (i + j) % 3 != 0]
+
+def run():
+    full_model, full_xs = create_model("example_09_full")
+    for constraint in pair_constraints(full_xs):
+        full_model.add_constraint(constraint)
+    full_solution = full_model.solve()
+
+    lazy_model, lazy_xs = create_model("example_09_lazy")
+    separated = []
+    def separator(assignment):
+        separated.append(assignment)
+        violated = [c for c in pair_constraints(lazy_xs) if c.is_violated(assignment)]
+        return violated[:1]
+    lazy_model.add_lazy_constraints(separator)
+    lazy_solution = lazy_model.solve()
+    logging.info(lazy_solution)
+
+    assert math.isclose(lazy_solution.objective_value(), full_solution.objective_value(), abs_tol=0.0001), "lazy constraints should lead to the same optimum as the full model"
+    assert len(separated) > 1, "the separator should be called again after adding the violated constraints"
+    assert not any(c.is_violated(lazy_solution.assignment) for c in pair_constraints(lazy_xs)), "the solution violates one of the lazy constraints"
+    assert len(lazy_solution.model.constraints) < len(full_model.constraints), "only violated constraints should be added to the model"
+
+    unfeasible_model, unfeasible_xs = create_model("example_09_unfeasible")
+    unfeasible_model.add_lazy_constraints(lambda _: [unfeasible_xs[0] + unfeasible_xs[1] >= 3])
+    assert unfeasible_model.solve().is_feasible == False, "lazy constraint made the problem unfeasible, but the solver hasn't noticed it"
+
+    logging.info("Congratulations! The lazy constraints seem to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,34 @@
+import logging
+import os
+import tempfile
+from saport.simplex.model import Model
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), 'models')
+
+def run():
+    # the same model stored in both formats:
+    # ranged rows, an upper bound, a lower bound, a free variable and a variable unbounded from below
+    mps_model = Model.from_file(os.path.join(MODELS_DIR, 'example_10.mps'))
+    lp_model = Model.from_file(os.path.join(MODELS_DIR, 'example_10.lp'))
+
+    assert mps_model.is_equivalent(lp_model), "Models read from the MPS and LP files should be equivalent"
+
+    for model in [mps_model, lp_model]:
+        solution = model.solve()
+        assert abs(solution.objective_value() - 26.0) < 0.0001, f"Model read from the file should have the optimal objective value 26, but got {solution.objective_value()}"
+
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ['mps', 'lp']:
+            path = os.path.join(directory, f"example_10.{extension}")
+            mps_model.serialize(path)
+            written_model = Model.from_file(path)
+            assert [v.name for v in written_model.variables] == [v.name for v in mps_model.variables], f"Variables should keep their names and order after writing the {extension} file"
+            assert written_model.is_equivalent(mps_model), f"Model written to the {extension} file should be equivalent to the original one"
+            solution = written_model.solve()
+            assert abs(solution.objective_value() - 26.0) < 0.0001, f"Model written to the {extension} file should have the same optimal objective value"
+
+    logging.info("Congratulations! The model files seem to be read and written correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,57 @@
+import logging
+import os
+import tempfile
+import numpy as np
+from saport.simplex.model import Model
+from saport.simplex.formats import snapshot
+from saport.simplex import solver as s
+
+def create_model():
+    model = Model("example_11_snapshots")
+
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    x3 = model.create_variable("x3")
+
+    model.add_constraint(x1 + x2 + x3 <= 30)
+    model.add_constraint(x1 + 2*x2 + x3 >= 10)
+    model.add_constraint(2*x2 + x3 <= 20)
+
+    model.maximize(2 * x1 + x2 + 3 * x3)
+    return model
+
+def run():
+    model = create_model()
+    solution = model.solve()
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path = os.path.join(directory, "model")
+        snapshot.save(model_path, model.standard_form())
+        standard_form, tableaux = snapshot.load(model_path)
+        assert tableaux is None, "Snapshot saved without a tableaux shouldn't contain one"
+        assert isinstance(standard_form.matrix, np.memmap), "Arrays of the snapshot should be memory-mapped"
+        assert np.array_equal(standard_form.matrix, model.standard_form().matrix), "Snapshot should contain the same constraint matrix"
+        assert standard_form.names == model.standard_form().names, "Snapshot should contain the same column names"
+        assert standard_form.slack_variables == model.standard_form().slack_variables, "Snapshot should contain the same slack variables"
+        assert standard_form.surplus_variables == model.standard_form().surplus_variables, "Snapshot should contain the same surplus variables"
+
+        basis_path = os.path.join(directory, "basis")
+        snapshot.save(basis_path, solution.standard_form, solution.tableaux, include_table = False)
+        _, rebuilt_tableaux = snapshot.load(basis_path)
+        assert np.allclose(rebuilt_tableaux.table, solution.tableaux.table), "Tableaux rebuilt from the saved basis should be the same as the final one"
+        assert rebuilt_tableaux.extract_basis() == solution.tableaux.extract_basis(), "Tableaux rebuilt from the saved basis should have the same basis"
+
+        solution.swap_out(os.path.join(directory, "solution"))
+        assert isinstance(solution.tableaux.table, np.memmap), "Swapped out tableaux should be memory-mapped"
+        assert np.allclose(solution.tableaux.extract_assignment(), rebuilt_tableaux.extract_assignment()), "Swapped out tableaux should keep the assignment"
+        assert abs(solution.objective_value() - 80.0) < 0.0001, "Swapped out solution should keep the objective value"
+
+        # memory-mapped tableaux can be used for a warm start, pivots never write to the mapped table
+        s.Solver()._optimize(solution.initial_tableaux)
+        assert abs(solution.initial_tableaux.cost() - 80.0) < 0.0001, "Memory-mapped initial tableaux should be optimized to the same cost"
+
+    logging.info("Congratulations! The snapshots seem to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
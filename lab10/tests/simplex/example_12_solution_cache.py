@@ -0,0 +1,71 @@
+import logging
+import tempfile
+import numpy as np
+from saport.simplex.model import Model
+from saport.simplex.solution_cache import SolutionCache
+
+def create_model(name, prefix, reversed_constraints = False):
+    model = Model(name)
+
+    x1 = model.create_variable(f"{prefix}1")
+    x2 = model.create_variable(f"{prefix}2")
+    x3 = model.create_variable(f"{prefix}3")
+
+    constraints = [
+        x1 + x2 + x3 <= 30,
+        x1 + 2*x2 + x3 >= 10,
+        2*x2 + x3 <= 20
+    ]
+    for constraint in (reversed(constraints) if reversed_constraints else constraints):
+        model.add_constraint(constraint)
+
+    model.maximize(2 * x1 + x2 + 3 * x3)
+    return model
+
+def run():
+    original = create_model("example_12_original", "x")
+    renamed = create_model("example_12_renamed", "y")
+    reordered = create_model("example_12_reordered", "z", reversed_constraints = True)
+
+    assert original.fingerprint() == renamed.fingerprint() == reordered.fingerprint(), "Renamed and reordered copies should have the same fingerprint"
+    assert original.is_equivalent(renamed), "Renamed copy should be equivalent to the original model"
+
+    other = create_model("example_12_other", "x")
+    other.add_constraint(other.variables[0] <= 5)
+    assert original.fingerprint() != other.fingerprint(), "Models with different constraints should have different fingerprints"
+    assert not original.is_equivalent(other), "Models with different constraints shouldn't be equivalent"
+
+    expected = create_model("example_12_expected", "x", reversed_constraints = True).solve()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SolutionCache(maxsize = 1, path = directory)
+        Model.solution_cache = cache
+        try:
+            original.solve()
+            assert (cache.hits, cache.misses) == (0, 1), "The first solve should miss the cache"
+
+            solution = renamed.solve()
+            assert cache.hits == 1, "Renamed copy should hit the cache"
+            assert solution.model is renamed, "Cached solution should be remapped to the caller's model"
+            assert abs(solution.value(renamed.variables[2]) - 20.0) < 0.0001, "Cached assignment should be available through the caller's variables"
+
+            solution = reordered.solve()
+            assert cache.hits == 2, "Reordered copy should hit the cache"
+            assert sorted(solution.tableaux.extract_basis()) == sorted(expected.tableaux.extract_basis()), "Tableaux of the reordered copy should be rebuilt for its own constraints order"
+            assert np.allclose(solution.tableaux.table[0], expected.tableaux.table[0]), "Tableaux of the reordered copy should have the same cost row as the solved one"
+
+            other.solve()
+            assert len(cache.memory) == 1, "The in-memory cache should keep only one solution"
+
+            disk_cache = SolutionCache(path = directory)
+            solution = disk_cache.get(renamed)
+            assert disk_cache.hits == 1, "Solutions should be read from the disk cache"
+            assert abs(solution.objective_value() - 80.0) < 0.0001, "Solution read from the disk should have the same objective value"
+        finally:
+            Model.solution_cache = None
+
+    logging.info("Congratulations! The solution cache seems to work correctly :)")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
@@ -0,0 +1,79 @@
+import logging
+from fractions import Fraction
+from saport.simplex.model import Model
+from saport.simplex import exact
+from saport.simplex import tableaux as t
+from saport.integer.model import Model as IntegerModel
+
+def create_model(minimize = False):
+    model = Model("example_13_exact_refinement")
+
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+
+    if minimize:
+        model.add_constraint(0.1*x1 + 0.3*x2 >= 0.7)
+        model.add_constraint(0.3*x1 + 0.1*x2 >= 0.5)
+        model.minimize(x1 + x2)
+    else:
+        model.add_constraint(0.1*x1 + 0.3*x2 <= 0.7)
+        model.add_constraint(0.3*x1 + 0.1*x2 <= 0.5)
+        model.maximize(x1 + x2)
+    return model
+
+def run():
+    model = create_model()
+    solution = model.solve(exact = True)
+    logging.info(solution)
+
+    assert solution.is_verified(), "The optimal basis should be confirmed in the exact arithmetic!"
+    assert solution.refinement.pivots == 0, "The optimal basis shouldn't need any repair!"
+    assert [solution.exact_value(var) for var in model.variables] == [1, 2], "The exact assignment is incorrect!"
+    assert solution.exact_objective_value() == 3, "The exact objective value is incorrect!"
+    assert solution.assignment == [1.0, 2.0], "The float assignment should be rounded from the exact one!"
+    for constraint in model.constraints:
+        lhs = sum(Fraction(repr(f)) * solution.exact_value(model.variables[i]) for (i, f) in zip(constraint.expression.indices, constraint.expression.values))
+        assert lhs <= Fraction(repr(constraint.bound)), "The exact assignment should satisfy the constraints exactly!"
+
+    # a feasible but suboptimal basis (slack variables) is repaired with the primal pivots
+    standard_form = model.standard_form()
+    refinement = exact.refine(t.Tableaux.from_basis(standard_form, [2, 3]))
+    assert refinement.status == exact.RefinementStatus.OPTIMAL, "The slack basis should be repaired!"
+    assert refinement.pivots == 2 and refinement.objective == 3, "The repaired basis should be optimal!"
+    limited = exact.refine(t.Tableaux.from_basis(standard_form, [2, 3]), max_pivots = 1)
+    assert limited.status == exact.RefinementStatus.UNVERIFIED, "The pivot limit should be respected!"
+    assert sorted(refinement.basis) == sorted(solution.tableaux.extract_basis()), "The repaired basis should be the same as the simplex one!"
+
+    # a dual feasible basis with negative values (surplus variables) is repaired with the dual pivots
+    model = create_model(minimize = True)
+    standard_form = model.standard_form()
+    refinement = exact.refine(t.Tableaux.from_basis(standard_form, [2, 3]))
+    assert refinement.status == exact.RefinementStatus.OPTIMAL, "The surplus basis should be repaired!"
+    assert refinement.objective == 3 and refinement.assignment[:2] == [1, 2], "The repaired basis should be optimal!"
+
+    # unboundedness is detected by the repair pivots as well
+    model = Model("example_13_exact_refinement_unbounded")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    model.add_constraint(x1 - x2 <= 1)
+    model.maximize(x1 + x2)
+    refinement = exact.refine(t.Tableaux.from_basis(model.standard_form(), [2]))
+    assert refinement.status == exact.RefinementStatus.UNBOUNDED, "The repair pivots should detect the unbounded problem!"
+    assert model.solve(exact = True).is_bounded == False, "The exact solve should report the unbounded problem!"
+
+    # integrality of the exactly verified relaxations is checked without any tolerance
+    model = IntegerModel("example_13_exact_refinement_integer")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    model.add_constraint(x1 + x2 <= 6)
+    model.add_constraint(5*x1 + 9*x2 <= 45)
+    model.maximize(5 * x1 + 8 * x2)
+    solution = model.solve(exact = True)
+    assert solution.is_verified() and solution.assignment == [0, 5], "The exact branch and bound found an incorrect solution!"
+
+    logging.info("Congratulations! The exact refinement seems to be alright :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
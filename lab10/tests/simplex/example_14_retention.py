@@ -0,0 +1,90 @@
+import logging
+import pickle
+import numpy as np
+from saport.simplex.model import Model
+from saport.simplex.solution import Retention
+from saport.simplex.solution_cache import SolutionCache
+from saport.simplex.analyser import Analyser
+from saport.simplex.analysis_tools.objective_sensitivity import ObjectiveSensitivityAnalyser
+from saport.integer.model import Model as IntegerModel
+
+def create_model(size = 3, seed = 0):
+    generator = np.random.default_rng(seed)
+    model = Model("example_14_retention")
+    variables = [model.create_variable(f"x{i}") for i in range(size)]
+    for _ in range(size):
+        factors = generator.integers(1, 10, size)
+        model.add_constraint(sum((int(f) * v for (f, v) in zip(factors[1:], variables[1:])), int(factors[0]) * variables[0]) <= int(generator.integers(10, 100)))
+    costs = generator.integers(1, 10, size)
+    model.maximize(sum((int(c) * v for (c, v) in zip(costs[1:], variables[1:])), int(costs[0]) * variables[0]))
+    return model
+
+def run():
+    model = create_model()
+    full = model.solve(retention = Retention.FULL)
+    basis = model.solve()
+    none = model.solve(retention = Retention.NONE)
+
+    assert basis.retention == Retention.BASIS, "Solutions should keep only the basis by default"
+    assert basis.retained_tableaux.kept is None, "Tableaux shouldn't be rebuilt before anyone asks for them"
+    assert basis.assignment == full.assignment and none.assignment == full.assignment, "Retention shouldn't change the assignment"
+    assert basis.basis == full.basis, "Retained basis should be the same as the one of the full tableaux"
+    assert np.allclose(basis.tableaux.table, full.tableaux.table), "Tableaux rebuilt from the basis should be the same as the full one"
+    assert np.allclose(basis.initial_tableaux.table, full.initial_tableaux.table), "Initial tableaux rebuilt from the basis should be the same as the full one"
+    assert basis.tableaux is basis.tableaux, "Rebuilt tableaux should be kept"
+
+    results = Analyser().analyse(basis)[ObjectiveSensitivityAnalyser.name()]
+    expected = Analyser().analyse(full)[ObjectiveSensitivityAnalyser.name()]
+    assert np.allclose(results, expected), "Analysis of the rebuilt tableaux should give the same results"
+
+    assert none.basis is None, "Solution without retention shouldn't keep the basis"
+    raised = False
+    try:
+        none.tableaux
+    except Exception:
+        raised = True
+    assert raised, "Solution without retention shouldn't return any tableaux"
+
+    # an unfeasible model ends with the tableaux of the first phase, rebuilt from the basis with the costs of the first phase
+    unfeasible_model = create_model()
+    unfeasible_model.add_constraint(sum(unfeasible_model.variables[1:], unfeasible_model.variables[0]) >= 1000)
+    unfeasible_full = unfeasible_model.solve(retention = Retention.FULL)
+    unfeasible_basis = unfeasible_model.solve()
+    assert unfeasible_basis.is_feasible == False and unfeasible_basis.retained_tableaux.kept is None, "Unfeasible solution should keep only the basis"
+    assert np.allclose(unfeasible_basis.tableaux.table, unfeasible_full.tableaux.table), "First phase tableaux rebuilt from the basis should be the same as the full one"
+    assert np.allclose(unfeasible_basis.initial_tableaux.table, unfeasible_full.initial_tableaux.table), "Initial first phase tableaux rebuilt from the basis should be the same as the full one"
+
+    big_model = create_model(60, 1)
+    full_size = len(pickle.dumps(big_model.solve(retention = Retention.FULL)))
+    basis_size = len(pickle.dumps(big_model.solve()))
+    none_size = len(pickle.dumps(big_model.solve(retention = Retention.NONE)))
+    logging.info(f"pickled solution sizes: full {full_size}, basis {basis_size}, none {none_size}")
+    assert none_size < basis_size < full_size / 2, "Lightweight solutions should be much smaller than the full ones"
+
+    integer_model = IntegerModel("example_14_retention_integer")
+    x1 = integer_model.create_variable("x1")
+    x2 = integer_model.create_variable("x2")
+    integer_model.add_constraint(x1 + x2 <= 6)
+    integer_model.add_constraint(5*x1 + 9*x2 <= 45)
+    integer_model.maximize(5 * x1 + 8 * x2)
+    solution = integer_model.solve(retention = Retention.NONE)
+    assert solution.assignment == [0, 5] and solution.retention == Retention.NONE, "Branch and bound should work without the tableaux"
+
+    original_cache = Model.solution_cache
+    Model.solution_cache = SolutionCache()
+    try:
+        cached_model = create_model()
+        cached_model.solve(retention = Retention.NONE)
+        full = cached_model.solve(retention = Retention.FULL)
+        assert full.retention == Retention.FULL and full.tableaux is not None, "Cached solution without the tableaux shouldn't be returned when the full one is asked for"
+        basis = cached_model.solve()
+        assert basis.tableaux is not None, "Cached full solution should be good enough for the default retention"
+    finally:
+        Model.solution_cache = original_cache
+
+    logging.info("Congratulations! Solutions keep only what they should :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
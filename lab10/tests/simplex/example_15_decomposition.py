@@ -0,0 +1,105 @@
+import logging
+import math
+import numpy as np
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.decomposition import BlockStructure, DantzigWolfeSolver, BendersSolver
+
+PLANTS = 3
+PRODUCTS = 3
+
+def create_production_model(seed = 0):
+    # plants with their own capacities, sharing a limited amount of the raw material and a common demand
+    generator = np.random.default_rng(seed)
+    model = Model("example_15_production")
+    plants = [[model.create_variable(f"x{p}_{i}") for i in range(PRODUCTS)] for p in range(PLANTS)]
+    for xs in plants:
+        for _ in range(2):
+            model.add_constraint(Expression.from_vectors(xs, generator.integers(1, 6, PRODUCTS)) <= int(generator.integers(20, 40)))
+    everything = [x for xs in plants for x in xs]
+    model.add_constraint(Expression.from_vectors(everything, generator.integers(1, 4, len(everything))) <= 50)
+    model.add_constraint(Expression.from_vectors(everything, [1 for _ in everything]) >= 5)
+    model.maximize(Expression.from_vectors(everything, generator.integers(1, 10, len(everything))))
+    return model
+
+def create_investment_model(seed = 0):
+    # shared capacities (linking variables) are bought, then every plant minimizes its own production cost
+    generator = np.random.default_rng(seed)
+    model = Model("example_15_investment")
+    capacities = [model.create_variable(f"c{i}") for i in range(2)]
+    plants = [[model.create_variable(f"x{p}_{i}") for i in range(PRODUCTS)] for p in range(PLANTS)]
+    for xs in plants:
+        model.add_constraint(Expression.from_vectors(xs, [1 for _ in xs]) >= int(generator.integers(5, 15)))
+        for capacity in capacities:
+            model.add_constraint(Expression.from_vectors(xs, generator.integers(1, 4, PRODUCTS)) - capacity <= 0)
+    model.add_constraint(capacities[0] + capacities[1] <= 60)
+    model.minimize(Expression.from_vectors(capacities + [x for xs in plants for x in xs], [3, 2] + list(generator.integers(1, 10, PLANTS * PRODUCTS))))
+    return model
+
+def create_large_block_model():
+    # value of the first block is far above anything derived from the objective factors
+    model = Model("example_15_large_block")
+    x1 = model.create_variable("x1")
+    x2 = model.create_variable("x2")
+    y = model.create_variable("y")
+    model.add_constraint(y <= 10)
+    model.add_constraint(x1 - 1000 * y <= 1000000)
+    model.add_constraint(x2 <= 5)
+    model.maximize(x1 + x2 - y)
+    return model
+
+def create_small_factors_model():
+    # the linking constraint needs huge values of the variables, so the dual of it is huge too
+    model = Model("example_15_small_factors")
+    a = model.create_variable("a")
+    b = model.create_variable("b")
+    model.add_constraint(a <= 1000000)
+    model.add_constraint(b <= 1000000)
+    model.add_constraint(0.00001 * a + 0.00001 * b >= 1)
+    model.minimize(a + b)
+    return model
+
+def run():
+    model = create_production_model()
+    structure = BlockStructure.detect(model, 'constraints')
+    assert len(structure.blocks) == PLANTS, "Every plant should be detected as a separate block"
+    assert structure.linking_constraints == [6, 7], "Shared raw material and demand should be the linking constraints"
+
+    expected = model.solve()
+    solver = DantzigWolfeSolver(workers = 2)
+    solution = solver.solve(model)
+    logging.info(f"Dantzig-Wolfe: {solution.objective_value()} after {solver.iterations} pricing rounds, monolithic: {expected.objective_value()}")
+    assert math.isclose(solution.objective_value(), expected.objective_value(), abs_tol = 0.0001), "Dantzig-Wolfe decomposition should find the same optimum as the whole model"
+    assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Dantzig-Wolfe solution should satisfy all the constraints"
+
+    model = create_investment_model()
+    structure = BlockStructure.detect(model, 'variables')
+    assert len(structure.blocks) == PLANTS and structure.linking_variables == [0, 1], "Shared capacities should be the linking variables"
+
+    expected = model.solve()
+    solver = BendersSolver(workers = 2)
+    solution = solver.solve(model)
+    logging.info(f"Benders: {solution.objective_value()} after {solver.iterations} rounds, monolithic: {expected.objective_value()}")
+    assert math.isclose(solution.objective_value(), expected.objective_value(), abs_tol = 0.0001), "Benders decomposition should find the same optimum as the whole model"
+    assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Benders solution should satisfy all the constraints"
+
+    unfeasible = create_production_model()
+    unfeasible.add_constraint(Expression.from_vectors(unfeasible.variables, [1 for _ in unfeasible.variables]) >= 1000)
+    solution = DantzigWolfeSolver(structure = BlockStructure.from_linking(unfeasible, [6, 7, 8]), workers = 1).solve(unfeasible)
+    assert not solution.is_feasible, "Unfeasible linking constraints should be detected"
+
+    model = create_large_block_model()
+    solution = BendersSolver(structure = BlockStructure.from_linking(model, linking_variables = [2]), workers = 1).solve(model)
+    assert math.isclose(solution.objective_value(), 1009995, abs_tol = 0.0001), f"Benders decomposition should find the optimum 1009995 of a block with a large value, got {solution.objective_value()}"
+
+    model = create_small_factors_model()
+    solution = DantzigWolfeSolver(structure = BlockStructure.from_linking(model, [2]), workers = 1).solve(model)
+    assert solution.is_feasible, "Linking constraint with small factors is feasible"
+    assert math.isclose(solution.objective_value(), 100000, rel_tol = 0.000001), f"Dantzig-Wolfe decomposition should find the optimum 100000, got {solution.objective_value()}"
+
+    logging.info("Congratulations! The decompositions seem to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
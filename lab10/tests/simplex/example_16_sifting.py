@@ -0,0 +1,70 @@
+import logging
+import math
+import time
+import numpy as np
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+from saport.simplex.sifting import SiftingSolver
+
+ROWS = 20
+COLUMNS = 3000
+
+def create_model(covering, seed = 0):
+    # covering: min cost of the columns covering every row at least a few times,
+    # packing: max value of the columns sharing limited resources
+    generator = np.random.default_rng(seed)
+    model = Model(f"example_16_{'covering' if covering else 'packing'}")
+    xs = [model.create_variable(f"x{j}") for j in range(COLUMNS)]
+    factors = generator.integers(1, 10, (ROWS, COLUMNS)) * (generator.random((ROWS, COLUMNS)) < 0.2)
+    for row in factors:
+        columns = np.nonzero(row)[0]
+        expression = Expression.from_vectors([xs[j] for j in columns], row[columns])
+        model.add_constraint(expression >= int(generator.integers(5, 20)) if covering else expression <= int(generator.integers(50, 100)))
+    objective = Expression.from_vectors(xs, generator.integers(1, 100, COLUMNS))
+    if covering:
+        model.minimize(objective)
+    else:
+        model.add_constraint(Expression.from_vectors(xs, [1 for _ in xs]) <= 100)
+        model.maximize(objective)
+    return model
+
+def run():
+    for covering in [True, False]:
+        model = create_model(covering)
+
+        start = time.time()
+        expected = model.solve()
+        full_time = time.time() - start
+
+        start = time.time()
+        solver = SiftingSolver(chunk_size = 1000)
+        solution = solver.solve(model)
+        sifting_time = time.time() - start
+
+        logging.info(f"{model.name}: {solution.objective_value()} (full tableaux: {expected.objective_value()}), "
+                     f"{solver.iterations} pricing rounds, working set of {solver.working_set_size} columns, "
+                     f"{sifting_time:.2f}s vs {full_time:.2f}s")
+        assert math.isclose(solution.objective_value(), expected.objective_value(), rel_tol = 1e-6), "Sifting should find the same optimum as the full tableaux"
+        assert not any(c.is_violated(solution.assignment) for c in model.constraints), "Sifting solution should satisfy all the constraints"
+        assert solver.working_set_size < COLUMNS / 5, "Working set should be much smaller than the model"
+
+    model = create_model(True, 1)
+    model.add_constraint(Expression.from_vectors(model.variables[:10], [1 for _ in range(10)]) <= -1)
+    assert not SiftingSolver().solve(model).is_feasible, "Sifting should detect the unfeasible model"
+
+    # the covering constraint needs huge values of the variables, so its dual is huge too
+    model = Model("example_16_small_factors")
+    x = model.create_variable("x")
+    y = model.create_variable("y")
+    model.add_constraint(0.00001 * x + 0.00001 * y >= 1)
+    model.minimize(x + y)
+    solution = SiftingSolver().solve(model)
+    assert solution.is_feasible, "Sifting should solve the feasible model with small factors"
+    assert math.isclose(solution.objective_value(), 100000, rel_tol = 1e-6), f"Sifting should find the optimum 100000, got {solution.objective_value()}"
+
+    logging.info("Congratulations! The sifting seems to work correctly :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
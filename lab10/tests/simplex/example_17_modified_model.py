@@ -0,0 +1,35 @@
+import logging
+from saport.simplex.model import Model
+from saport.simplex.solution_cache import SolutionCache
+
+def create_model():
+    model = Model("example_17_modified_model")
+    x = model.create_variable("x")
+    model.add_constraint(x <= 3)
+    model.maximize(x)
+    return model
+
+def run():
+    model = create_model()
+    assert model.solve().objective_value() == 3, "Your algorithm found an incorrect solution!"
+
+    # the constraint is changed directly, not through the model methods
+    model.constraints[0].bound = 7
+    assert model.solve().objective_value() == 7, "The solution should reflect the changed bound, not the previously compiled model"
+
+    original_cache = Model.solution_cache
+    Model.solution_cache = SolutionCache()
+    try:
+        model = create_model()
+        assert model.solve().objective_value() == 3, "Your algorithm found an incorrect solution!"
+        model.constraints[0].bound = 7
+        assert model.solve().objective_value() == 7, "The cached solution of the unchanged model shouldn't be returned"
+    finally:
+        Model.solution_cache = original_cache
+
+    logging.info("Congratulations! Changed models are compiled again :)")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    run()
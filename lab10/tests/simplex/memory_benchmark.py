@@ -0,0 +1,85 @@
+from saport.simplex.model import Model
+from saport.simplex.expressions.expression import Expression
+from copy import deepcopy
+import random
+import time
+import tracemalloc
+
+# manipulate following parameters to customize the benchmark
+VARIABLES = 2000
+CONSTRAINTS = 500
+NONZEROS_PER_CONSTRAINT = 200
+
+# the layout of the expressions before the index/value arrays (reduced to the stored fields):
+# every expression is a tuple of atom objects, every atom has its own __dict__ and every variable is an atom of itself
+class LegacyExpression:
+    def __init__(self, *atoms):
+        self.atoms = atoms
+
+class LegacyAtom(LegacyExpression):
+    def __init__(self, var, factor):
+        self.var = var
+        self.factor = float(factor)
+        super().__init__(self)
+
+class LegacyVariable(LegacyAtom):
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+        super().__init__(self, 1)
+
+class LegacyConstraint:
+    def __init__(self, expression, bound):
+        self.expression = expression
+        self.bound = bound
+
+class LegacyModel:
+    def __init__(self):
+        self.variables = []
+        self.constraints = []
+        self.objective = None
+
+def create_model():
+    rng = random.Random(0)
+    model = Model("memory_benchmark")
+    xs = [model.create_variable(f"x{i}") for i in range(VARIABLES)]
+    for _ in range(CONSTRAINTS):
+        vars = rng.sample(xs, NONZEROS_PER_CONSTRAINT)
+        model.add_constraint(Expression.from_vectors(vars, [rng.randint(1, 10) for _ in vars]) <= rng.randint(100, 1000))
+    model.maximize(Expression.from_vectors(xs, [rng.randint(1, 10) for _ in xs]))
+    return model
+
+def create_legacy_model():
+    # the same random model as create_model
+    rng = random.Random(0)
+    model = LegacyModel()
+    model.variables = [LegacyVariable(f"x{i}", i) for i in range(VARIABLES)]
+    xs = model.variables
+    for _ in range(CONSTRAINTS):
+        vars = rng.sample(xs, NONZEROS_PER_CONSTRAINT)
+        model.constraints.append(LegacyConstraint(LegacyExpression(*[LegacyAtom(v, rng.randint(1, 10)) for v in vars]), rng.randint(100, 1000)))
+    model.objective = LegacyExpression(*[LegacyAtom(v, rng.randint(1, 10)) for v in xs])
+    return model
+
+def measure(create):
+    tracemalloc.start()
+    model = create()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.time()
+    deepcopy(model)
+    return size, time.time() - start
+
+def run():
+    nonzeros = CONSTRAINTS * NONZEROS_PER_CONSTRAINT + VARIABLES
+    (legacy_size, legacy_deepcopy) = measure(create_legacy_model)
+    (model_size, deepcopy_time) = measure(create_model)
+
+    print(f"* nonzeros: {nonzeros}")
+    print(f"* model size: {model_size / 2**20:.2f} MB (atom objects: {legacy_size / 2**20:.2f} MB, {legacy_size / model_size:.1f}x more)")
+    print(f"* per nonzero: {model_size / nonzeros:.1f} B (atom objects: {legacy_size / nonzeros:.1f} B)")
+    print(f"* deepcopy: {deepcopy_time:.4f}s (atom objects: {legacy_deepcopy:.4f}s)")
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,33 @@
+* max 3x + 2y - z + w - v
+NAME          example_10
+OBJSENSE
+    MAX
+ROWS
+ N  profit
+ L  c1
+ G  c2
+ E  c3
+ L  c4
+ G  c5
+COLUMNS
+    x         profit    3.0        c1        1.0
+    x         c2        1.0        c3        1.0
+    x         c5        1.0
+    y         profit    2.0        c1        1.0
+    y         c2        -1.0       c4        1.0
+    z         profit    -1.0       c1        1.0
+    z         c4        1.0
+    w         profit    1.0        c3        1.0
+    v         profit    -1.0       c5        1.0
+RHS
+    RHS       c1        10.0       c2        -2.0
+    RHS       c3        4.0        c4        8.0
+    RHS       c5        1.0
+RANGES
+    RNG       c3        2.0        c4        3.0
+BOUNDS
+ UP BND       x         4.0
+ LO BND       z         1.0
+ FR BND       w
+ MI BND       v
+ENDATA
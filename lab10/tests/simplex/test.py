@@ -1,6 +1,6 @@
 import importlib
 import os
-test_modules = ['example_01_solvable', 'example_02_solvable', 'example_03_unbounded', 'example_04_solvable_artificial_vars', 'example_05_unfeasible', 'example_06_dual', 'example_07_cost_sensitivity']
+test_modules = ['example_01_solvable', 'example_02_solvable', 'example_03_unbounded', 'example_04_solvable_artificial_vars', 'example_05_unfeasible', 'example_06_dual', 'example_07_cost_sensitivity', 'example_08_column_generation', 'example_09_lazy_constraints', 'example_10_file_formats', 'example_11_snapshots', 'example_12_solution_cache', 'example_13_exact_refinement', 'example_14_retention', 'example_15_decomposition', 'example_16_sifting', 'example_17_modified_model']
 test_dir = 'tests.simplex'
 print("Running tests...")
 success = True